@@ -1,15 +1,31 @@
 import streamlit as st
 import pandas as pd
+from dataclasses import replace
 from datetime import datetime, timedelta
 import os
+import time
 from uuid import uuid4
 import random
 from src.modules.models import Projeto, Demanda, Etapa, StatusEnum, PriorityEnum
+from src.modules.demanda_index import DemandaIndex
+from src.modules.dates import parse_date
+from src.modules.delay_risk import compute_project_delay_risk
 from src.modules.google_sheets_manager import GoogleSheetsManager, parse_spreadsheet_id, load_service_account_info_from_env_or_secrets
+from src.modules.sheets_write_behind import WriteBehindManager
+from src.modules.sheets_cache import shared_read_cache
+from src.modules.sheets_client_pool import shared_client_pool
+from src.modules.sheets_governor import RequestGovernor, shared_governor
+from src.modules.sheets_snapshot import shared_snapshot_store
+from src.modules.sqlite_manager import SQLiteManager
+from src.modules.storage_backend import WriteConflictError, create_backend_from_url, sqlite_path_from_url
 from src.components.ui_components2 import create_demanda_form_v2, create_projeto_form, create_etapa_form
 from src.modules.kanban import KanbanView, DashboardMetrics
 from src.modules.gantt import GanttChart
 from src.modules.checklist import ChecklistView
+from streamlit_option_menu import option_menu
+
+# Início do rerun (para a medição de tempo por página)
+_RERUN_STARTED_AT = time.perf_counter()
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -69,167 +85,100 @@ def _get_secret_value(key: str) -> str:
         return ""
 
 
-def _parse_date_yyyy_mm_dd(value: str):
-    if not value:
-        return None
+def _get_write_behind_seconds() -> float:
+    """Janela de coalescência das escritas em segundo plano (0 desliga o write-behind)."""
+    raw = _get_secret_value("GSHEETS_WRITE_BEHIND_SECONDS")
+    if not raw:
+        return 0.5
     try:
-        # aceita "YYYY-MM-DD" ou ISO com hora
-        return datetime.fromisoformat(str(value)[:10]).date()
-    except Exception:
-        return None
-
-
-def _planned_progress_for_demanda(d, today):
-    start = _parse_date_yyyy_mm_dd(getattr(d, "data_inicio_plano", None))
-    end = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento_plano", None))
-    if not end:
-        end = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento", None))
+        return max(0.0, float(raw))
+    except ValueError:
+        return 0.5
 
-    if not start and not end:
-        return None
-    if not start and end:
-        return 1.0 if today >= end else 0.0
-    if start and not end:
-        return 1.0 if today > start else 0.0
 
-    if today <= start:
-        return 0.0
-    if today >= end:
-        return 1.0
-    total = (end - start).days
-    if total <= 0:
-        return 1.0
-    return max(0.0, min(1.0, (today - start).days / float(total)))
-
-
-def _actual_progress_for_demanda(d):
+def _get_per_minute(key: str, default: float) -> float:
+    """Cota da API por minuto (GSHEETS_READS_PER_MINUTE / GSHEETS_WRITES_PER_MINUTE)."""
+    raw = _get_secret_value(key)
+    if not raw:
+        return default
     try:
-        pct = float(getattr(d, "percentual_completo", 0) or 0)
-    except Exception:
-        pct = 0.0
-    return max(0.0, min(1.0, pct / 100.0))
+        return max(1.0, float(raw))
+    except ValueError:
+        return default
 
 
-def _compute_project_delay_risk(projetos, demandas):
-    """Heurística baseada em Curva S: planejado vs realizado + prazos (projeto e demandas)."""
-    today = datetime.now().date()
-    rows = []
-
-    for p in projetos:
-        ds = [d for d in demandas if getattr(d, "projeto_id", None) == p.id]
-        if not ds:
-            continue
-
-        # Prazo do projeto: preferir data_conclusao do projeto; senão usar maior vencimento planejado das demandas
-        p_due = _parse_date_yyyy_mm_dd(getattr(p, "data_conclusao", None))
-        if not p_due:
-            due_candidates = [_parse_date_yyyy_mm_dd(getattr(d, "data_vencimento_plano", None)) for d in ds]
-            due_candidates = [x for x in due_candidates if x]
-            p_due = max(due_candidates) if due_candidates else None
-
-        planned_list = []
-        actual_list = []
-        overdue_open = 0
-        open_count = 0
-
-        for d in ds:
-            planned = _planned_progress_for_demanda(d, today)
-            actual = _actual_progress_for_demanda(d)
-
-            if planned is not None:
-                planned_list.append(planned)
-            actual_list.append(actual)
-
-            is_open = getattr(d, "status", None) != StatusEnum.DONE.value and actual < 1.0
-            if is_open:
-                open_count += 1
-                due = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento_plano", None))
-                if not due:
-                    due = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento", None))
-                if due and due < today:
-                    overdue_open += 1
-
-        planned_pct = sum(planned_list) / len(planned_list) if planned_list else None
-        actual_pct = sum(actual_list) / len(actual_list) if actual_list else 0.0
-        slip = (planned_pct - actual_pct) if planned_pct is not None else 0.0
-
-        # Projeção de término por velocidade (baseado em % realizado)
-        start_candidates = [_parse_date_yyyy_mm_dd(getattr(d, "data_inicio_plano", None)) for d in ds]
-        start_candidates = [x for x in start_candidates if x]
-        p_start = min(start_candidates) if start_candidates else None
-
-        projected_finish = None
-        delay_days = None
-
-        if p_start:
-            elapsed_days = max(1, (today - p_start).days)
-            velocity_per_day = actual_pct / float(elapsed_days)
-            remaining = max(0.0, 1.0 - actual_pct)
-            if velocity_per_day > 0.0:
-                projected_finish = today + timedelta(days=int(round(remaining / velocity_per_day)))
-                if p_due:
-                    delay_days = max(0, (projected_finish - p_due).days)
-
-        overdue_ratio = overdue_open / float(len(ds)) if ds else 0.0
-        deadline_pressure = 0.0
-        if p_due:
-            days_to_due = (p_due - today).days
-            if days_to_due <= 7:
-                deadline_pressure = 0.15
-            elif days_to_due <= 14:
-                deadline_pressure = 0.08
-
-        score = max(0.0, slip) * 0.7 + overdue_ratio * 0.3 + deadline_pressure
-
-        if score >= 0.35 or (delay_days is not None and delay_days >= 1):
-            risk_level = "Alto"
-        elif score >= 0.18:
-            risk_level = "Médio"
-        else:
-            risk_level = "Baixo"
-
-        tendencia = "Atraso provável" if (delay_days is not None and delay_days >= 1) or risk_level == "Alto" else "No prazo"
-
-        rows.append(
-            {
-                "projeto": getattr(p, "nome", p.id),
-                "prazo_projeto": p_due.isoformat() if p_due else "",
-                "pct_planejado_hoje": f"{int(round(planned_pct * 100))}%" if planned_pct is not None else "",
-                "pct_real_hoje": f"{int(round(actual_pct * 100))}%",
-                "gap_planejado_vs_real": f"{int(round(max(0.0, slip) * 100))}%" if planned_pct is not None else "",
-                "demandas_abertas": open_count,
-                "demandas_vencidas": overdue_open,
-                "data_prevista_fim": projected_finish.isoformat() if projected_finish else "",
-                "dias_previstos_atraso": int(delay_days) if delay_days is not None else None,
-                "risco": risk_level,
-                "tendência": tendencia,
-                "_risk_score": float(score),
-            }
-        )
+def _get_snapshot_max_age_seconds() -> float:
+    """Idade máxima do snapshot em disco servido numa partida a frio (0 desliga)."""
+    raw = _get_secret_value("GSHEETS_SNAPSHOT_MAX_AGE_SECONDS")
+    if not raw:
+        return 86400.0
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 86400.0
 
-    df = pd.DataFrame(rows)
-    if not df.empty:
-        # Garantir compatibilidade com Arrow (st.dataframe) evitando mistura str/int
-        if "dias_previstos_atraso" in df.columns:
-            df["dias_previstos_atraso"] = pd.to_numeric(df["dias_previstos_atraso"], errors="coerce").astype("Int64")
-        df = df.sort_values(["tendência", "_risk_score", "dias_previstos_atraso", "demandas_vencidas"], ascending=[True, False, False, False])
-        df = df.drop(columns=["_risk_score"], errors="ignore")
-    return df
 
+def _get_cache_ttl_seconds() -> float:
+    """Validade do cache de leitura compartilhado entre sessões."""
+    raw = _get_secret_value("GSHEETS_CACHE_TTL_SECONDS")
+    if not raw:
+        return 60.0
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 60.0
 
 
-# Storage backend: Google Planilhas
+# Storage backend: SQLite local (DATABASE_URL=sqlite:///...) ou Google Planilhas
+database_url = _get_database_url()
+# DATABASE_URL de outros bancos (ex.: Postgres antigo) é ignorada: só sqlite:/// tem backend aqui
+use_sqlite = database_url.strip().lower().startswith("sqlite:")
 gs_cfg = _get_gsheets_config()
 use_gsheets = _gsheets_is_configured(gs_cfg)
 
-if use_gsheets:
+if use_sqlite:
+    st.session_state.storage_backend = "sqlite"
+    current = st.session_state.get("db_manager")
+    try:
+        if not isinstance(current, SQLiteManager) or current.path != sqlite_path_from_url(database_url):
+            st.session_state.db_manager = create_backend_from_url(database_url)
+            st.session_state.pop("db_connected", None)
+    except Exception as e:
+        st.session_state.db_manager = None
+        st.session_state.db_connected = False
+        st.session_state.db_error = str(e)
+
+    if "db_connected" not in st.session_state:
+        try:
+            st.session_state.db_connected = bool(st.session_state.db_manager.health_check())
+        except Exception as e:
+            st.session_state.db_connected = False
+            st.session_state.db_error = str(e)
+elif use_gsheets:
     st.session_state.storage_backend = "gsheets"
-    if "db_manager" not in st.session_state or not isinstance(st.session_state.db_manager, GoogleSheetsManager):
+    shared_read_cache.ttl_seconds = _get_cache_ttl_seconds()
+    quotas = (
+        _get_per_minute("GSHEETS_READS_PER_MINUTE", RequestGovernor.READS_PER_MINUTE),
+        _get_per_minute("GSHEETS_WRITES_PER_MINUTE", RequestGovernor.WRITES_PER_MINUTE),
+    )
+    if quotas != (shared_governor.reads_per_minute, shared_governor.writes_per_minute):
+        shared_governor.configure(*quotas)
+    shared_snapshot_store.configure(
+        path=_get_secret_value("GSHEETS_SNAPSHOT_PATH") or None,
+        max_age_seconds=_get_snapshot_max_age_seconds(),
+    )
+    if "db_manager" not in st.session_state or not isinstance(st.session_state.db_manager, (GoogleSheetsManager, WriteBehindManager)):
         sa_info = load_service_account_info_from_env_or_secrets(getattr(st, "secrets", None))
-        st.session_state.db_manager = GoogleSheetsManager(
+        gs_manager = GoogleSheetsManager(
             spreadsheet_id=gs_cfg["spreadsheet_id"],
             service_account_info=sa_info,
         )
+        write_behind_seconds = _get_write_behind_seconds()
+        if write_behind_seconds > 0:
+            # Escritas saem do caminho do clique: são agrupadas e gravadas por uma thread em segundo plano
+            st.session_state.db_manager = WriteBehindManager(gs_manager, flush_interval=write_behind_seconds)
+        else:
+            st.session_state.db_manager = gs_manager
 
     if "db_connected" not in st.session_state:
         try:
@@ -241,15 +190,50 @@ else:
     st.session_state.storage_backend = "none"
     st.session_state.db_connected = False
     st.session_state.db_error = (
-        "Persistência não configurada. Configure Google Planilhas (GSHEETS_SPREADSHEET_ID + GOOGLE_SERVICE_ACCOUNT_JSON) em Secrets do Streamlit Cloud."
+        "Persistência não configurada. Configure Google Planilhas (GSHEETS_SPREADSHEET_ID + GOOGLE_SERVICE_ACCOUNT_JSON) "
+        "ou um banco local (DATABASE_URL=sqlite:///dados.db) em Secrets do Streamlit Cloud."
     )
 
-# Load data from Postgres
+def _aplicar_mudancas(mudancas: dict):
+    """Aplica às listas da sessão o que outras sessões gravaram (ver `pull_changes`), sem recarregar tudo.
+
+    As listas alteradas são trocadas por novas, de modo que o índice de demandas é remontado sozinho.
+    """
+    for chave in ("projetos", "etapas", "demandas"):
+        novos = {item.id: item for item in mudancas["upserts"].get(chave, [])}
+        removidos = set(mudancas["deletes"].get(chave, []))
+        if not novos and not removidos:
+            continue
+        lista = [novos.pop(item.id, item) for item in st.session_state[chave] if item.id not in removidos]
+        st.session_state[chave] = lista + list(novos.values())
+    if any(mudancas[tipo].get(chave) for tipo in ("upserts", "deletes", "updates")
+           for chave in ("checklist_topics", "checklist_tasks")):
+        ChecklistView.invalidate()
+
+# Load data from storage
 if st.session_state.db_connected:
+    if st.session_state.storage_backend == "gsheets" and "projetos" in st.session_state:
+        # Dados da partida a frio vieram do snapshot em disco e a revalidação achou abas mais novas
+        if st.session_state.db_manager.consume_snapshot_changes():
+            st.session_state.reload_data = True
+    if "projetos" in st.session_state and not st.session_state.get("reload_data", False):
+        # Só a cauda do journal: mudanças de outras sessões desde a carga (ou desde o último rerun)
+        try:
+            mudancas = st.session_state.db_manager.pull_changes()
+        except Exception:
+            mudancas = None  # falha na consulta não derruba a tela: tenta de novo no próximo rerun
+        if mudancas and mudancas["reload"]:
+            st.session_state.reload_data = True
+        elif mudancas:
+            _aplicar_mudancas(mudancas)
     if "projetos" not in st.session_state or st.session_state.get("reload_data", False):
-        st.session_state.projetos = st.session_state.db_manager.load_projetos()
-        st.session_state.demandas = st.session_state.db_manager.load_demandas()
-        st.session_state.etapas = st.session_state.db_manager.load_etapas()
+        # Uma única leitura em lote para todas as abas (em vez de uma chamada por aba)
+        dados = st.session_state.db_manager.load_all()
+        st.session_state.projetos = dados["projetos"]
+        st.session_state.demandas = dados["demandas"]
+        st.session_state.etapas = dados["etapas"]
+        # O check-list veio na mesma leitura em lote: a aba Check-list não precisa ler de novo
+        ChecklistView.set_data(dados.get("checklist_topics", []), dados.get("checklist_tasks", []))
         st.session_state.reload_data = False
 else:
     # Fallback to empty lists if DB not connected
@@ -264,6 +248,57 @@ else:
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _get_demanda_index() -> DemandaIndex:
+    """Índice das demandas da sessão; só é remontado quando a lista é trocada (nova carga, limpeza...)."""
+    demandas = st.session_state.demandas
+    idx = st.session_state.get("demanda_index")
+    if idx is None or idx.source is not demandas or len(idx) != len(demandas):
+        idx = DemandaIndex(demandas)
+        st.session_state.demanda_index = idx
+    return idx
+
+
+def _sync_demanda_index(idx: DemandaIndex, changed=(), removed=()):
+    """Aplica ao índice (obtido antes da mudança) as demandas alteradas/removidas, sem remontá-lo."""
+    for d in changed:
+        idx.upsert(d)
+    for demanda_id in removed:
+        idx.remove(demanda_id)
+    idx.source = st.session_state.demandas
+
+def _record_rerun_time(pagina: str, seconds: float):
+    """Guarda o tempo do rerun por página (últimos 20), para comparar o custo de cada tela."""
+    timings = st.session_state.setdefault("rerun_timings", {})
+    historico = timings.setdefault(pagina, [])
+    historico.append(seconds)
+    del historico[:-20]
+    st.session_state.last_rerun = (pagina, seconds)
+
+def _parar_pagina():
+    """`st.stop()` no meio da página, registrando antes o tempo do rerun (o fim do script não roda)."""
+    _record_rerun_time(pagina, time.perf_counter() - _RERUN_STARTED_AT)
+    _render_rerun_timings(rerun_timing_placeholder)
+    st.stop()
+
+def _render_rerun_timings(placeholder):
+    last = st.session_state.get("last_rerun")
+    if not last:
+        return
+    pagina, seconds = last
+    linhas = [f"Último rerun: **{seconds * 1000:.0f} ms** ({pagina})"]
+    for nome, historico in st.session_state.get("rerun_timings", {}).items():
+        linhas.append(f"- {nome}: média {sum(historico) / len(historico) * 1000:.0f} ms em {len(historico)} rerun(s)")
+    placeholder.markdown("\n".join(linhas))
+
+def _render_save_stats(db_manager):
+    saves = db_manager.save_stats()
+    if not saves["saves"]:
+        return
+    st.caption(
+        f"Gravações de lista completa: {saves['saves']} chamada(s), {saves['rows_received']} linha(s) recebidas e "
+        f"{saves['rows_transmitted']} efetivamente gravadas (só as novas, alteradas ou removidas)."
+    )
+
 def adicionar_projeto(nome: str, descricao: str, data_criacao: str, data_conclusao: str) -> bool:
     """Adiciona um novo projeto à lista e ao banco de dados."""
     try:
@@ -278,9 +313,9 @@ def adicionar_projeto(nome: str, descricao: str, data_criacao: str, data_conclus
         )
         st.session_state.projetos.append(novo_projeto)
         
-        # Salvar no Postgres se conectado
+        # Persistir somente a linha nova
         if st.session_state.db_connected:
-            st.session_state.db_manager.save_projetos(st.session_state.projetos)
+            st.session_state.db_manager.upsert_projeto(novo_projeto)
         
         return True
     except Exception as e:
@@ -302,7 +337,7 @@ def editar_projeto(projeto_id: str, nome: str, descricao: str, data_criacao: str
                     responsavel=proj.responsavel
                 )
                 if st.session_state.db_connected:
-                    st.session_state.db_manager.save_projetos(st.session_state.projetos)
+                    st.session_state.db_manager.upsert_projeto(st.session_state.projetos[i])
                 return True
         return False
     except Exception as e:
@@ -312,16 +347,16 @@ def editar_projeto(projeto_id: str, nome: str, descricao: str, data_criacao: str
 def deletar_projeto(projeto_id: str) -> bool:
     """Deleta um projeto."""
     try:
-        demandas_para_remover = [d for d in st.session_state.demandas if d.projeto_id == projeto_id]
+        idx = _get_demanda_index()
+        demandas_para_remover = idx.by("projeto_id", projeto_id)
 
         st.session_state.projetos = [p for p in st.session_state.projetos if p.id != projeto_id]
         st.session_state.demandas = [d for d in st.session_state.demandas if d.projeto_id != projeto_id]
+        _sync_demanda_index(idx, removed=[d.id for d in demandas_para_remover])
 
         if st.session_state.db_connected:
-            # Remover dependências (demandas) e depois o projeto
-            for d in demandas_para_remover:
-                st.session_state.db_manager.delete_demanda(d.id)
-            st.session_state.db_manager.delete_projeto(projeto_id)
+            # Projeto e suas demandas numa única escrita em lote
+            st.session_state.db_manager.delete_projeto_cascade(projeto_id)
         
         return True
     except Exception as e:
@@ -352,15 +387,44 @@ def adicionar_demanda_from_dict(data: dict) -> bool:
             tags=data.get('tags') or [],
             comentarios=data.get('comentarios') or []
         )
+        idx = _get_demanda_index()
         st.session_state.demandas.append(nova_demanda)
+        _sync_demanda_index(idx, changed=[nova_demanda])
         if st.session_state.db_connected:
-            st.session_state.db_manager.save_demandas(st.session_state.demandas)
+            st.session_state.db_manager.upsert_demanda(nova_demanda)
         return True
     except Exception as e:
         st.error(f"Erro ao adicionar demanda: {e}")
         return False
 
 
+def _gravar_demanda(i: int, anterior: Demanda):
+    """Grava a demanda da posição `i`; se a escrita falhar, devolve `anterior` à lista e repassa o erro.
+
+    Assim a tela não mostra um valor que não foi gravado. Em conflito de edição, a sessão também é
+    recarregada no próximo rerun, para a nova tentativa partir da versão atual da linha.
+    """
+    if not st.session_state.db_connected:
+        return
+    try:
+        st.session_state.db_manager.upsert_demanda(st.session_state.demandas[i])
+    except Exception as e:
+        st.session_state.demandas[i] = anterior
+        _sync_demanda_index(_get_demanda_index(), changed=[anterior])
+        if isinstance(e, WriteConflictError):
+            st.session_state.reload_data = True
+        raise
+
+def _render_conflitos():
+    """Aviso de conflitos do write-behind (gravados em segundo plano), na página onde se está editando."""
+    db_manager = st.session_state.get("db_manager")
+    if not isinstance(db_manager, WriteBehindManager) or not db_manager.conflicts:
+        return
+    st.warning(db_manager.last_error)
+    if st.button("🔄 Recarregar dados", key=f"reload_conflitos_{pagina}"):
+        st.session_state.reload_data = True
+        st.rerun()
+
 def editar_demanda_from_dict(demanda_id: str, data: dict) -> bool:
     """Edita uma demanda usando um dict com campos completos."""
     try:
@@ -386,8 +450,8 @@ def editar_demanda_from_dict(demanda_id: str, data: dict) -> bool:
                     tags=data.get('tags', dem.tags),
                     comentarios=data.get('comentarios', dem.comentarios)
                 )
-                if st.session_state.db_connected:
-                    st.session_state.db_manager.save_demandas(st.session_state.demandas)
+                _sync_demanda_index(_get_demanda_index(), changed=[st.session_state.demandas[i]])
+                _gravar_demanda(i, dem)
                 return True
         return False
     except Exception as e:
@@ -399,20 +463,15 @@ def editar_demanda(demanda_id: str, titulo: str, descricao: str, prioridade: str
     try:
         for i, dem in enumerate(st.session_state.demandas):
             if dem.id == demanda_id:
-                st.session_state.demandas[i] = Demanda(
-                    id=demanda_id,
-                    projeto_id=dem.projeto_id,
+                st.session_state.demandas[i] = replace(
+                    dem,
                     titulo=titulo,
                     descricao=descricao,
                     prioridade=prioridade,
-                    status=dem.status,
-                    responsavel=dem.responsavel,
                     data_vencimento=data_vencimento,
-                    data_criacao=dem.data_criacao,
-                    horas_estimadas=dem.horas_estimadas
                 )
-                if st.session_state.db_connected:
-                    st.session_state.db_manager.save_demandas(st.session_state.demandas)
+                _sync_demanda_index(_get_demanda_index(), changed=[st.session_state.demandas[i]])
+                _gravar_demanda(i, dem)
                 return True
         return False
     except Exception as e:
@@ -422,7 +481,9 @@ def editar_demanda(demanda_id: str, titulo: str, descricao: str, prioridade: str
 def deletar_demanda(demanda_id: str) -> bool:
     """Deleta uma demanda."""
     try:
+        idx = _get_demanda_index()
         st.session_state.demandas = [d for d in st.session_state.demandas if d.id != demanda_id]
+        _sync_demanda_index(idx, removed=[demanda_id])
 
         if st.session_state.db_connected:
             st.session_state.db_manager.delete_demanda(demanda_id)
@@ -437,20 +498,9 @@ def mudar_status_demanda(demanda_id: str, novo_status: str) -> bool:
     try:
         for i, dem in enumerate(st.session_state.demandas):
             if dem.id == demanda_id:
-                st.session_state.demandas[i] = Demanda(
-                    id=demanda_id,
-                    projeto_id=dem.projeto_id,
-                    titulo=dem.titulo,
-                    descricao=dem.descricao,
-                    prioridade=dem.prioridade,
-                    status=novo_status,
-                    responsavel=dem.responsavel,
-                    data_vencimento=dem.data_vencimento,
-                    data_criacao=dem.data_criacao,
-                    horas_estimadas=dem.horas_estimadas
-                )
-                if st.session_state.db_connected:
-                    st.session_state.db_manager.save_demandas(st.session_state.demandas)
+                st.session_state.demandas[i] = replace(dem, status=novo_status)
+                _sync_demanda_index(_get_demanda_index(), changed=[st.session_state.demandas[i]])
+                _gravar_demanda(i, dem)
                 return True
         return False
     except Exception as e:
@@ -470,15 +520,25 @@ def adicionar_etapa(demanda_id: str, titulo: str, descricao: str, data_venciment
         st.session_state.etapas.append(nova_etapa)
         
         # associar etapa a demanda se informado
-        if demanda_id:
-            for i, d in enumerate(st.session_state.demandas):
-                if d.id == demanda_id:
-                    st.session_state.demandas[i].etapa_id = nova_etapa.id
-                    break
-        
+        idx = _get_demanda_index()
+        demanda_associada = idx.get(demanda_id) if demanda_id else None
+        etapa_anterior = demanda_associada.etapa_id if demanda_associada is not None else None
+        if demanda_associada is not None:
+            demanda_associada.etapa_id = nova_etapa.id
+            _sync_demanda_index(idx, changed=[demanda_associada])
+
+        def desfazer():
+            st.session_state.etapas = [e for e in st.session_state.etapas if e.id != nova_etapa.id]
+            if demanda_associada is not None:
+                demanda_associada.etapa_id = etapa_anterior
+                _sync_demanda_index(idx, changed=[demanda_associada])
+
         if st.session_state.db_connected:
-            st.session_state.db_manager.save_etapas(st.session_state.etapas)
-            st.session_state.db_manager.save_demandas(st.session_state.demandas)
+            # Etapa e demanda numa única escrita; se falhar, a sessão volta ao estado anterior
+            with st.session_state.db_manager.unit_of_work(on_rollback=desfazer) as uow:
+                uow.upsert_etapa(nova_etapa)
+                if demanda_associada is not None:
+                    uow.upsert_demanda(demanda_associada)
         
         return True
     except Exception as e:
@@ -488,15 +548,26 @@ def adicionar_etapa(demanda_id: str, titulo: str, descricao: str, data_venciment
 def deletar_etapa(etapa_id: str) -> bool:
     """Deleta uma etapa."""
     try:
-        st.session_state.etapas = [e for e in st.session_state.etapas if e.id != etapa_id]
+        etapas_antes = st.session_state.etapas
+        st.session_state.etapas = [e for e in etapas_antes if e.id != etapa_id]
         # desassociar etapa de demandas que apontavam para ela
-        for i, d in enumerate(st.session_state.demandas):
-            if d.etapa_id == etapa_id:
-                st.session_state.demandas[i].etapa_id = None
+        idx = _get_demanda_index()
+        demandas_afetadas = idx.by("etapa_id", etapa_id)
+        for d in demandas_afetadas:
+            d.etapa_id = None
+        _sync_demanda_index(idx, changed=demandas_afetadas)
+
+        def desfazer():
+            st.session_state.etapas = etapas_antes
+            for d in demandas_afetadas:
+                d.etapa_id = etapa_id
+            _sync_demanda_index(idx, changed=demandas_afetadas)
 
         if st.session_state.db_connected:
-            st.session_state.db_manager.delete_etapa(etapa_id)
-            st.session_state.db_manager.save_demandas(st.session_state.demandas)
+            # Remoção da etapa e desassociação das demandas numa única escrita (tudo ou nada)
+            with st.session_state.db_manager.unit_of_work(on_rollback=desfazer) as uow:
+                uow.delete_etapa(etapa_id)
+                uow.upsert_demandas(demandas_afetadas)
         
         return True
     except Exception as e:
@@ -540,24 +611,48 @@ with st.sidebar:
         st.success("Todos os dados foram limpos!")
         st.rerun()
 
-# Main Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Dashboard", "🎯 Kanban", "⚙️ Configurações", "🛠️ Gerenciar", "✅ Check-list"])
+    st.markdown("---")
+    st.markdown("### ⏱️ Desempenho")
+    # Preenchido no fim do script, quando o tempo deste rerun já é conhecido
+    rerun_timing_placeholder = st.empty()
+
+# Navegação principal: só a página escolhida executa (com st.tabs, as cinco rodavam a cada rerun)
+PAGINAS = {
+    "Dashboard": "graph-up",
+    "Kanban": "kanban",
+    "Configurações": "gear",
+    "Gerenciar": "tools",
+    "Check-list": "check2-square",
+}
+pagina = option_menu(
+    None,
+    list(PAGINAS),
+    icons=list(PAGINAS.values()),
+    orientation="horizontal",
+    key="pagina",
+)
+if pagina != "Kanban":
+    # No Kanban o aviso fica dentro do quadro (fragmento), que é o que roda de novo a cada ação
+    _render_conflitos()
 
 # ============================================================================
 # TAB 1: DASHBOARD
 # ============================================================================
-with tab1:
+if pagina == "Dashboard":
     st.subheader("📈 Dashboard de Projetos")
     
     # Render dashboard metrics and graphs
     from src.modules.kanban import DashboardMetrics
-    DashboardMetrics.render_metrics(st.session_state.projetos, st.session_state.demandas)
+    demanda_index = _get_demanda_index()
+    DashboardMetrics.render_metrics(st.session_state.projetos, st.session_state.demandas, index=demanda_index)
 
     # Previsão de atraso (Curva S: planejado vs realizado)
     st.markdown("---")
     st.markdown("### ⏱️ Previsão de Atraso (Curva S)")
     if st.session_state.projetos:
-        df_risk = _compute_project_delay_risk(st.session_state.projetos, st.session_state.demandas)
+        df_risk = compute_project_delay_risk(
+            st.session_state.projetos, st.session_state.demandas, dates=demanda_index.dates
+        )
         if df_risk.empty:
             st.info("Sem dados suficientes para calcular risco.")
         else:
@@ -571,37 +666,58 @@ with tab1:
     st.markdown("---")
 
     # Curva S (planejado x realizado)
-    GanttChart.render_curva_s(st.session_state.demandas, st.session_state.projetos, st.session_state.etapas)
+    GanttChart.render_curva_s(st.session_state.demandas, st.session_state.projetos, st.session_state.etapas, index=demanda_index)
 
     # Gantt (visão completa com drilldown)
     st.markdown("### 📊 Gantt (Projetos / Etapas / Demandas)")
-    GanttChart.render_gantt_com_drilldown(st.session_state.demandas, st.session_state.projetos, st.session_state.etapas)
+    GanttChart.render_gantt_com_drilldown(
+        st.session_state.demandas, st.session_state.projetos, st.session_state.etapas, index=demanda_index
+    )
 
 # ============================================================================
 # TAB 2: KANBAN
 # ============================================================================
-with tab2:
+if pagina == "Kanban":
     st.subheader("🎯 Visualização Kanban")
     
-    # Define callbacks
+    # Define callbacks (`on_click` dos cards): alteram a lista da sessão e gravam antes de o quadro rodar de
+    # novo; como o quadro é um `st.fragment`, só ele é reexecutado
     def _on_status_change(demanda_obj, novo_status):
         try:
             mudar_status_demanda(demanda_obj.id, novo_status)
-            st.rerun()
         except Exception as e:
             st.error(f"Erro ao atualizar status: {e}")
     
     def _on_edit(demanda_obj):
         # mantém o fluxo de edição dentro do Kanban (flag específica)
         st.session_state[f"kanban_edit_dem_{demanda_obj.id}"] = True
-        st.rerun()
     
     def _on_delete(demanda_obj):
         try:
             deletar_demanda(demanda_obj.id)
-            st.rerun()
         except Exception as e:
             st.error(f"Erro ao deletar demanda: {e}")
+
+    @st.fragment
+    def _render_kanban_board(filtro_projeto, filtro_etapa):
+        # Roda de novo sozinho a cada ação num card: lê a lista/índice da sessão a cada execução, pois a
+        # exclusão troca a lista e os argumentos do fragmento são os da última execução completa
+        inicio = time.perf_counter()
+        _render_conflitos()
+        KanbanView.render_kanban(
+            st.session_state.demandas,
+            on_status_change=_on_status_change,
+            on_edit=_on_edit,
+            on_delete=_on_delete,
+            filtro_projeto=filtro_projeto,
+            filtro_etapa=filtro_etapa,
+            projetos=st.session_state.projetos,
+            etapas=st.session_state.etapas,
+            on_edit_save=editar_demanda_from_dict,
+            index=_get_demanda_index(),
+            rerun_scope="fragment",
+        )
+        _record_rerun_time("Kanban (quadro)", time.perf_counter() - inicio)
     
     if st.session_state.demandas:
         # Filtros
@@ -624,24 +740,14 @@ with tab2:
         filtro_projeto = None if projeto_opt == "Todos" else projeto_opt
         filtro_etapa = None if etapa_opt == "Todas" else etapa_opt
 
-        KanbanView.render_kanban(
-            st.session_state.demandas,
-            on_status_change=_on_status_change,
-            on_edit=_on_edit,
-            on_delete=_on_delete,
-            filtro_projeto=filtro_projeto,
-            filtro_etapa=filtro_etapa,
-            projetos=st.session_state.projetos,
-            etapas=st.session_state.etapas,
-            on_edit_save=editar_demanda_from_dict
-        )
+        _render_kanban_board(filtro_projeto, filtro_etapa)
     else:
         st.info("📌 Nenhuma demanda para visualizar.")
 
 # ============================================================================
 # TAB 3: CONFIGURAÇÕES
 # ============================================================================
-with tab3:
+if pagina == "Configurações":
     st.subheader("⚙️ Configurações")
     
     st.markdown("### 💾 Armazenamento de Dados")
@@ -694,10 +800,83 @@ with tab3:
                     st.rerun()
         with col2:
             if st.button("🔄 Recarregar dados", key="reload_gs"):
+                if st.session_state.get("db_connected"):
+                    st.session_state.db_manager.invalidate_read_cache()
                 st.session_state.reload_data = True
                 st.rerun()
+
+        if st.session_state.get("db_connected"):
+            cache_stats = st.session_state.db_manager.read_cache_stats()
+            st.caption(
+                f"Cache de leitura compartilhado: {cache_stats['hits']} acertos, "
+                f"{cache_stats['revalidations']} revalidados sem download (versão inalterada), {cache_stats['misses']} downloads "
+                f"({cache_stats['hit_rate'] * 100:.0f}% servidos do cache), {cache_stats['entries']} aba(s) em cache, "
+                f"validade {cache_stats['ttl_seconds']:.0f}s."
+            )
+            api = st.session_state.db_manager.api_stats()
+            st.caption(
+                f"API do Google: {api['calls_last_minute']} chamada(s) no último minuto "
+                f"(cota {api['reads_per_minute']:.0f} leituras + {api['writes_per_minute']:.0f} escritas/min), "
+                f"{api['reads']} leituras e {api['writes']} escritas no total, {api['throttled']} espera(s) pelo limite "
+                f"({api['throttled_seconds']:.1f}s), {api['retries']} nova(s) tentativa(s) após 429/5xx, "
+                f"{api['failures']} falha(s) depois das tentativas."
+            )
+            pool = shared_client_pool.stats()
+            st.caption(
+                f"Conexão compartilhada: {pool['clients']} cliente(s) autorizado(s) e {pool['spreadsheets']} planilha(s) "
+                f"abertas no processo, reaproveitadas {pool['reuses']} vez(es); {pool['refreshes']} renovação(ões) de token."
+            )
+            _render_save_stats(st.session_state.db_manager)
+            snap = st.session_state.db_manager.snapshot_stats()
+            if snap["enabled"]:
+                idade = f"{snap['last_served_age'] / 60:.0f} min" if snap["last_served_age"] is not None else "—"
+                st.caption(
+                    f"Snapshot em disco (partida a frio): servido {snap['served']} vez(es), idade do último {idade} "
+                    f"(máx. {snap['max_age_seconds'] / 3600:.1f} h); revalidação: {snap['revalidated_unchanged']} aba(s) "
+                    f"confirmadas, {snap['revalidated_changed']} atualizadas, {snap['revalidating']} em andamento."
+                )
+
+        db_manager = st.session_state.get("db_manager")
+        if isinstance(db_manager, WriteBehindManager):
+            st.markdown("#### 🔁 Sincronização")
+            sync = db_manager.status()
+            s1, s2, s3 = st.columns(3)
+            with s1:
+                st.metric("Alterações pendentes", sync["pending"])
+            with s2:
+                st.metric("Lotes gravados", sync["flush_count"])
+            with s3:
+                st.metric("Linhas gravadas", sync["rows_flushed"])
+            if sync["conflicts"]:
+                st.warning(sync["last_error"])
+            elif sync["last_error"]:
+                st.error(f"Última falha ao gravar (será tentado de novo): {sync['last_error']}")
+            elif sync["pending"] or sync["syncing"]:
+                st.info("Gravando alterações no Google Planilhas em segundo plano...")
+            else:
+                st.caption(f"Tudo sincronizado. Última gravação: {sync['last_flush_at'] or '—'}")
+            if st.button("⏫ Sincronizar agora", key="flush_gs"):
+                if db_manager.flush():
+                    st.success("Alterações gravadas.")
+                else:
+                    st.error(f"Falha ao gravar: {db_manager.last_error}")
+    elif storage_backend == "sqlite":
+        db_manager = st.session_state.get("db_manager")
+        if st.session_state.get("db_connected"):
+            st.success("✅ **Conectado ao SQLite local**")
+        else:
+            st.error("❌ **Falha ao abrir o banco SQLite**")
+        if isinstance(db_manager, SQLiteManager):
+            st.caption(f"Arquivo: `{db_manager.path}`")
+            _render_save_stats(db_manager)
+        if st.session_state.get("db_error"):
+            st.warning(f"Detalhes: {st.session_state.db_error}")
+
+        if st.button("🔄 Recarregar dados", key="reload_sqlite"):
+            st.session_state.reload_data = True
+            st.rerun()
     else:
-        st.warning("Persistência não configurada (Google Planilhas).")
+        st.warning("Persistência não configurada (Google Planilhas ou DATABASE_URL=sqlite:///...).")
         if gs_missing:
             st.info("Faltam secrets: " + ", ".join(gs_missing))
         if st.session_state.get("db_error"):
@@ -713,7 +892,14 @@ with tab3:
         st.metric("Demandas", len(st.session_state.demandas))
     with col3:
         st.metric("Etapas", len(st.session_state.etapas))
-    
+
+    fig_stats = GanttChart.figure_cache().stats()
+    st.caption(
+        f"Cache de figuras (Gantt/Curva S): {fig_stats['hits']} reaproveitadas, {fig_stats['misses']} montadas "
+        f"({fig_stats['hit_rate'] * 100:.0f}% do cache), {fig_stats['entries']}/{fig_stats['max_entries']} em cache, "
+        f"{fig_stats['evictions']} descartadas."
+    )
+
     st.markdown("---")
     st.markdown("### 🧹 Limpeza de Dados")
     
@@ -731,6 +917,7 @@ with tab3:
             if st.button("🗑️ Limpar Banco de Dados", key="clear_db"):
                 try:
                     st.session_state.db_manager.clear_all()
+                    ChecklistView.invalidate()
                     st.session_state.projetos = []
                     st.session_state.demandas = []
                     st.session_state.etapas = []
@@ -742,19 +929,19 @@ with tab3:
 # ============================================================================
 # TAB 4: GERENCIAR (ADMIN)
 # ============================================================================
-with tab4:
+if pagina == "Gerenciar":
     st.subheader("🛠️ Gerenciar (Cadastro)")
 
     if not st.session_state.get("db_connected", False):
-        st.warning("Conecte o app ao Google Planilhas para cadastrar dados e persistir na nuvem.")
-        st.stop()
+        st.warning("Conecte o app ao armazenamento (Google Planilhas ou SQLite) para cadastrar e persistir dados.")
+        _parar_pagina()
 
     admin_password = _get_secret_value("ADMIN_PASSWORD")
     if not admin_password:
         st.warning(
             "A área de cadastro está protegida. Para habilitar, crie `ADMIN_PASSWORD` em Settings → Secrets (Streamlit Cloud)."
         )
-        st.stop()
+        _parar_pagina()
 
     if "admin_ok" not in st.session_state:
         st.session_state.admin_ok = False
@@ -769,7 +956,7 @@ with tab4:
                     st.error("Senha inválida.")
                 else:
                     st.rerun()
-        st.stop()
+        _parar_pagina()
 
     col1, col2 = st.columns([1, 4])
     with col1:
@@ -823,8 +1010,8 @@ with tab4:
         prioridade_choices = [PriorityEnum.BAIXA.value, PriorityEnum.MEDIA.value, PriorityEnum.ALTA.value, PriorityEnum.URGENTE.value]
 
         for p_idx, p in enumerate(projetos):
-            p_start = _parse_date_yyyy_mm_dd(getattr(p, "data_criacao", None)) or today
-            p_due = _parse_date_yyyy_mm_dd(getattr(p, "data_conclusao", None)) or (today + timedelta(days=60))
+            p_start = parse_date(getattr(p, "data_criacao", None)) or today
+            p_due = parse_date(getattr(p, "data_conclusao", None)) or (today + timedelta(days=60))
             horizon_days = max(14, (p_due - p_start).days)
 
             # 5 demandas por projeto => 100 demandas (20 projetos)
@@ -943,7 +1130,7 @@ with tab4:
                 data_conclusao=proj_form.get("data_conclusao"),
             )
             st.session_state.projetos.append(novo)
-            st.session_state.db_manager.save_projetos(st.session_state.projetos)
+            st.session_state.db_manager.upsert_projeto(novo)
             st.success("Projeto criado.")
             st.rerun()
     else:
@@ -973,8 +1160,8 @@ with tab4:
                                     data_criacao=projeto.data_criacao,
                                     data_conclusao=proj_form.get("data_conclusao", projeto.data_conclusao),
                                 )
+                                st.session_state.db_manager.upsert_projeto(st.session_state.projetos[i])
                                 break
-                        st.session_state.db_manager.save_projetos(st.session_state.projetos)
                         st.success("Projeto atualizado.")
                         st.rerun()
                 with c2:
@@ -999,7 +1186,7 @@ with tab4:
                 data_criacao=datetime.now().strftime("%Y-%m-%d"),
             )
             st.session_state.etapas.append(nova)
-            st.session_state.db_manager.save_etapas(st.session_state.etapas)
+            st.session_state.db_manager.upsert_etapa(nova)
             st.success("Etapa criada.")
             st.rerun()
     else:
@@ -1027,8 +1214,8 @@ with tab4:
                                     ordem=int(etapa_form.get("ordem", etapa.ordem) or 0),
                                     data_criacao=etapa.data_criacao,
                                 )
+                                st.session_state.db_manager.upsert_etapa(st.session_state.etapas[i])
                                 break
-                        st.session_state.db_manager.save_etapas(st.session_state.etapas)
                         st.success("Etapa atualizada.")
                         st.rerun()
                 with c2:
@@ -1043,7 +1230,7 @@ with tab4:
     st.markdown("### 📝 Demandas")
     if not st.session_state.projetos:
         st.warning("Crie pelo menos 1 projeto antes de cadastrar demandas.")
-        st.stop()
+        _parar_pagina()
 
     dem_mode = st.radio("Ação", ["Criar", "Editar"], horizontal=True, key="admin_dem_mode")
     if dem_mode == "Criar":
@@ -1062,13 +1249,14 @@ with tab4:
         if not st.session_state.demandas:
             st.info("Nenhuma demanda cadastrada ainda.")
         else:
+            dem_index = _get_demanda_index()
             dem_id = st.selectbox(
                 "Selecione uma demanda",
                 options=[d.id for d in st.session_state.demandas],
-                format_func=lambda x: next((d.titulo for d in st.session_state.demandas if d.id == x), x),
+                format_func=lambda x: getattr(dem_index.get(x), "titulo", x),
                 key="admin_dem_select",
             )
-            demanda = next((d for d in st.session_state.demandas if d.id == dem_id), None)
+            demanda = dem_index.get(dem_id)
             if demanda:
                 data = create_demanda_form_v2(
                     st.session_state.projetos,
@@ -1091,7 +1279,7 @@ with tab4:
 # ============================================================================
 # TAB 5: CHECK-LIST (SEM PERSISTÊNCIA)
 # ============================================================================
-with tab5:
+if pagina == "Check-list":
     ChecklistView.render()
 
 # ============================================================================
@@ -1103,3 +1291,9 @@ st.markdown("""
     <small>App de Gestão de Demandas e Projetos | Versão 2.0</small>
 </div>
 """, unsafe_allow_html=True)
+
+# ============================================================================
+# TEMPO POR RERUN
+# ============================================================================
+_record_rerun_time(pagina, time.perf_counter() - _RERUN_STARTED_AT)
+_render_rerun_timings(rerun_timing_placeholder)
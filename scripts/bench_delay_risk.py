@@ -0,0 +1,264 @@
+"""Equivalência e benchmark do cálculo de risco de atraso (Curva S) do Dashboard.
+
+Confere que `compute_project_delay_risk` (colunar) devolve exatamente o mesmo DataFrame que a
+implementação anterior (laço projetos × demandas, copiada abaixo) em dados sintéticos com casos de
+borda, para várias datas de referência, e mede as duas em 1k projetos / 100k demandas.
+
+Uso:
+  python scripts/bench_delay_risk.py
+  python scripts/bench_delay_risk.py --projetos 1000 --demandas 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules.delay_risk import compute_project_delay_risk  # noqa: E402
+from src.modules.models import Projeto, Demanda, StatusEnum  # noqa: E402
+
+
+# ------------------------- Implementação anterior (referência) -------------------------
+
+
+def _parse_date_yyyy_mm_dd(value: str):
+    if not value:
+        return None
+    try:
+        # aceita "YYYY-MM-DD" ou ISO com hora
+        return datetime.fromisoformat(str(value)[:10]).date()
+    except Exception:
+        return None
+
+
+def _planned_progress_for_demanda(d, today):
+    start = _parse_date_yyyy_mm_dd(getattr(d, "data_inicio_plano", None))
+    end = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento_plano", None))
+    if not end:
+        end = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento", None))
+
+    if not start and not end:
+        return None
+    if not start and end:
+        return 1.0 if today >= end else 0.0
+    if start and not end:
+        return 1.0 if today > start else 0.0
+
+    if today <= start:
+        return 0.0
+    if today >= end:
+        return 1.0
+    total = (end - start).days
+    if total <= 0:
+        return 1.0
+    return max(0.0, min(1.0, (today - start).days / float(total)))
+
+
+def _actual_progress_for_demanda(d):
+    try:
+        pct = float(getattr(d, "percentual_completo", 0) or 0)
+    except Exception:
+        pct = 0.0
+    return max(0.0, min(1.0, pct / 100.0))
+
+
+def _legacy_compute_project_delay_risk(projetos, demandas, today):
+    """Heurística baseada em Curva S: planejado vs realizado + prazos (projeto e demandas)."""
+    rows = []
+
+    for p in projetos:
+        ds = [d for d in demandas if getattr(d, "projeto_id", None) == p.id]
+        if not ds:
+            continue
+
+        # Prazo do projeto: preferir data_conclusao do projeto; senão usar maior vencimento planejado das demandas
+        p_due = _parse_date_yyyy_mm_dd(getattr(p, "data_conclusao", None))
+        if not p_due:
+            due_candidates = [_parse_date_yyyy_mm_dd(getattr(d, "data_vencimento_plano", None)) for d in ds]
+            due_candidates = [x for x in due_candidates if x]
+            p_due = max(due_candidates) if due_candidates else None
+
+        planned_list = []
+        actual_list = []
+        overdue_open = 0
+        open_count = 0
+
+        for d in ds:
+            planned = _planned_progress_for_demanda(d, today)
+            actual = _actual_progress_for_demanda(d)
+
+            if planned is not None:
+                planned_list.append(planned)
+            actual_list.append(actual)
+
+            is_open = getattr(d, "status", None) != StatusEnum.DONE.value and actual < 1.0
+            if is_open:
+                open_count += 1
+                due = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento_plano", None))
+                if not due:
+                    due = _parse_date_yyyy_mm_dd(getattr(d, "data_vencimento", None))
+                if due and due < today:
+                    overdue_open += 1
+
+        planned_pct = sum(planned_list) / len(planned_list) if planned_list else None
+        actual_pct = sum(actual_list) / len(actual_list) if actual_list else 0.0
+        slip = (planned_pct - actual_pct) if planned_pct is not None else 0.0
+
+        # Projeção de término por velocidade (baseado em % realizado)
+        start_candidates = [_parse_date_yyyy_mm_dd(getattr(d, "data_inicio_plano", None)) for d in ds]
+        start_candidates = [x for x in start_candidates if x]
+        p_start = min(start_candidates) if start_candidates else None
+
+        projected_finish = None
+        delay_days = None
+
+        if p_start:
+            elapsed_days = max(1, (today - p_start).days)
+            velocity_per_day = actual_pct / float(elapsed_days)
+            remaining = max(0.0, 1.0 - actual_pct)
+            if velocity_per_day > 0.0:
+                projected_finish = today + timedelta(days=int(round(remaining / velocity_per_day)))
+                if p_due:
+                    delay_days = max(0, (projected_finish - p_due).days)
+
+        overdue_ratio = overdue_open / float(len(ds)) if ds else 0.0
+        deadline_pressure = 0.0
+        if p_due:
+            days_to_due = (p_due - today).days
+            if days_to_due <= 7:
+                deadline_pressure = 0.15
+            elif days_to_due <= 14:
+                deadline_pressure = 0.08
+
+        score = max(0.0, slip) * 0.7 + overdue_ratio * 0.3 + deadline_pressure
+
+        if score >= 0.35 or (delay_days is not None and delay_days >= 1):
+            risk_level = "Alto"
+        elif score >= 0.18:
+            risk_level = "Médio"
+        else:
+            risk_level = "Baixo"
+
+        tendencia = "Atraso provável" if (delay_days is not None and delay_days >= 1) or risk_level == "Alto" else "No prazo"
+
+        rows.append(
+            {
+                "projeto": getattr(p, "nome", p.id),
+                "prazo_projeto": p_due.isoformat() if p_due else "",
+                "pct_planejado_hoje": f"{int(round(planned_pct * 100))}%" if planned_pct is not None else "",
+                "pct_real_hoje": f"{int(round(actual_pct * 100))}%",
+                "gap_planejado_vs_real": f"{int(round(max(0.0, slip) * 100))}%" if planned_pct is not None else "",
+                "demandas_abertas": open_count,
+                "demandas_vencidas": overdue_open,
+                "data_prevista_fim": projected_finish.isoformat() if projected_finish else "",
+                "dias_previstos_atraso": int(delay_days) if delay_days is not None else None,
+                "risco": risk_level,
+                "tendência": tendencia,
+                "_risk_score": float(score),
+            }
+        )
+
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        # Garantir compatibilidade com Arrow (st.dataframe) evitando mistura str/int
+        if "dias_previstos_atraso" in df.columns:
+            df["dias_previstos_atraso"] = pd.to_numeric(df["dias_previstos_atraso"], errors="coerce").astype("Int64")
+        df = df.sort_values(["tendência", "_risk_score", "dias_previstos_atraso", "demandas_vencidas"], ascending=[True, False, False, False])
+        df = df.drop(columns=["_risk_score"], errors="ignore")
+    return df
+
+
+# ------------------------- Dados sintéticos -------------------------
+
+
+def _synthetic(n_projetos: int, n_demandas: int, seed: int = 7) -> tuple[list[Projeto], list[Demanda]]:
+    rnd = random.Random(seed)
+    base = date(2025, 6, 1)
+
+    def _some_date(spread: int = 240):
+        roll = rnd.random()
+        if roll < 0.08:
+            return None
+        if roll < 0.10:
+            return "data inválida"
+        d = base + timedelta(days=rnd.randint(-spread, spread))
+        if roll < 0.20:
+            return d.isoformat() + "T10:30:00"
+        return d.isoformat()
+
+    projetos = [
+        Projeto(id=f"p{i}", nome=f"Projeto {i}", data_conclusao=_some_date() if rnd.random() < 0.5 else None)
+        for i in range(n_projetos)
+    ]
+    # Projeto repetido e projeto sem demandas
+    if projetos:
+        projetos.append(Projeto(id=projetos[0].id, nome="Projeto repetido", data_conclusao="2025-07-01"))
+    projetos.append(Projeto(id="sem_demandas", nome="Vazio"))
+
+    status = [s.value for s in StatusEnum]
+    demandas = []
+    for i in range(n_demandas):
+        projeto_id = f"p{rnd.randrange(max(1, n_projetos))}" if rnd.random() > 0.01 else "orfao"
+        demandas.append(
+            Demanda(
+                id=f"d{i}",
+                titulo=f"Demanda {i}",
+                descricao="",
+                projeto_id=projeto_id,
+                status=rnd.choice(status),
+                data_inicio_plano=_some_date(),
+                data_vencimento_plano=_some_date() if rnd.random() > 0.15 else None,
+                data_vencimento=_some_date() if rnd.random() > 0.5 else None,
+                percentual_completo=rnd.choice([0, 0, 10, 25, 50, 75, 90, 100, 100]),
+            )
+        )
+    return projetos, demandas
+
+
+# ------------------------- Execução -------------------------
+
+
+def _check_equivalence():
+    projetos, demandas = _synthetic(60, 3000)
+    for today in [date(2024, 12, 1), date(2025, 6, 1), date(2025, 9, 15), date(2026, 3, 1)]:
+        expected = _legacy_compute_project_delay_risk(projetos, demandas, today)
+        got = compute_project_delay_risk(projetos, demandas, today=today)
+        pd.testing.assert_frame_equal(got, expected)
+    # Casos vazios
+    assert compute_project_delay_risk([], demandas).empty
+    assert compute_project_delay_risk(projetos, []).empty
+    print("equivalência: ok (mesmo DataFrame que a implementação anterior)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projetos", type=int, default=1000)
+    parser.add_argument("--demandas", type=int, default=100_000)
+    parser.add_argument("--skip-legacy", action="store_true", help="não roda a versão anterior (lenta) no benchmark")
+    args = parser.parse_args()
+
+    _check_equivalence()
+
+    projetos, demandas = _synthetic(args.projetos, args.demandas)
+    today = date(2025, 6, 1)
+    t0 = time.perf_counter()
+    got = compute_project_delay_risk(projetos, demandas, today=today)
+    t_new = time.perf_counter() - t0
+    print(f"{args.projetos} projetos / {args.demandas} demandas:")
+    print(f"  colunar   {t_new * 1000:10.1f} ms")
+    if not args.skip_legacy:
+        t0 = time.perf_counter()
+        expected = _legacy_compute_project_delay_risk(projetos, demandas, today)
+        t_old = time.perf_counter() - t0
+        pd.testing.assert_frame_equal(got, expected)
+        print(f"  anterior  {t_old * 1000:10.1f} ms   ({t_old / t_new:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
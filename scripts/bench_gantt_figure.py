@@ -0,0 +1,146 @@
+"""Benchmark da figura do Gantt: um trace por barra (anterior) vs um único `go.Bar` (atual).
+
+Monta a mesma lista de tarefas (nível "Demandas", com hover de status/responsável) nos dois formatos e
+compara tempo de montagem, tempo de serialização e tamanho do JSON enviado ao navegador.
+Também confere que a figura atual cobre as mesmas tarefas, com o mesmo período e o mesmo texto.
+A montagem anterior é quadrática (o plotly revalida a figura a cada `add_trace`/`add_annotation`); acima de
+`--legacy-max` tarefas só a atual é medida.
+
+Uso:
+  python scripts/bench_gantt_figure.py
+  python scripts/bench_gantt_figure.py --tarefas 500 2000 5000 --legacy-max 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules.gantt import GanttChart  # noqa: E402
+
+
+# ------------------------- Figura anterior (referência) -------------------------
+
+
+def _legacy_figura_detalhada(tarefas, nivel):
+    """Barras do `_criar_gantt_detalhado` anterior: um Scatter e uma anotação por tarefa (layout omitido)."""
+    fig = go.Figure()
+    for tarefa in tarefas:
+        start = tarefa["Start"]
+        end = tarefa["End"]
+        duracao = (end - start).days + 1
+
+        fig.add_trace(go.Scatter(
+            x=[start, end],
+            y=[tarefa["Task"], tarefa["Task"]],
+            mode='lines',
+            line=dict(color=tarefa["Cor"], width=20),
+            name=tarefa["Task"],
+            hovertext=f"""
+            <b>{tarefa['Task'].strip()}</b><br>
+            <b>Status:</b> {tarefa['Status']}<br>
+            <b>Responsável:</b> {tarefa['Responsavel']}<br>
+            <b>Progresso:</b> {tarefa['Progresso']}<br>
+            <b>Período:</b> {start.strftime('%d/%m/%Y')} → {end.strftime('%d/%m/%Y')}<br>
+            <b>Duração:</b> {duracao} dias
+            """,
+            hoverinfo='text',
+            showlegend=False
+        ))
+
+        meio_data = start + (end - start) / 2
+        fig.add_annotation(
+            x=meio_data,
+            y=tarefa["Task"],
+            text=f"{tarefa['Progresso']}",
+            showarrow=False,
+            font=dict(color='white', size=9),
+            bgcolor=tarefa["Cor"],
+            bordercolor=tarefa["Cor"],
+            borderwidth=0
+        )
+    fig.update_layout(title=dict(text=f"<b>✅ Gantt - {nivel}</b>"), height=max(500, len(tarefas) * 50))
+    return fig
+
+
+# ------------------------- Dados sintéticos -------------------------
+
+
+def _synthetic_tarefas(n: int, seed: int = 7) -> list[dict]:
+    rnd = random.Random(seed)
+    cores = {"A Fazer": "#FF6B6B", "Em Progresso": "#FFD93D", "Em Revisão": "#6BCB77", "Concluído": "#4D96FF"}
+    inicio = date(2025, 1, 1)
+    tarefas = []
+    for i in range(n):
+        status = rnd.choice(list(cores))
+        start = inicio + timedelta(days=rnd.randint(0, 300))
+        tarefas.append(
+            {
+                "Task": f"  ├─ Etapa {i % 12} → Demanda {i}",
+                "Start": start,
+                "End": start + timedelta(days=rnd.randint(0, 60)),
+                "Status": status,
+                "Responsavel": f"Pessoa {i % 40}",
+                "Progresso": f"{rnd.randint(0, 100)}%",
+                "Cor": cores[status],
+            }
+        )
+    return tarefas
+
+
+# ------------------------- Execução -------------------------
+
+
+def _measure(build):
+    t0 = time.perf_counter()
+    fig = build()
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    payload = fig.to_json()
+    t_json = time.perf_counter() - t0
+    return fig, t_build, t_json, len(payload.encode("utf-8"))
+
+
+def _check_same_bars(tarefas, bar_fig):
+    (bar,) = bar_fig.data
+    assert list(bar.y) == [t["Task"] for t in tarefas]
+    assert list(bar.base) == [t["Start"].isoformat() for t in tarefas]
+    ends = [date.fromisoformat(b) + timedelta(milliseconds=x) for b, x in zip(bar.base, bar.x)]
+    assert ends == [t["End"] for t in tarefas]
+    assert list(bar.text) == [t["Progresso"] for t in tarefas]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tarefas", type=int, nargs="+", default=[100, 300, 2000])
+    parser.add_argument("--legacy-max", type=int, default=300, help="maior número de tarefas em que a figura anterior é montada")
+    args = parser.parse_args()
+
+    for n in args.tarefas:
+        tarefas = _synthetic_tarefas(n)
+        rows = []
+        if n <= args.legacy_max:
+            rows.append(("Scatter por barra", *_measure(lambda: _legacy_figura_detalhada(tarefas, "Demandas"))))
+        rows.append(("go.Bar único", *_measure(lambda: GanttChart._figura_gantt(tarefas, "Demandas", detalhado=True))))
+        _check_same_bars(tarefas, rows[-1][1])
+
+        print(f"{n} tarefas:")
+        print(f"  {'':<18}{'traces':>8}{'anotações':>11}{'montagem':>12}{'to_json':>11}{'JSON':>11}")
+        for label, fig, t_build, t_json, size in rows:
+            print(
+                f"  {label:<18}{len(fig.data):>8}{len(fig.layout.annotations):>11}"
+                f"{t_build * 1000:>9.0f} ms{t_json * 1000:>8.0f} ms{size / 1024:>8.0f} KiB"
+            )
+        if len(rows) == 2:
+            (_, _, old_build, _, old_size), (_, _, new_build, _, new_size) = rows
+            print(f"  redução do JSON: {(1 - new_size / old_size) * 100:.0f}%   montagem: {old_build / new_build:.0f}x mais rápida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Benchmark da conversão planilha -> modelos (load_demandas / load_projetos / load_etapas / check-list).
+
+Compara o caminho antigo (`iterrows()` + lambda por célula para tags/comentarios) com o caminho em
+bloco do GoogleSheetsManager, em abas sintéticas de 10k e 100k linhas, e confere que o resultado é igual.
+Não acessa o Google: parte do mesmo `get_all_values()` que a API devolveria.
+
+Uso:
+  python scripts/bench_load_conversion.py
+  python scripts/bench_load_conversion.py --rows 10000 50000 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules.google_sheets_manager import GoogleSheetsManager  # noqa: E402
+from src.modules.models import Projeto, Demanda, Etapa, StatusEnum, PriorityEnum  # noqa: E402
+
+
+# ------------------------- Caminho antigo (referência) -------------------------
+
+
+def _legacy_values_to_df(values):
+    header = values[0]
+    df = pd.DataFrame(values[1:], columns=header)
+    df = df.replace({"": None})
+    if "ordem" in df.columns:
+        df["ordem"] = pd.to_numeric(df["ordem"], errors="coerce").fillna(0).astype(int)
+    if "percentual_completo" in df.columns:
+        df["percentual_completo"] = pd.to_numeric(df["percentual_completo"], errors="coerce").fillna(0).astype(int)
+    for col in ["tags", "comentarios"]:
+        if col in df.columns:
+            def _parse_list(v):
+                if v is None:
+                    return []
+                s = str(v).strip()
+                if not s:
+                    return []
+                try:
+                    parsed = json.loads(s)
+                    return parsed if isinstance(parsed, list) else []
+                except Exception:
+                    return [s]
+
+            df[col] = df[col].apply(_parse_list)
+    return df
+
+
+def _legacy_models(df, model):
+    out = []
+    for _, row in df.iterrows():
+        data = row.to_dict()
+        data.pop("rev", None)  # revisão da linha: guardada à parte pelo manager, não vai para o modelo
+        out.append(model.from_dict(data))
+    return out
+
+
+def _legacy_tasks(df):
+    out = []
+    for _, row in df.iterrows():
+        out.append(
+            {
+                "id": row.get("id"),
+                "topic_id": row.get("topic_id"),
+                "texto": row.get("texto"),
+                "done": str(row.get("done")).lower() in ("1", "true", "yes", "sim"),
+                "created_at": row.get("created_at"),
+            }
+        )
+    return out
+
+
+# ------------------------- Dados sintéticos -------------------------
+
+
+def _synthetic_demandas(n: int, seed: int = 42) -> list[list[str]]:
+    rnd = random.Random(seed)
+    status = [s.value for s in StatusEnum]
+    prioridades = [p.value for p in PriorityEnum]
+    tags_pool = ["[]", "", '["backend"]', '["frontend", "ux"]', '["infra"]', '["bug", "urgente"]']
+    rows = [list(GoogleSheetsManager.HEADERS_DEMANDAS)]
+    for i in range(n):
+        rows.append(
+            [
+                f"dem{i:06d}",
+                f"Demanda {i}",
+                "Descrição gerada para benchmark" if i % 3 else "",
+                f"proj{i % 200:03d}",
+                rnd.choice(status),
+                rnd.choice(prioridades),
+                f"etapa{i % 8}",
+                f"Pessoa {i % 40}",
+                "2025-01-10",
+                "2025-01-12" if i % 2 else "",
+                "2025-03-01",
+                "",
+                "2025-03-01",
+                "2025-01-01T10:00:00",
+                "",
+                str(rnd.randint(0, 100)),
+                rnd.choice(tags_pool),
+                '["comentário %d"]' % (i % 50) if i % 5 == 0 else "[]",
+                str(i % 4),  # rev
+            ]
+        )
+    return rows
+
+
+def _synthetic_tasks(n: int) -> list[list[str]]:
+    rows = [list(GoogleSheetsManager.HEADERS_CHECKLIST_TASKS)]
+    for i in range(n):
+        rows.append([f"task{i}", f"topic{i % 100}", f"Tarefa {i}", "true" if i % 3 == 0 else "false", "2025-01-01T10:00:00"])
+    return rows
+
+
+# ------------------------- Execução -------------------------
+
+
+def _best_of(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _bench(label: str, legacy_fn, bulk_fn, repeat: int):
+    t_old, old = _best_of(legacy_fn, repeat)
+    t_new, new = _best_of(bulk_fn, repeat)
+    if old != new:
+        raise SystemExit(f"[{label}] resultado diferente entre caminho antigo e novo")
+    print(f"  {label:<14} antigo {t_old * 1000:9.1f} ms   em bloco {t_new * 1000:9.1f} ms   {t_old / t_new:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    gsm = GoogleSheetsManager
+    for n in args.rows:
+        print(f"{n} linhas:")
+        dem_values = _synthetic_demandas(n)
+        task_values = _synthetic_tasks(n)
+
+        _bench(
+            "demandas",
+            lambda: _legacy_models(_legacy_values_to_df(dem_values), Demanda),
+            lambda: gsm._demandas_from_df(gsm._values_to_df(dem_values)),
+            args.repeat,
+        )
+        proj_values = [gsm.HEADERS_PROJETOS] + [[f"p{i}", f"Projeto {i}", "", "A Fazer", "2025-01-01", "", f"R{i % 9}", "1"] for i in range(n)]
+        _bench(
+            "projetos",
+            lambda: _legacy_models(_legacy_values_to_df(proj_values), Projeto),
+            lambda: gsm._projetos_from_df(gsm._values_to_df(proj_values)),
+            args.repeat,
+        )
+        etapa_values = [gsm.HEADERS_ETAPAS] + [[f"e{i}", f"Etapa {i}", "", str(i % 10), "2025-01-01", "1"] for i in range(n)]
+        _bench(
+            "etapas",
+            lambda: _legacy_models(_legacy_values_to_df(etapa_values), Etapa),
+            lambda: gsm._etapas_from_df(gsm._values_to_df(etapa_values)),
+            args.repeat,
+        )
+        _bench(
+            "checklist",
+            lambda: _legacy_tasks(_legacy_values_to_df(task_values)),
+            lambda: gsm._checklist_tasks_from_df(gsm._values_to_df(task_values)),
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark de memória por sessão: lista de demandas carregada da planilha.
+
+Mede (com tracemalloc) quanto ocupa `st.session_state.demandas` com N demandas, comparando o modelo
+antigo (`@dataclass` comum, um `__dict__` e um `str` novo por célula) com o modelo atual
+(`@dataclass(slots=True)` e campos de baixa cardinalidade internados).
+As células passam por JSON antes de virar modelo, como acontece com a resposta da API do Google.
+
+Uso:
+  python scripts/bench_model_memory.py
+  python scripts/bench_model_memory.py --rows 50000 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from bench_load_conversion import _synthetic_demandas  # noqa: E402
+from src.modules.google_sheets_manager import GoogleSheetsManager  # noqa: E402
+from src.modules.models import Demanda  # noqa: E402
+
+
+@dataclass
+class _LegacyDemanda:
+    """Cópia do modelo anterior (sem slots, sem internar), só para comparação."""
+
+    id: str
+    titulo: str
+    descricao: str
+    projeto_id: str
+    status: str = "A Fazer"
+    prioridade: str = "Média"
+    etapa_id: Optional[str] = None
+    responsavel: Optional[str] = None
+    data_inicio_plano: Optional[str] = None
+    data_inicio_real: Optional[str] = None
+    data_vencimento_plano: Optional[str] = None
+    data_vencimento_real: Optional[str] = None
+    data_vencimento: Optional[str] = None
+    data_criacao: str = field(default_factory=lambda: datetime.now().isoformat())
+    data_conclusao: Optional[str] = None
+    percentual_completo: int = 0
+    tags: List[str] = field(default_factory=list)
+    comentarios: List[str] = field(default_factory=list)
+
+
+def _fresh_records(n: int) -> list[dict]:
+    # Ida e volta por JSON: cada célula vira um objeto str próprio, como na resposta da API
+    values = json.loads(json.dumps(_synthetic_demandas(n)))
+    df = GoogleSheetsManager._values_to_df(values)
+    return GoogleSheetsManager._model_records(df, Demanda)
+
+
+def _measure(model, n: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = _fresh_records(n)
+    items = [model(**r) for r in records]
+    # Os dicts/DataFrame intermediários somem depois da carga; só a lista de modelos fica na sessão
+    del records
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000])
+    args = parser.parse_args()
+
+    for n in args.rows:
+        legacy = _measure(_LegacyDemanda, n)
+        slotted = _measure(Demanda, n)
+        print(f"{n} demandas por sessão:")
+        print(f"  dataclass comum        {legacy / 2**20:8.1f} MiB  ({legacy / n:6.0f} B/demanda)")
+        print(f"  slots + str internado  {slotted / 2**20:8.1f} MiB  ({slotted / n:6.0f} B/demanda)")
+        print(f"  redução                {(1 - slotted / legacy) * 100:7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
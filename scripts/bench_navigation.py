@@ -0,0 +1,93 @@
+"""Tempo de rerun por página do app, com a navegação que executa só a página escolhida.
+
+Roda o `app.py` de verdade (streamlit.testing.AppTest) sobre um banco SQLite temporário com dados
+sintéticos, visita cada página algumas vezes e lê o tempo que o próprio app mede a cada rerun
+(`st.session_state.last_rerun`, o mesmo mostrado na barra lateral em "⏱️ Desempenho").
+Com `st.tabs`, todo rerun executava as cinco páginas: a soma das páginas é a referência de "antes".
+
+Uso:
+  python scripts/bench_navigation.py
+  python scripts/bench_navigation.py --demandas 2000 --reruns 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules.models import Demanda, Etapa, Projeto, StatusEnum  # noqa: E402
+from src.modules.sqlite_manager import SQLiteManager  # noqa: E402
+
+APP = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app.py"))
+PAGINAS = ["Dashboard", "Kanban", "Configurações", "Gerenciar", "Check-list"]
+
+
+def _seed(path: str, n_projetos: int, n_demandas: int):
+    rnd = random.Random(11)
+    m = SQLiteManager(path)
+    m.save_projetos([Projeto(id=f"p{i}", nome=f"Projeto {i}", data_conclusao="2026-12-01") for i in range(n_projetos)])
+    m.save_etapas([Etapa(id=f"e{i}", nome=f"Etapa {i}", ordem=i) for i in range(6)])
+    status = [s.value for s in StatusEnum]
+    m.save_demandas(
+        [
+            Demanda(
+                id=f"d{i}",
+                titulo=f"Demanda {i}",
+                descricao="",
+                projeto_id=f"p{i % n_projetos}",
+                etapa_id=f"e{i % 6}",
+                status=rnd.choice(status),
+                responsavel=f"Pessoa {i % 12}",
+                data_inicio_plano=f"2026-{rnd.randint(1, 6):02d}-01",
+                data_vencimento_plano=f"2026-{rnd.randint(7, 12):02d}-15",
+                percentual_completo=rnd.randint(0, 100),
+            )
+            for i in range(n_demandas)
+        ]
+    )
+    m.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projetos", type=int, default=20)
+    parser.add_argument("--demandas", type=int, default=500)
+    parser.add_argument("--reruns", type=int, default=3)
+    args = parser.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        _seed(path, args.projetos, args.demandas)
+        os.environ["DATABASE_URL"] = "sqlite:///" + path
+
+        at = AppTest.from_file(APP, default_timeout=300)
+        at.secrets["ADMIN_PASSWORD"] = "bench"
+        at.session_state["admin_ok"] = True
+        at.run()
+
+        melhores = {}
+        for pagina in PAGINAS:
+            tempos = []
+            for _ in range(args.reruns):
+                # O option_menu não guarda valor sem navegador: a página vai no session_state a cada rerun
+                at.session_state["pagina"] = pagina
+                at.run()
+                if at.exception:
+                    raise SystemExit(f"{pagina}: {at.exception[0].value}")
+                tempos.append(at.session_state["last_rerun"][1])
+            melhores[pagina] = min(tempos)
+
+    antes = sum(melhores.values())
+    print(f"{args.projetos} projetos / {args.demandas} demandas (melhor de {args.reruns} reruns):")
+    print(f"  {'st.tabs (antes)':<15} {antes * 1000:8.0f} ms   (todas as páginas em todo rerun)")
+    for pagina, seconds in melhores.items():
+        print(f"  {pagina:<15} {seconds * 1000:8.0f} ms   {antes / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
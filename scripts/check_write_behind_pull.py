@@ -0,0 +1,60 @@
+"""Cenário: pull do journal com escrita ainda na fila do write-behind (não pode perder a edição alheia).
+
+A sessão B enfileira uma edição feita sobre a versão que leu; antes de a fila ser gravada, a sessão A
+grava outra edição na mesma demanda e B faz `pull_changes()`. Com a fila pendente o pull não consulta o
+journal; quando a fila é gravada, a edição de B chega com a revisão antiga e vira conflito, a edição de A
+continua no banco e o pull seguinte a traz. Se o pull aplicasse a revisão nova antes, ela virava a base
+do compare-and-set e a fila regravava por cima da edição de A.
+
+Roda sobre SQLite temporário (mesma API do GoogleSheetsManager). Sai com código 1 se o cenário falhar.
+
+Uso:
+  python scripts/check_write_behind_pull.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules.models import Demanda  # noqa: E402
+from src.modules.sheets_write_behind import WriteBehindManager  # noqa: E402
+from src.modules.sqlite_manager import SQLiteManager  # noqa: E402
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cenario.db")
+        a = SQLiteManager(path)
+        a.upsert_demandas([Demanda(id="d1", titulo="original", descricao="", projeto_id="p1")])
+
+        # Janela longa: a thread não grava a fila durante o cenário; o flush explícito faz o papel dela
+        b = WriteBehindManager(SQLiteManager(path), flush_interval=60)
+        lida_por_b = b.load_all()["demandas"][0]
+
+        lida_por_a = a.load_demandas()[0]
+        lida_por_a.titulo = "edição de A"
+        a.upsert_demanda(lida_por_a)
+
+        lida_por_b.titulo = "edição de B"
+        b.upsert_demanda(lida_por_b)
+        antes = b.pull_changes()  # fila pendente: não consulta o journal
+        b.flush()  # o que a thread em segundo plano faria
+        mudancas = b.pull_changes()
+
+        no_banco = SQLiteManager(path).load_demandas()[0].titulo
+        recebida = [d.titulo for d in mudancas["upserts"].get("demandas", [])]
+        print(f"no banco: {no_banco!r}  conflitos em B: {b.conflicts}  recebido no pull: {recebida}")
+        ok = (
+            not antes["upserts"]
+            and no_banco == "edição de A"
+            and len(b.conflicts) == 1
+            and recebida == ["edição de A"]
+        )
+        print("OK" if ok else "FALHOU: a escrita na fila sobrescreveu a edição da outra sessão")
+        return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
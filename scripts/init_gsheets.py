@@ -62,6 +62,7 @@ def init_gsheets():
             print("  - etapas")
             print("  - checklist_topics")
             print("  - checklist_tasks")
+            print("  - _meta (controle de versões)")
             
             # Verificar se consegue ler
             print("\n🔍 Verificando leitura...")
@@ -25,6 +25,39 @@ class ChecklistView:
             st.stop()
         return st.session_state.db_manager
 
+    @staticmethod
+    def _load_data(pm) -> dict:
+        """Tópicos e tarefas (agrupadas por tópico), lidos uma vez e mantidos na sessão entre as alterações."""
+        data = st.session_state.get("checklist_data")
+        if data is None:
+            data = {"topics": pm.load_checklist_topics(), "tasks": pm.load_checklist_tasks_by_topic()}
+            st.session_state.checklist_data = data
+        return data
+
+    @staticmethod
+    def set_data(topics: list, tasks: list):
+        """Guarda na sessão tópicos e tarefas já lidos (ex.: pelo `load_all` da carga inicial)."""
+        grouped = {}
+        for task in tasks:
+            grouped.setdefault(task.get("topic_id"), []).append(task)
+        st.session_state.checklist_data = {"topics": list(topics), "tasks": grouped}
+
+    @staticmethod
+    def invalidate():
+        """Descarta o check-list da sessão: a próxima renderização lê de novo do armazenamento."""
+        st.session_state.pop("checklist_data", None)
+
+    @staticmethod
+    def _cached_task(task_id: str):
+        data = st.session_state.get("checklist_data")
+        if data is None:
+            return None, None
+        for tasks in data["tasks"].values():
+            for task in tasks:
+                if task["id"] == task_id:
+                    return tasks, task
+        return None, None
+
     @staticmethod
     def _add_topic():
         pm = ChecklistView._require_db()
@@ -34,8 +67,12 @@ class ChecklistView:
             return
         result = pm.create_checklist_topic(name)
         if not result:
+            ChecklistView.invalidate()
             st.session_state.checklist_error = "Não foi possível criar o tópico."
             return
+        data = st.session_state.get("checklist_data")
+        if data is not None:
+            data["topics"].append(result)
         st.session_state.checklist_new_topic_name = ""
         st.session_state.checklist_error = ""
 
@@ -61,8 +98,12 @@ class ChecklistView:
             return
         ok = pm.rename_checklist_topic(topic_id, new_name)
         if not ok:
+            ChecklistView.invalidate()
             st.session_state.checklist_error = "Não foi possível renomear o tópico."
             return
+        for topic in (st.session_state.get("checklist_data") or {}).get("topics", []):
+            if str(topic.get("id")) == str(topic_id):
+                topic["nome"] = new_name
         st.session_state.checklist_error = ""
         ChecklistView._cancel_rename_topic()
 
@@ -75,8 +116,12 @@ class ChecklistView:
             return
         result = pm.create_checklist_task(topic_id, text)
         if not result:
+            ChecklistView.invalidate()
             st.session_state.checklist_error = "Não foi possível criar a tarefa."
             return
+        data = st.session_state.get("checklist_data")
+        if data is not None:
+            data["tasks"].setdefault(topic_id, []).append(result)
         st.session_state[input_key] = ""
         st.session_state.checklist_error = ""
 
@@ -84,12 +129,22 @@ class ChecklistView:
     def _toggle_task_done(task_id: str, checkbox_key: str):
         pm = ChecklistView._require_db()
         done = bool(st.session_state.get(checkbox_key))
-        pm.set_checklist_task_done(task_id, done)
+        if not pm.set_checklist_task_done(task_id, done):
+            ChecklistView.invalidate()
+            return
+        _, task = ChecklistView._cached_task(task_id)
+        if task is not None:
+            task["done"] = done
 
     @staticmethod
     def _delete_task(task_id: str):
         pm = ChecklistView._require_db()
-        pm.delete_checklist_task(task_id)
+        if not pm.delete_checklist_task(task_id):
+            ChecklistView.invalidate()
+            return
+        tasks, task = ChecklistView._cached_task(task_id)
+        if task is not None:
+            tasks.remove(task)
 
     @staticmethod
     def render():
@@ -117,7 +172,9 @@ class ChecklistView:
 
         st.markdown("---")
 
-        topics = pm.load_checklist_topics()
+        # Uma leitura de tópicos e uma de tarefas (todas, já agrupadas), guardadas na sessão
+        data = ChecklistView._load_data(pm)
+        topics = data["topics"]
         if not topics:
             st.info("Nenhum tópico cadastrado ainda.")
             return
@@ -163,7 +220,7 @@ class ChecklistView:
                     args=(topic_id, task_input_key),
                 )
 
-            tasks = pm.load_checklist_tasks(topic_id)
+            tasks = data["tasks"].get(topic_id, [])
             if not tasks:
                 st.info("- Nenhuma tarefa neste tópico.")
                 st.markdown("---")
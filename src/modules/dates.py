@@ -0,0 +1,118 @@
+import warnings
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.modules.models import Demanda
+
+
+@lru_cache(maxsize=8192)
+def _parse_date_text(text: str) -> Optional[date]:
+    s = text.strip()
+    if not s or s.lower() in ("nan", "nat", "none"):
+        return None
+    try:
+        # Caminho rápido: "YYYY-MM-DD" ou ISO com hora (o formato que o app grava)
+        return datetime.fromisoformat(s[:10]).date()
+    except ValueError:
+        pass
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ts = pd.to_datetime(s.replace("Z", "+00:00"), errors="coerce")
+    if pd.isna(ts):
+        return None
+    return ts.date()
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Data (sem hora) de um valor vindo da planilha/banco; None se vazio ou inválido.
+
+    Textos passam por um LRU: o mesmo "2025-03-01" é interpretado uma vez por processo.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return _parse_date_text(str(value))
+
+
+def date_ordinals(values: Iterable[Any]) -> np.ndarray:
+    """Converte uma coluna de datas em ordinais (`date.toordinal()`, float; NaN quando vazia/inválida).
+
+    Cada valor distinto é interpretado uma única vez (as datas se repetem muito).
+    """
+    codes, uniques = pd.factorize(pd.Series(list(values), dtype=object), use_na_sentinel=True)
+    parsed = np.array(
+        [(d.toordinal() if d is not None else np.nan) for d in map(parse_date, uniques)] + [np.nan],
+        dtype=float,
+    )
+    # código -1 (None/NaN) aponta para o NaN extra no fim
+    return parsed[codes]
+
+
+def ordinal_to_date(value: float) -> Optional[date]:
+    return date.fromordinal(int(value)) if not np.isnan(value) else None
+
+
+class DemandaDates:
+    """Datas das demandas já interpretadas, em colunas de ordinais (uma linha por demanda).
+
+    Montado uma vez por versão dos dados (o `DemandaIndex` o mantém e repassa cada `upsert`/`remove`),
+    para que Gantt, Curva S e risco nunca voltem a interpretar os textos de data.
+    """
+
+    FIELDS = (
+        "data_inicio_plano",
+        "data_inicio_real",
+        "data_vencimento_plano",
+        "data_vencimento_real",
+        "data_vencimento",
+        "data_criacao",
+        "data_conclusao",
+    )
+
+    def __init__(self, demandas: Iterable[Demanda] = ()):
+        demandas = list(demandas)
+        self._row: dict[str, int] = {d.id: i for i, d in enumerate(demandas)}
+        self._size = len(demandas)
+        self._cols: dict[str, np.ndarray] = {
+            f: date_ordinals(getattr(d, f, None) for d in demandas) for f in self.FIELDS
+        }
+
+    def update(self, demanda: Demanda):
+        row = self._row.get(demanda.id)
+        if row is None:
+            row = self._row[demanda.id] = self._size
+            self._size += 1
+            if self._size > len(self._cols[self.FIELDS[0]]):
+                # Crescimento geométrico: inclusões uma a uma não copiam as colunas a cada vez
+                capacity = max(16, self._size * 2)
+                for f in self.FIELDS:
+                    col = np.full(capacity, np.nan)
+                    col[: len(self._cols[f])] = self._cols[f]
+                    self._cols[f] = col
+        for f in self.FIELDS:
+            d = parse_date(getattr(demanda, f, None))
+            self._cols[f][row] = d.toordinal() if d is not None else np.nan
+
+    def remove(self, demanda_id: str):
+        # A linha fica órfã; só o mapeamento é removido
+        self._row.pop(demanda_id, None)
+
+    def ordinals(self, field: str, demandas: Iterable[Demanda]) -> np.ndarray:
+        """Coluna `field` alinhada com `demandas` (que precisam estar no índice)."""
+        rows = np.fromiter((self._row[d.id] for d in demandas), dtype=np.intp)
+        return self._cols[field][rows]
+
+    def get(self, demanda: Demanda, field: str) -> Optional[date]:
+        row = self._row.get(demanda.id)
+        if row is None:
+            return parse_date(getattr(demanda, field, None))
+        return ordinal_to_date(self._cols[field][row])
@@ -0,0 +1,155 @@
+from datetime import date, datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.modules.dates import DemandaDates, date_ordinals
+from src.modules.models import StatusEnum
+
+
+def _ord_to_iso(value: float) -> str:
+    return date.fromordinal(int(value)).isoformat() if not np.isnan(value) else ""
+
+
+def compute_project_delay_risk(
+    projetos: list, demandas: list, today: Optional[date] = None, dates: Optional[DemandaDates] = None
+) -> pd.DataFrame:
+    """Heurística baseada em Curva S: planejado vs realizado + prazos (projeto e demandas).
+
+    Versão colunar: as datas de todas as demandas são interpretadas uma vez e as métricas por projeto
+    saem de agregações por `projeto_id`, em vez de percorrer projetos × demandas.
+    Com `dates` (as datas já interpretadas do `DemandaIndex`), nenhum texto de data é relido.
+    """
+    today = today or datetime.now().date()
+    t = float(today.toordinal())
+
+    proj_ids = [p.id for p in projetos]
+    proj_pos = {pid: i for i, pid in enumerate(dict.fromkeys(proj_ids))}
+    n_proj = len(proj_pos)
+
+    dem = [d for d in demandas if getattr(d, "projeto_id", None) in proj_pos]
+    if not dem or not n_proj:
+        return pd.DataFrame()
+
+    codes = np.fromiter((proj_pos[d.projeto_id] for d in dem), dtype=np.intp, count=len(dem))
+
+    # ---- Colunas por demanda ----
+    dates = dates if dates is not None else DemandaDates(dem)
+    start = dates.ordinals("data_inicio_plano", dem)
+    venc_plano = dates.ordinals("data_vencimento_plano", dem)
+    venc = dates.ordinals("data_vencimento", dem)
+    end = np.where(np.isnan(venc_plano), venc, venc_plano)
+
+    pct = pd.to_numeric(pd.Series([getattr(d, "percentual_completo", 0) or 0 for d in dem], dtype=object), errors="coerce")
+    actual = np.clip(pct.fillna(0.0).to_numpy(dtype=float) / 100.0, 0.0, 1.0)
+
+    has_start = ~np.isnan(start)
+    has_end = ~np.isnan(end)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total = end - start
+        ratio = np.clip((t - start) / total, 0.0, 1.0)
+    planned = np.select(
+        [
+            ~has_start & ~has_end,
+            ~has_start & has_end,
+            has_start & ~has_end,
+            t <= start,
+            t >= end,
+            total <= 0,
+        ],
+        [
+            np.nan,
+            (t >= end).astype(float),
+            (t > start).astype(float),
+            0.0,
+            1.0,
+            1.0,
+        ],
+        default=ratio,
+    )
+
+    done = np.fromiter((getattr(d, "status", None) == StatusEnum.DONE.value for d in dem), dtype=bool, count=len(dem))
+    is_open = ~done & (actual < 1.0)
+    overdue = is_open & has_end & (end < t)
+
+    # ---- Agregações por projeto (bincount soma na ordem das demandas, como o sum() do Python) ----
+    n_dem = np.bincount(codes, minlength=n_proj)
+    has_planned = ~np.isnan(planned)
+    n_planned = np.bincount(codes, weights=has_planned, minlength=n_proj)
+    planned_sum = np.bincount(codes[has_planned], weights=planned[has_planned], minlength=n_proj)
+    actual_sum = np.bincount(codes, weights=actual, minlength=n_proj)
+    open_count = np.bincount(codes, weights=is_open, minlength=n_proj).astype(int)
+    overdue_open = np.bincount(codes, weights=overdue, minlength=n_proj).astype(int)
+
+    p_start = np.full(n_proj, np.inf)
+    np.fmin.at(p_start, codes, start)
+    p_start[np.isinf(p_start)] = np.nan
+    max_venc = np.full(n_proj, -np.inf)
+    np.fmax.at(max_venc, codes, venc_plano)
+    max_venc[np.isinf(max_venc)] = np.nan
+
+    # Daqui em diante, uma posição por item de `projetos` (um projeto repetido gera linha repetida, como antes)
+    r = np.fromiter((proj_pos[pid] for pid in proj_ids), dtype=np.intp, count=len(proj_ids))
+    n_dem, n_planned, planned_sum, actual_sum = n_dem[r], n_planned[r], planned_sum[r], actual_sum[r]
+    open_count, overdue_open, p_start = open_count[r], overdue_open[r], p_start[r]
+
+    # Prazo do projeto: preferir data_conclusao do projeto; senão usar maior vencimento planejado das demandas
+    conclusao = date_ordinals(getattr(p, "data_conclusao", None) for p in projetos)
+    p_due = np.where(np.isnan(conclusao), max_venc[r], conclusao)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        planned_pct = np.where(n_planned > 0, planned_sum / n_planned, np.nan)
+        actual_pct = np.where(n_dem > 0, actual_sum / n_dem, 0.0)
+    slip = np.where(np.isnan(planned_pct), 0.0, planned_pct - actual_pct)
+
+    # Projeção de término por velocidade (baseado em % realizado)
+    elapsed = np.maximum(1.0, t - p_start)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        velocity = actual_pct / elapsed
+        remaining = np.maximum(0.0, 1.0 - actual_pct)
+        steps = np.round(remaining / velocity)
+    projected = np.where(~np.isnan(p_start) & (velocity > 0.0), t + steps, np.nan)
+    # Projeções além do calendário (velocidade quase nula) ficam sem data
+    projected[projected > date.max.toordinal()] = np.nan
+    delay = np.where(~np.isnan(projected) & ~np.isnan(p_due), np.maximum(0.0, projected - p_due), np.nan)
+
+    overdue_ratio = np.where(n_dem > 0, overdue_open / np.maximum(n_dem, 1), 0.0)
+    days_to_due = p_due - t
+    deadline_pressure = np.select([days_to_due <= 7, days_to_due <= 14], [0.15, 0.08], default=0.0)
+
+    score = np.maximum(0.0, slip) * 0.7 + overdue_ratio * 0.3 + deadline_pressure
+    late = ~np.isnan(delay) & (delay >= 1)
+    risk_level = np.select([(score >= 0.35) | late, score >= 0.18], ["Alto", "Médio"], default="Baixo")
+    tendencia = np.where(late | (risk_level == "Alto"), "Atraso provável", "No prazo")
+
+    # ---- Uma linha por projeto (na ordem de `projetos`) que tenha demandas ----
+    rows = []
+    for i, p in enumerate(projetos):
+        if not n_dem[i]:
+            continue
+        has_plan = not np.isnan(planned_pct[i])
+        rows.append(
+            {
+                "projeto": getattr(p, "nome", p.id),
+                "prazo_projeto": _ord_to_iso(p_due[i]),
+                "pct_planejado_hoje": f"{int(round(planned_pct[i] * 100))}%" if has_plan else "",
+                "pct_real_hoje": f"{int(round(actual_pct[i] * 100))}%",
+                "gap_planejado_vs_real": f"{int(round(max(0.0, slip[i]) * 100))}%" if has_plan else "",
+                "demandas_abertas": int(open_count[i]),
+                "demandas_vencidas": int(overdue_open[i]),
+                "data_prevista_fim": _ord_to_iso(projected[i]),
+                "dias_previstos_atraso": int(delay[i]) if not np.isnan(delay[i]) else None,
+                "risco": str(risk_level[i]),
+                "tendência": str(tendencia[i]),
+                "_risk_score": float(score[i]),
+            }
+        )
+
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        # Garantir compatibilidade com Arrow (st.dataframe) evitando mistura str/int
+        df["dias_previstos_atraso"] = pd.to_numeric(df["dias_previstos_atraso"], errors="coerce").astype("Int64")
+        df = df.sort_values(["tendência", "_risk_score", "dias_previstos_atraso", "demandas_vencidas"], ascending=[True, False, False, False])
+        df = df.drop(columns=["_risk_score"], errors="ignore")
+    return df
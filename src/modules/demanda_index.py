@@ -0,0 +1,150 @@
+import itertools
+from typing import Any, Iterable, Optional
+
+from src.modules.dates import DemandaDates
+from src.modules.models import Demanda
+
+
+class DemandaIndex:
+    """Índice em memória das demandas da sessão, para consultas por grupo em O(1).
+
+    Agrupa as demandas por `projeto_id`, `etapa_id`, `status`, `responsavel` e `prioridade`, mantendo
+    dentro de cada grupo a mesma ordem da lista original (as views exibem nessa ordem). É montado uma vez
+    por carga de dados e atualizado incrementalmente (`upsert`/`remove`) quando o app altera uma demanda,
+    em vez de cada view varrer a lista inteira a cada filtro.
+
+    `version` muda a cada alteração e é única no processo (um índice remontado nunca repete a versão de
+    outro): caches derivados (datas, figuras) podem usá-la como chave.
+    """
+
+    KEYS = ("projeto_id", "etapa_id", "status", "responsavel", "prioridade")
+    _VERSIONS = itertools.count(1)
+
+    def __init__(self, demandas: Optional[Iterable[Demanda]] = None):
+        # Lista da sessão à qual o índice corresponde (o app remonta o índice se a lista for trocada)
+        self.source = demandas
+        self.version = next(DemandaIndex._VERSIONS)
+        self._by_id: dict[str, Demanda] = {}
+        # id -> posição de chegada (a ordem da lista); edições mantêm a posição
+        self._seq: dict[str, int] = {}
+        self._next_seq = 0
+        # id -> valores das chaves no momento da indexação (para reagrupar quem foi alterado no lugar)
+        self._keys: dict[str, tuple] = {}
+        # chave -> valor -> {id: demanda}
+        self._groups: dict[str, dict[Any, dict[str, Demanda]]] = {k: {} for k in self.KEYS}
+        # grupos que receberam uma demanda fora de ordem e precisam ser reordenados na leitura
+        self._unsorted: set[tuple[str, Any]] = set()
+        # Datas já interpretadas, montadas na primeira consulta
+        self._dates: Optional[DemandaDates] = None
+        for d in demandas or []:
+            self._add(d)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, demanda_id: str) -> bool:
+        return demanda_id in self._by_id
+
+    # ------------------------- Manutenção -------------------------
+
+    @classmethod
+    def _key_values(cls, d: Demanda) -> tuple:
+        return tuple(getattr(d, k, None) for k in cls.KEYS)
+
+    def _add(self, d: Demanda):
+        seq = self._seq.get(d.id)
+        if seq is None:
+            seq = self._seq[d.id] = self._next_seq
+            self._next_seq += 1
+        values = self._key_values(d)
+        # Atribuir a um id existente mantém a posição no dict (ordem da lista)
+        self._by_id[d.id] = d
+        self._keys[d.id] = values
+        for key, value in zip(self.KEYS, values):
+            group = self._groups[key].setdefault(value, {})
+            if group and self._seq[next(reversed(group))] > seq:
+                self._unsorted.add((key, value))
+            group[d.id] = d
+
+    def _ungroup(self, demanda_id: str):
+        values = self._keys.pop(demanda_id, None)
+        if values is None:
+            return
+        for key, value in zip(self.KEYS, values):
+            group = self._groups[key].get(value)
+            if group is None:
+                continue
+            group.pop(demanda_id, None)
+            if not group:
+                del self._groups[key][value]
+                self._unsorted.discard((key, value))
+
+    def upsert(self, demanda: Demanda):
+        """Inclui ou atualiza uma demanda (também quando o mesmo objeto foi alterado no lugar)."""
+        old = self._keys.get(demanda.id)
+        if old is not None and old == self._key_values(demanda):
+            # Mesmos grupos: só troca o objeto, mantendo a posição
+            self._by_id[demanda.id] = demanda
+            for key, value in zip(self.KEYS, old):
+                self._groups[key][value][demanda.id] = demanda
+        else:
+            self._ungroup(demanda.id)
+            self._add(demanda)
+        if self._dates is not None:
+            self._dates.update(demanda)
+        self.version = next(DemandaIndex._VERSIONS)
+
+    def remove(self, demanda_id: str):
+        self._ungroup(demanda_id)
+        self._by_id.pop(demanda_id, None)
+        self._seq.pop(demanda_id, None)
+        if self._dates is not None:
+            self._dates.remove(demanda_id)
+        self.version = next(DemandaIndex._VERSIONS)
+
+    # ------------------------- Consultas -------------------------
+
+    @property
+    def dates(self) -> DemandaDates:
+        """Datas das demandas indexadas, interpretadas uma vez e mantidas a cada `upsert`/`remove`."""
+        if self._dates is None:
+            self._dates = DemandaDates(self._by_id.values())
+        return self._dates
+
+    def get(self, demanda_id: str) -> Optional[Demanda]:
+        return self._by_id.get(demanda_id)
+
+    def _group(self, key: str, value: Any) -> dict[str, Demanda]:
+        group = self._groups[key].get(value)
+        if group is None:
+            return {}
+        if (key, value) in self._unsorted:
+            ordered = sorted(group.items(), key=lambda item: self._seq[item[0]])
+            group.clear()
+            group.update(ordered)
+            self._unsorted.discard((key, value))
+        return group
+
+    def by(self, key: str, value: Any) -> list[Demanda]:
+        """Demandas com `key == value`, na ordem da lista da sessão."""
+        return list(self._group(key, value).values())
+
+    def filter(self, **criteria: Any) -> list[Demanda]:
+        """Demandas que atendem a todos os critérios (chave=valor; valores None são ignorados)."""
+        criteria = {k: v for k, v in criteria.items() if v is not None}
+        if not criteria:
+            return self.all()
+        # Parte do menor grupo e confere os demais critérios só nele
+        groups = sorted((self._group(k, v) for k, v in criteria.items()), key=len)
+        base, others = groups[0], groups[1:]
+        return [d for demanda_id, d in base.items() if all(demanda_id in g for g in others)]
+
+    def all(self) -> list[Demanda]:
+        return list(self._by_id.values())
+
+    def values(self, key: str) -> list[Any]:
+        """Valores distintos de `key` que têm ao menos uma demanda."""
+        return list(self._groups[key].keys())
+
+    def counts(self, key: str) -> dict[Any, int]:
+        return {value: len(group) for value, group in self._groups[key].items()}
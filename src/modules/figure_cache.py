@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class FigureCache:
+    """Cache LRU de figuras plotly já montadas (uma instância por sessão do Streamlit).
+
+    A chave descreve tudo de que a figura depende (versão dos dados, nível/seleção do drilldown, data de
+    hoje); enquanto ela não muda, um rerun reaproveita a figura em vez de reagrupar as demandas e remontar
+    o gráfico. Guarda no máximo `max_entries` figuras, descartando a usada há mais tempo.
+    As figuras devolvidas são compartilhadas: quem lê não deve alterá-las.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        fig = self._entries.get(key)
+        if fig is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fig
+
+    def put(self, key: Hashable, fig: Any):
+        self._entries[key] = fig
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """Figura da chave; monta com `build()` se não estiver no cache (None não é guardado)."""
+        fig = self.get(key)
+        if fig is None:
+            fig = build()
+            if fig is not None:
+                self.put(key, fig)
+        return fig
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
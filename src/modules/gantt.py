@@ -1,8 +1,12 @@
 import streamlit as st
 import plotly.graph_objects as go
-from typing import List, Dict
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from datetime import date, datetime, timedelta
 from src.modules.models import Demanda, Projeto, Etapa
+from src.modules.dates import DemandaDates, parse_date
+from src.modules.demanda_index import DemandaIndex
+from src.modules.figure_cache import FigureCache
+import numpy as np
 import pandas as pd
 
 
@@ -12,28 +16,27 @@ class GanttChart:
     @staticmethod
     def _parse_date(date_str):
         """Parse date string para datetime object (apenas data, sem hora)"""
-        today = datetime.now().date()
-
-        # Trata None / NaN / NaT e outros valores problemáticos que podem vir do Postgres/pandas
-        if date_str is None:
-            return today
-        try:
-            if pd.isna(date_str):
-                return today
-        except Exception:
-            pass
-
-        try:
-            # Strings ISO (ou outras) -> Timestamp -> date
-            if isinstance(date_str, str):
-                date_str = date_str.replace('Z', '+00:00')
-
-            ts = pd.to_datetime(date_str, errors="coerce")
-            if pd.isna(ts):
-                return today
-            return ts.date()
-        except Exception:
-            return today
+        # Vazio / inválido -> hoje
+        return parse_date(date_str) or datetime.now().date()
+
+    @staticmethod
+    def _intervalos(demandas: List[Demanda], index: Optional[DemandaIndex] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Início e fim (ordinais) de cada demanda, a partir das datas já interpretadas pelo índice.
+
+        Início: `data_inicio_plano`, senão `data_criacao`; fim: `data_vencimento_plano`, senão `data_vencimento`;
+        sem data válida -> hoje.
+        """
+        dates = index.dates if index is not None else DemandaDates(demandas)
+        hoje = float(datetime.now().date().toordinal())
+        ini = dates.ordinals("data_inicio_plano", demandas)
+        ini = np.where(np.isnan(ini), dates.ordinals("data_criacao", demandas), ini)
+        fim = dates.ordinals("data_vencimento_plano", demandas)
+        fim = np.where(np.isnan(fim), dates.ordinals("data_vencimento", demandas), fim)
+        return np.nan_to_num(ini, nan=hoje), np.nan_to_num(fim, nan=hoje)
+
+    @staticmethod
+    def _to_date(ordinal: float) -> date:
+        return date.fromordinal(int(ordinal))
 
     @staticmethod
     def _etapas_por_ordem(etapas: List[Etapa]) -> List[Etapa]:
@@ -47,35 +50,28 @@ class GanttChart:
         return sorted(etapas or [], key=_key)
 
     @staticmethod
-    def _sort_demandas_por_datas(demandas: List[Demanda]) -> List[Demanda]:
-        def _key(d: Demanda):
-            ini = GanttChart._parse_date(getattr(d, "data_inicio_plano", None) or getattr(d, "data_criacao", None))
-            fim = GanttChart._parse_date(getattr(d, "data_vencimento_plano", None) or getattr(d, "data_vencimento", None))
-            return (ini, fim, (getattr(d, "titulo", "") or "").lower())
-
-        return sorted(demandas or [], key=_key)
-        
-        try:
-            if isinstance(date_str, str):
-                # Remover 'Z' e timezone info
-                date_str = date_str.replace('Z', '+00:00').split('+')[0]
-                return datetime.fromisoformat(date_str).date()
-            else:
-                return date_str
-        except:
-            return datetime.now().date()
+    def _sort_demandas_por_datas(demandas: List[Demanda], index: Optional[DemandaIndex] = None) -> List[Demanda]:
+        demandas = list(demandas or [])
+        ini, fim = GanttChart._intervalos(demandas, index)
+        titulos = [(getattr(d, "titulo", "") or "").lower() for d in demandas]
+        ordem = sorted(range(len(demandas)), key=lambda i: (ini[i], fim[i], titulos[i]))
+        return [demandas[i] for i in ordem]
     
     @staticmethod
     def render_gantt_com_drilldown(
         demandas: List[Demanda],
         projetos: List[Projeto],
-        etapas: List[Etapa]
+        etapas: List[Etapa],
+        index: Optional[DemandaIndex] = None
     ):
         """Renderiza Gantt com drilldown: Projetos → Etapas → Demandas"""
         
         if not demandas:
             st.info("📊 Nenhuma demanda para exibir no Gantt")
             return
+
+        # Consultas por projeto/etapa via índice (montado uma vez aqui se não vier do app)
+        index = index if index is not None else DemandaIndex(demandas)
         
         # Inicializar session state para drilldown
         if 'gantt_level' not in st.session_state:
@@ -95,7 +91,7 @@ class GanttChart:
         
         with col2:
             if st.session_state.gantt_level in ['etapas', 'demandas']:
-                projeto_names = sorted(list(set([p.nome for p in projetos if any(d.projeto_id == p.id for d in demandas)])))
+                projeto_names = sorted(set(p.nome for p in projetos if index.by("projeto_id", p.id)))
                 projeto_options = ["🔄 Selecionar Tudo"] + projeto_names
                 selected_proj_option = st.selectbox(
                     "🏗️ Projeto",
@@ -111,10 +107,8 @@ class GanttChart:
             if st.session_state.gantt_level == 'demandas' and st.session_state.selected_projeto:
                 # Filtrar etapas do projeto selecionado
                 proj_id = next((p.id for p in projetos if p.nome == st.session_state.selected_projeto), None)
-                etapas_objs = [
-                    e for e in (etapas or [])
-                    if any(d.etapa_id == e.id and d.projeto_id == proj_id for d in demandas)
-                ]
+                etapas_do_projeto = set(d.etapa_id for d in index.by("projeto_id", proj_id))
+                etapas_objs = [e for e in (etapas or []) if e.id in etapas_do_projeto]
                 etapas_do_proj = [e.nome for e in GanttChart._etapas_por_ordem(etapas_objs)]
                 etapas_options = ["🔄 Selecionar Tudo"] + etapas_do_proj
                 selected_etapa_option = st.selectbox(
@@ -139,66 +133,72 @@ class GanttChart:
         
         # Renderizar baseado no nível
         if st.session_state.gantt_level == 'projetos':
-            GanttChart._render_nivel_projetos(demandas, projetos, etapas)
+            GanttChart._render_nivel_projetos(demandas, projetos, etapas, index)
         elif st.session_state.gantt_level == 'etapas':
             if st.session_state.selected_projeto:
-                GanttChart._render_nivel_etapas(demandas, projetos, etapas, st.session_state.selected_projeto)
+                GanttChart._render_nivel_etapas(demandas, projetos, etapas, st.session_state.selected_projeto, index)
             else:
-                GanttChart._render_nivel_projetos(demandas, projetos, etapas)
+                GanttChart._render_nivel_projetos(demandas, projetos, etapas, index)
         elif st.session_state.gantt_level == 'demandas':
             if st.session_state.selected_projeto:
                 if st.session_state.selected_etapa:
-                    GanttChart._render_nivel_demandas(demandas, projetos, etapas, st.session_state.selected_projeto, st.session_state.selected_etapa)
+                    GanttChart._render_nivel_demandas(demandas, projetos, etapas, st.session_state.selected_projeto, st.session_state.selected_etapa, index)
                 else:
-                    GanttChart._render_todas_demandas_projeto(demandas, projetos, etapas, st.session_state.selected_projeto)
+                    GanttChart._render_todas_demandas_projeto(demandas, projetos, etapas, st.session_state.selected_projeto, index)
             else:
-                GanttChart._render_nivel_projetos(demandas, projetos, etapas)
+                GanttChart._render_nivel_projetos(demandas, projetos, etapas, index)
     
     @staticmethod
-    def _render_nivel_projetos(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa]):
+    def _render_nivel_projetos(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa], index: Optional[DemandaIndex] = None):
         """Renderiza visualização por Projetos"""
         st.subheader("📊 Gantt - Visão por Projetos")
+        index = index if index is not None else DemandaIndex(demandas)
+        chave = GanttChart._chave_figura("projetos", index, projetos, etapas)
+        GanttChart._exibir_gantt(chave, lambda: GanttChart._tarefas_nivel_projetos(projetos, index), "Projetos", detalhado=False)
+
+    @staticmethod
+    def _tarefas_nivel_projetos(projetos: List[Projeto], index: DemandaIndex):
+        # Agrupar por projeto (somente demandas com datas)
+        demandas_por_projeto = {}
+        for proj_id in index.values("projeto_id"):
+            com_datas = [d for d in index.by("projeto_id", proj_id) if d.data_vencimento_plano]
+            if com_datas:
+                demandas_por_projeto[proj_id] = com_datas
         
-        # Filtrar demandas com datas
-        demandas_com_datas = [d for d in demandas if d.data_vencimento_plano]
-        
-        if not demandas_com_datas:
-            st.error("⚠️ Nenhuma demanda com data preenchida")
-            return
+        if not demandas_por_projeto:
+            return "⚠️ Nenhuma demanda com data preenchida"
         
-        # Agrupar por projeto
         projetos_map = {p.id: p.nome for p in projetos}
         tarefas = []
         
         # Calcular datas por projeto
-        for proj_id in sorted(set(d.projeto_id for d in demandas_com_datas)):
-            demandas_proj = [d for d in demandas_com_datas if d.projeto_id == proj_id]
+        for proj_id in sorted(demandas_por_projeto):
+            demandas_proj = demandas_por_projeto[proj_id]
             
             proj_nome = projetos_map.get(proj_id, "Sem Projeto")
             
             # Data mín/máx do projeto
-            datas_inicio = [GanttChart._parse_date(d.data_inicio_plano or d.data_criacao) for d in demandas_proj]
-            datas_fim = [GanttChart._parse_date(d.data_vencimento_plano) for d in demandas_proj]
+            datas_inicio, datas_fim = GanttChart._intervalos(demandas_proj, index)
             
-            if datas_inicio and datas_fim:
-                data_ini = min(datas_inicio)
-                data_fim = max(datas_fim)
+            if len(datas_inicio) and len(datas_fim):
+                data_ini = GanttChart._to_date(datas_inicio.min())
+                data_fim = GanttChart._to_date(datas_fim.max())
                 num_demandas = len(demandas_proj)
                 progresso = sum([d.percentual_completo or 0 for d in demandas_proj]) / len(demandas_proj) if demandas_proj else 0
                 
                 tarefas.append({
                     "Task": f"🏗️ {proj_nome}",
-                    "Start": data_ini.isoformat(),
-                    "End": data_fim.isoformat(),
+                    "Start": data_ini,
+                    "End": data_fim,
                     "Demandas": num_demandas,
                     "Progresso": f"{progresso:.0f}%",
                     "Cor": "#667eea"
                 })
         
-        GanttChart._criar_gantt_simples(tarefas, "Projetos")
+        return tarefas
     
     @staticmethod
-    def _render_nivel_etapas(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa], projeto_nome: str):
+    def _render_nivel_etapas(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa], projeto_nome: str, index: Optional[DemandaIndex] = None):
         """Renderiza visualização por Etapas de um projeto"""
         st.subheader(f"📋 Gantt - Etapas de {projeto_nome}")
         
@@ -208,47 +208,52 @@ class GanttChart:
             st.error("Projeto não encontrado")
             return
         
-        # Filtrar demandas do projeto com datas
-        demandas_proj = [d for d in demandas if d.projeto_id == proj_id and d.data_vencimento_plano]
+        index = index if index is not None else DemandaIndex(demandas)
+        chave = GanttChart._chave_figura("etapas", index, projetos, etapas, proj_id)
+        GanttChart._exibir_gantt(chave, lambda: GanttChart._tarefas_nivel_etapas(etapas, proj_id, index), "Etapas", detalhado=False)
+
+    @staticmethod
+    def _tarefas_nivel_etapas(etapas: List[Etapa], proj_id: str, index: DemandaIndex):
+        # Filtrar demandas do projeto com datas, agrupadas por etapa
+        demandas_por_etapa = {}
+        for d in index.by("projeto_id", proj_id):
+            if d.data_vencimento_plano:
+                demandas_por_etapa.setdefault(d.etapa_id, []).append(d)
         
-        if not demandas_proj:
-            st.error("⚠️ Nenhuma demanda neste projeto")
-            return
+        if not demandas_por_etapa:
+            return "⚠️ Nenhuma demanda neste projeto"
         
-        # Agrupar por etapa
-        etapas_map = {e.id: e.nome for e in etapas}
         tarefas = []
         
         etapas_map = {e.id: e.nome for e in etapas}
         etapas_ordem_map = {e.id: (int(getattr(e, "ordem", 0) or 0), (getattr(e, "nome", "") or "").lower()) for e in (etapas or [])}
 
-        for etapa_id in sorted(set(d.etapa_id for d in demandas_proj if d.etapa_id), key=lambda eid: etapas_ordem_map.get(eid, (9999, etapas_map.get(eid, "")))):
-            demandas_etapa = [d for d in demandas_proj if d.etapa_id == etapa_id]
+        for etapa_id in sorted((eid for eid in demandas_por_etapa if eid), key=lambda eid: etapas_ordem_map.get(eid, (9999, etapas_map.get(eid, "")))):
+            demandas_etapa = demandas_por_etapa[etapa_id]
             
             etapa_nome = etapas_map.get(etapa_id, "Sem Etapa")
             
-            datas_inicio = [GanttChart._parse_date(d.data_inicio_plano or d.data_criacao) for d in demandas_etapa]
-            datas_fim = [GanttChart._parse_date(d.data_vencimento_plano) for d in demandas_etapa]
+            datas_inicio, datas_fim = GanttChart._intervalos(demandas_etapa, index)
             
-            if datas_inicio and datas_fim:
-                data_ini = min(datas_inicio)
-                data_fim = max(datas_fim)
+            if len(datas_inicio) and len(datas_fim):
+                data_ini = GanttChart._to_date(datas_inicio.min())
+                data_fim = GanttChart._to_date(datas_fim.max())
                 num_demandas = len(demandas_etapa)
                 progresso = sum([d.percentual_completo or 0 for d in demandas_etapa]) / len(demandas_etapa) if demandas_etapa else 0
                 
                 tarefas.append({
                     "Task": f"  ├─ {etapa_nome}",
-                    "Start": data_ini.isoformat(),
-                    "End": data_fim.isoformat(),
+                    "Start": data_ini,
+                    "End": data_fim,
                     "Demandas": num_demandas,
                     "Progresso": f"{progresso:.0f}%",
                     "Cor": "#764ba2"
                 })
         
-        GanttChart._criar_gantt_simples(tarefas, "Etapas")
+        return tarefas
     
     @staticmethod
-    def _render_nivel_demandas(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa], projeto_nome: str, etapa_nome: str):
+    def _render_nivel_demandas(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa], projeto_nome: str, etapa_nome: str, index: Optional[DemandaIndex] = None):
         """Renderiza visualização por Demandas"""
         st.subheader(f"✅ Gantt - Demandas: {etapa_nome} ({projeto_nome})")
         
@@ -260,22 +265,26 @@ class GanttChart:
             st.error("Projeto ou Etapa não encontrado")
             return
         
+        index = index if index is not None else DemandaIndex(demandas)
+        chave = GanttChart._chave_figura("demandas", index, projetos, etapas, proj_id, etapa_id)
+        GanttChart._exibir_gantt(chave, lambda: GanttChart._tarefas_nivel_demandas(proj_id, etapa_id, index), "Demandas", detalhado=True)
+
+    @staticmethod
+    def _tarefas_nivel_demandas(proj_id: str, etapa_id: str, index: DemandaIndex):
         # Filtrar demandas
-        demandas_filtradas = [
-            d for d in demandas 
-            if d.projeto_id == proj_id and d.etapa_id == etapa_id and d.data_vencimento_plano
-        ]
+        demandas_filtradas = [d for d in index.filter(projeto_id=proj_id, etapa_id=etapa_id) if d.data_vencimento_plano]
         
         if not demandas_filtradas:
-            st.error("⚠️ Nenhuma demanda nesta etapa")
-            return
+            return "⚠️ Nenhuma demanda nesta etapa"
         
         # Preparar tarefas
         tarefas = []
         
-        for demanda in GanttChart._sort_demandas_por_datas(demandas_filtradas):
-            data_ini = GanttChart._parse_date(demanda.data_inicio_plano or demanda.data_criacao)
-            data_fim = GanttChart._parse_date(demanda.data_vencimento_plano)
+        ordenadas = GanttChart._sort_demandas_por_datas(demandas_filtradas, index)
+        datas_inicio, datas_fim = GanttChart._intervalos(ordenadas, index)
+        for demanda, ini, fim in zip(ordenadas, datas_inicio, datas_fim):
+            data_ini = GanttChart._to_date(ini)
+            data_fim = GanttChart._to_date(fim)
             
             cores_status = {
                 "A Fazer": "#FF6B6B",
@@ -286,18 +295,18 @@ class GanttChart:
             
             tarefas.append({
                 "Task": f"    ├─ {demanda.titulo}",
-                "Start": data_ini.isoformat(),
-                "End": data_fim.isoformat(),
+                "Start": data_ini,
+                "End": data_fim,
                 "Status": demanda.status,
                 "Responsavel": demanda.responsavel or "Não atribuído",
                 "Progresso": f"{demanda.percentual_completo or 0}%",
                 "Cor": cores_status.get(demanda.status, "#999")
             })
         
-        GanttChart._criar_gantt_detalhado(tarefas, "Demandas")
+        return tarefas
     
     @staticmethod
-    def _render_todas_demandas_projeto(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa], projeto_nome: str):
+    def _render_todas_demandas_projeto(demandas: List[Demanda], projetos: List[Projeto], etapas: List[Etapa], projeto_nome: str, index: Optional[DemandaIndex] = None):
         """Renderiza visualização de TODAS as demandas do projeto"""
         st.subheader(f"✅ Gantt - Todas as Demandas de {projeto_nome}")
         
@@ -307,15 +316,17 @@ class GanttChart:
             st.error("Projeto não encontrado")
             return
         
+        index = index if index is not None else DemandaIndex(demandas)
+        chave = GanttChart._chave_figura("todas_demandas", index, projetos, etapas, proj_id)
+        GanttChart._exibir_gantt(chave, lambda: GanttChart._tarefas_todas_demandas_projeto(etapas, proj_id, index), "Demandas", detalhado=True)
+
+    @staticmethod
+    def _tarefas_todas_demandas_projeto(etapas: List[Etapa], proj_id: str, index: DemandaIndex):
         # Filtrar demandas do projeto
-        demandas_filtradas = [
-            d for d in demandas 
-            if d.projeto_id == proj_id and d.data_vencimento_plano
-        ]
+        demandas_filtradas = [d for d in index.by("projeto_id", proj_id) if d.data_vencimento_plano]
         
         if not demandas_filtradas:
-            st.error("⚠️ Nenhuma demanda neste projeto")
-            return
+            return "⚠️ Nenhuma demanda neste projeto"
         
         # Preparar tarefas agrupadas por etapa
         tarefas = []
@@ -323,15 +334,22 @@ class GanttChart:
         etapas_ordem_map = {e.id: (int(getattr(e, "ordem", 0) or 0), (getattr(e, "nome", "") or "").lower()) for e in (etapas or [])}
         
         # Agrupar por etapa
-        for etapa_id in sorted(set(d.etapa_id for d in demandas_filtradas if d.etapa_id), key=lambda eid: etapas_ordem_map.get(eid, (9999, etapas_map.get(eid, "")))):
+        demandas_por_etapa = {}
+        for d in demandas_filtradas:
+            if d.etapa_id:
+                demandas_por_etapa.setdefault(d.etapa_id, []).append(d)
+
+        for etapa_id in sorted(demandas_por_etapa, key=lambda eid: etapas_ordem_map.get(eid, (9999, etapas_map.get(eid, "")))):
             etapa_nome = etapas_map.get(etapa_id, "Sem Etapa")
             
             # Adicionar header de etapa
-            demandas_etapa = [d for d in demandas_filtradas if d.etapa_id == etapa_id]
+            demandas_etapa = demandas_por_etapa[etapa_id]
 
-            for demanda in GanttChart._sort_demandas_por_datas(demandas_etapa):
-                data_ini = GanttChart._parse_date(demanda.data_inicio_plano or demanda.data_criacao)
-                data_fim = GanttChart._parse_date(demanda.data_vencimento_plano)
+            ordenadas = GanttChart._sort_demandas_por_datas(demandas_etapa, index)
+            datas_inicio, datas_fim = GanttChart._intervalos(ordenadas, index)
+            for demanda, ini, fim in zip(ordenadas, datas_inicio, datas_fim):
+                data_ini = GanttChart._to_date(ini)
+                data_fim = GanttChart._to_date(fim)
                 
                 cores_status = {
                     "A Fazer": "#FF6B6B",
@@ -342,209 +360,122 @@ class GanttChart:
                 
                 tarefas.append({
                     "Task": f"  ├─ {etapa_nome} → {demanda.titulo}",
-                    "Start": data_ini.isoformat(),
-                    "End": data_fim.isoformat(),
+                    "Start": data_ini,
+                    "End": data_fim,
                     "Status": demanda.status,
                     "Responsavel": demanda.responsavel or "Não atribuído",
                     "Progresso": f"{demanda.percentual_completo or 0}%",
                     "Cor": cores_status.get(demanda.status, "#999")
                 })
         
-        GanttChart._criar_gantt_detalhado(tarefas, "Demandas")
+        return tarefas
     
     @staticmethod
-    def _criar_gantt_simples(tarefas: List[Dict], nivel: str):
-        """Cria gráfico Gantt simples com barras agregadas"""
-        if not tarefas:
-            st.warning("Nenhuma tarefa para exibir")
-            return
-        
-        # Extrair datas
-        todas_datas = []
-        for tarefa in tarefas:
-            todas_datas.append(pd.to_datetime(tarefa["Start"]).date())
-            todas_datas.append(pd.to_datetime(tarefa["End"]).date())
-        
-        data_min = min(todas_datas)
-        data_max = max(todas_datas)
-        
-        # Criar figura
-        fig = go.Figure()
-        
-        # Adicionar barras
-        for tarefa in tarefas:
-            start = pd.to_datetime(tarefa["Start"]).date()
-            end = pd.to_datetime(tarefa["End"]).date()
-            duracao = (end - start).days + 1
-            
-            fig.add_trace(go.Scatter(
-                x=[start, end],
-                y=[tarefa["Task"], tarefa["Task"]],
-                mode='lines',
-                line=dict(color=tarefa["Cor"], width=25),
-                name=tarefa["Task"],
-                hovertext=f"""
-                <b>{tarefa['Task'].strip()}</b><br>
-                <b>Demandas:</b> {tarefa['Demandas']}<br>
-                <b>Progresso:</b> {tarefa['Progresso']}<br>
-                <b>Período:</b> {start.strftime('%d/%m/%Y')} → {end.strftime('%d/%m/%Y')}<br>
-                <b>Duração:</b> {duracao} dias
-                """,
-                hoverinfo='text',
-                showlegend=False
-            ))
-            
-            # Adicionar texto no meio
-            meio_data = start + (end - start) / 2
-            fig.add_annotation(
-                x=meio_data,
-                y=tarefa["Task"],
-                text=f"{tarefa['Progresso']}",
-                showarrow=False,
-                font=dict(color='white', size=10, weight='bold'),
-                bgcolor=tarefa["Cor"],
-                bordercolor=tarefa["Cor"],
-                borderwidth=0
+    def figure_cache() -> FigureCache:
+        """Cache de figuras da sessão (Gantt e Curva S)."""
+        if "figure_cache" not in st.session_state:
+            st.session_state.figure_cache = FigureCache()
+        return st.session_state.figure_cache
+
+    @staticmethod
+    def _chave_figura(tipo: str, index: DemandaIndex, projetos: List[Projeto], etapas: List[Etapa], *selecao) -> tuple:
+        """Chave do cache: versão das demandas, nomes/ordem de projetos e etapas, seleção do drilldown e hoje."""
+        cadastro = hash(
+            (
+                tuple((p.id, p.nome) for p in projetos or []),
+                tuple((e.id, e.nome, getattr(e, "ordem", 0)) for e in etapas or []),
             )
-        
-        # Configurar layout
-        task_labels = [t["Task"] for t in tarefas]
-        
-        fig.update_layout(
-            title=dict(
-                text=f"<b>📊 Gantt - {nivel}</b>",
-                x=0.5,
-                xanchor='center',
-                font=dict(size=14)
-            ),
-            height=max(500, len(tarefas) * 60),
-            xaxis_type='date',
-            xaxis_title='Timeline',
-            yaxis_title='',
-            yaxis=dict(
-                ticktext=task_labels,
-                tickvals=task_labels,
-                automargin=True,
-                tickfont=dict(size=10)
-            ),
-            plot_bgcolor='#f8f9fa',
-            paper_bgcolor='white',
-            font=dict(size=11),
-            margin=dict(l=250, r=50, t=100, b=50),
-            hovermode='closest',
-            showlegend=False
-        )
-        
-        # Adicionar gridlines semanais
-        current_date = data_min
-        weekly_dates = []
-        while current_date <= data_max:
-            weekly_dates.append(current_date.isoformat())
-            current_date += timedelta(days=7)
-        
-        fig.update_xaxes(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='lightgray',
-            range=[data_min.isoformat(), data_max.isoformat()],
-            tickvals=weekly_dates,
-            tickformat='%d/%m'
         )
-        
-        # Linha de hoje
-        hoje = datetime.now().date()
-        if data_min <= hoje <= data_max:
-            fig.add_shape(
-                type="line",
-                x0=hoje.isoformat(),
-                y0=0,
-                x1=hoje.isoformat(),
-                y1=1,
-                xref="x",
-                yref="paper",
-                line=dict(color="red", width=2, dash="dash")
-            )
-            fig.add_annotation(
-                x=hoje.isoformat(),
-                y=1,
-                yref="paper",
-                text="<b>Hoje</b>",
-                showarrow=False,
-                font=dict(color="red", size=10),
-                yanchor="bottom"
-            )
-        
-        fig.update_yaxes(showgrid=False)
-        
-        st.plotly_chart(fig, width="stretch", key=f"gantt_{nivel.lower()}")
-    
+        return (tipo, index.version, cadastro, *selecao, datetime.now().date())
+
     @staticmethod
-    def _criar_gantt_detalhado(tarefas: List[Dict], nivel: str):
-        """Cria gráfico Gantt detalhado com demandas individuais"""
-        if not tarefas:
-            st.warning("Nenhuma tarefa para exibir")
-            return
-        
-        # Extrair datas
-        todas_datas = []
-        for tarefa in tarefas:
-            todas_datas.append(pd.to_datetime(tarefa["Start"]).date())
-            todas_datas.append(pd.to_datetime(tarefa["End"]).date())
-        
-        data_min = min(todas_datas)
-        data_max = max(todas_datas)
-        
-        # Criar figura
-        fig = go.Figure()
-        
-        # Adicionar barras
-        for tarefa in tarefas:
-            start = pd.to_datetime(tarefa["Start"]).date()
-            end = pd.to_datetime(tarefa["End"]).date()
-            duracao = (end - start).days + 1
-            
-            fig.add_trace(go.Scatter(
-                x=[start, end],
-                y=[tarefa["Task"], tarefa["Task"]],
-                mode='lines',
-                line=dict(color=tarefa["Cor"], width=20),
-                name=tarefa["Task"],
-                hovertext=f"""
-                <b>{tarefa['Task'].strip()}</b><br>
-                <b>Status:</b> {tarefa['Status']}<br>
-                <b>Responsável:</b> {tarefa['Responsavel']}<br>
-                <b>Progresso:</b> {tarefa['Progresso']}<br>
-                <b>Período:</b> {start.strftime('%d/%m/%Y')} → {end.strftime('%d/%m/%Y')}<br>
-                <b>Duração:</b> {duracao} dias
-                """,
-                hoverinfo='text',
-                showlegend=False
-            ))
-            
-            # Adicionar texto no meio
-            meio_data = start + (end - start) / 2
-            fig.add_annotation(
-                x=meio_data,
-                y=tarefa["Task"],
-                text=f"{tarefa['Progresso']}",
-                showarrow=False,
-                font=dict(color='white', size=9),
-                bgcolor=tarefa["Cor"],
-                bordercolor=tarefa["Cor"],
-                borderwidth=0
+    def _exibir_gantt(chave: tuple, montar_tarefas, nivel: str, detalhado: bool):
+        """Exibe o Gantt da chave, montando tarefas e figura só quando não estão no cache.
+
+        `montar_tarefas()` devolve a lista de tarefas ou uma mensagem de erro (texto).
+        """
+        cache = GanttChart.figure_cache()
+        fig = cache.get(chave)
+        if fig is None:
+            tarefas = montar_tarefas()
+            if isinstance(tarefas, str):
+                st.error(tarefas)
+                return
+            if not tarefas:
+                st.warning("Nenhuma tarefa para exibir")
+                return
+            fig = GanttChart._figura_gantt(tarefas, nivel, detalhado)
+            cache.put(chave, fig)
+
+        key = f"gantt_{nivel.lower()}_detalhado" if detalhado else f"gantt_{nivel.lower()}"
+        st.plotly_chart(fig, width="stretch", key=key)
+
+    @staticmethod
+    def _figura_gantt(tarefas: List[Dict], nivel: str, detalhado: bool) -> go.Figure:
+        """Monta a figura do Gantt com todas as barras num único `go.Bar` horizontal.
+
+        Cada barra é `base` (início) + duração em ms, com o progresso como texto da própria barra:
+        o tamanho da figura não cresce com um trace e uma anotação por tarefa.
+        """
+        # Extrair datas (as tarefas já trazem objetos date)
+        data_min = min(min(t["Start"], t["End"]) for t in tarefas)
+        data_max = max(max(t["Start"], t["End"]) for t in tarefas)
+
+        task_labels = [t["Task"] for t in tarefas]
+
+        # Hover: o HTML vai uma vez no template; por barra seguem só os valores (customdata)
+        if detalhado:
+            campos = ["Status", "Responsavel"]
+            detalhes = "<b>Status:</b> %{customdata[3]}<br><b>Responsável:</b> %{customdata[4]}<br>"
+        else:
+            campos = ["Demandas"]
+            detalhes = "<b>Demandas:</b> %{customdata[3]}<br>"
+        customdata = [
+            [
+                t["Task"].strip(),
+                f"{t['Start'].strftime('%d/%m/%Y')} → {t['End'].strftime('%d/%m/%Y')}",
+                (t["End"] - t["Start"]).days + 1,
+                *(t[c] for c in campos),
+            ]
+            for t in tarefas
+        ]
+        hovertemplate = (
+            "<b>%{customdata[0]}</b><br>"
+            f"{detalhes}"
+            "<b>Progresso:</b> %{text}<br>"
+            "<b>Período:</b> %{customdata[1]}<br>"
+            "<b>Duração:</b> %{customdata[2]} dias"
+            "<extra></extra>"
+        )
+
+        # Criar figura (um trace para todas as barras)
+        fig = go.Figure(
+            go.Bar(
+                y=task_labels,
+                base=[t["Start"].isoformat() for t in tarefas],
+                x=[(t["End"] - t["Start"]).total_seconds() * 1000 for t in tarefas],
+                orientation="h",
+                marker=dict(color=[t["Cor"] for t in tarefas], line=dict(width=0)),
+                width=0.6,
+                text=[t["Progresso"] for t in tarefas],
+                textposition="inside",
+                insidetextanchor="middle",
+                textfont=dict(color="white", size=9 if detalhado else 10),
+                customdata=customdata,
+                hovertemplate=hovertemplate,
+                showlegend=False,
             )
-        
+        )
+
         # Configurar layout
-        task_labels = [t["Task"] for t in tarefas]
-        
         fig.update_layout(
             title=dict(
-                text=f"<b>✅ Gantt - {nivel}</b>",
+                text=f"<b>{'✅' if detalhado else '📊'} Gantt - {nivel}</b>",
                 x=0.5,
                 xanchor='center',
                 font=dict(size=14)
             ),
-            height=max(500, len(tarefas) * 50),
+            height=max(500, len(tarefas) * (50 if detalhado else 60)),
             xaxis_type='date',
             xaxis_title='Timeline',
             yaxis_title='',
@@ -552,23 +483,23 @@ class GanttChart:
                 ticktext=task_labels,
                 tickvals=task_labels,
                 automargin=True,
-                tickfont=dict(size=9)
+                tickfont=dict(size=9 if detalhado else 10)
             ),
             plot_bgcolor='#f8f9fa',
             paper_bgcolor='white',
-            font=dict(size=10),
-            margin=dict(l=300, r=50, t=100, b=50),
+            font=dict(size=10 if detalhado else 11),
+            margin=dict(l=300 if detalhado else 250, r=50, t=100, b=50),
             hovermode='closest',
             showlegend=False
         )
-        
+
         # Adicionar gridlines semanais
         current_date = data_min
         weekly_dates = []
         while current_date <= data_max:
             weekly_dates.append(current_date.isoformat())
             current_date += timedelta(days=7)
-        
+
         fig.update_xaxes(
             showgrid=True,
             gridwidth=1,
@@ -577,7 +508,7 @@ class GanttChart:
             tickvals=weekly_dates,
             tickformat='%d/%m'
         )
-        
+
         # Linha de hoje
         hoje = datetime.now().date()
         if data_min <= hoje <= data_max:
@@ -600,10 +531,9 @@ class GanttChart:
                 font=dict(color="red", size=10),
                 yanchor="bottom"
             )
-        
+
         fig.update_yaxes(showgrid=False)
-        
-        st.plotly_chart(fig, width="stretch", key=f"gantt_{nivel.lower()}_detalhado")
+        return fig
     
     # Manter compatibilidade com funções antigas
     @staticmethod
@@ -625,35 +555,46 @@ class GanttChart:
     def render_curva_s(
         demandas: List[Demanda],
         projetos: List[Projeto] = None,
-        etapas: List[Etapa] = None
+        etapas: List[Etapa] = None,
+        index: Optional[DemandaIndex] = None
     ):
         """Renderiza gráfico de Curva S - Planejado vs Realizado"""
         
         if not demandas:
             st.info("📈 Nenhuma demanda para exibir na Curva S")
             return
-        
-        # Preparar dados de conclusão
-        conclusoes_planejadas = []
-        conclusoes_reais = []
-        
-        for demanda in demandas:
-            # Data de conclusão planejada
-            if demanda.data_vencimento_plano:
-                data_plan = GanttChart._parse_date(demanda.data_vencimento_plano)
-                conclusoes_planejadas.append(data_plan)
-            
-            # Data de conclusão real
-            if demanda.data_vencimento_real:
-                data_real = GanttChart._parse_date(demanda.data_vencimento_real)
-                conclusoes_reais.append(data_real)
-            elif demanda.status == "Concluído" and demanda.data_conclusao:
-                data_real = GanttChart._parse_date(demanda.data_conclusao)
-                conclusoes_reais.append(data_real)
+
+        if index is not None:
+            chave = ("curva_s", index.version, datetime.now().date())
+            fig = GanttChart.figure_cache().get_or_build(chave, lambda: GanttChart._figura_curva_s(demandas, index))
+        else:
+            fig = GanttChart._figura_curva_s(demandas)
+        if isinstance(fig, str):
+            st.warning(fig)
+            return
+
+        st.plotly_chart(fig, width="stretch", key="curva_s")
+
+    @staticmethod
+    def _figura_curva_s(demandas: List[Demanda], index: Optional[DemandaIndex] = None):
+        """Figura da Curva S (ou a mensagem de aviso quando não há datas de conclusão)."""
+        # Preparar dados de conclusão (datas já interpretadas pelo índice; inválidas -> hoje, como antes)
+        dates = index.dates if index is not None else DemandaDates(demandas)
+        hoje = float(datetime.now().date().toordinal())
+        plano = np.nan_to_num(dates.ordinals("data_vencimento_plano", demandas), nan=hoje)
+        real = np.nan_to_num(dates.ordinals("data_vencimento_real", demandas), nan=hoje)
+        conclusao = np.nan_to_num(dates.ordinals("data_conclusao", demandas), nan=hoje)
+
+        n = len(demandas)
+        tem_plano = np.fromiter((bool(d.data_vencimento_plano) for d in demandas), dtype=bool, count=n)
+        tem_real = np.fromiter((bool(d.data_vencimento_real) for d in demandas), dtype=bool, count=n)
+        concluida = np.fromiter((d.status == "Concluído" and bool(d.data_conclusao) for d in demandas), dtype=bool, count=n)
+
+        conclusoes_planejadas = [GanttChart._to_date(o) for o in plano[tem_plano]]
+        conclusoes_reais = [GanttChart._to_date(o) for o in np.where(tem_real, real, conclusao)[tem_real | concluida]]
         
         if not conclusoes_planejadas and not conclusoes_reais:
-            st.warning("Nenhuma data de conclusão (planejada ou real) disponível")
-            return
+            return "Nenhuma data de conclusão (planejada ou real) disponível"
         
         # Contar acumuladas por data
         df_plan = None
@@ -721,5 +662,4 @@ class GanttChart:
         
         fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
         fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
-        
-        st.plotly_chart(fig, width="stretch", key="curva_s")
+        return fig
@@ -1,12 +1,22 @@
 import json
 import os
-from dataclasses import asdict
-from datetime import datetime
-from typing import Any, Optional
+import re
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import asdict, fields
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+from uuid import uuid4
 
 import pandas as pd
 
 from src.modules.models import Projeto, Demanda, Etapa
+from src.modules.sheets_cache import SheetsReadCache, shared_read_cache
+from src.modules.sheets_client_pool import SheetsClientPool, shared_client_pool
+from src.modules.sheets_governor import RequestGovernor, shared_governor
+from src.modules.sheets_snapshot import SheetsSnapshotStore, shared_snapshot_store
+from src.modules.storage_backend import UnitOfWork, WriteConflictError, fold_journal
 
 
 class GoogleSheetsManager:
@@ -18,8 +28,31 @@ class GoogleSheetsManager:
       - etapas
       - checklist_topics
       - checklist_tasks
+      - _meta (controle: marcador de versão por aba, trocado a cada escrita feita pelo manager)
+      - _journal (controle: uma linha por mutação — entidade, id, op, dados —, só acrescentada)
+
+    Projetos, etapas e demandas têm a coluna `rev` (revisão da linha, +1 a cada gravação). Antes de regravar
+    linhas, o manager lê só as colunas `id` e `rev` e compara com a revisão que esta sessão leu: linhas que
+    outra sessão alterou no meio-tempo não são sobrescritas (`WriteConflictError`).
 
     A API pública espelha o que o app usa (compatível com managers anteriores).
+
+    Leituras passam por um cache compartilhado pelo processo (`shared_read_cache`), de modo que várias
+    sessões reaproveitam o mesmo snapshot de cada aba; toda escrita feita pelo manager invalida a aba.
+    Quando o snapshot vence, a aba `_meta` (minúscula) é consultada primeiro: se a versão da aba não mudou,
+    o snapshot é reaproveitado sem baixar a aba inteira de novo.
+
+    Cada aba baixada também é guardada em disco (`shared_snapshot_store`). Numa partida a frio (processo
+    novo, cache em memória vazio), `load_all` entrega esse snapshot na hora e revalida as versões em segundo
+    plano; se alguma aba mudou, `consume_snapshot_changes()` avisa o app para recarregar.
+
+    Cada mutação por linha acrescenta sua entrada ao `_journal` no mesmo `batchUpdate` da mudança. O seq de
+    uma entrada é a posição dela (linha - 1) somada à base guardada em `_meta` (`_journal_base`), que cresce
+    quando entradas antigas são compactadas. `pull_changes()` lê só a cauda do journal e devolve o que outras
+    sessões mudaram, para o app aplicar nas listas sem baixar as abas de novo.
+
+    Toda chamada à API (planilha e abas) passa pelo `shared_governor`: ritmo limitado à cota, novas tentativas
+    com backoff em 429/5xx e métricas de uso.
     """
 
     SHEET_PROJETOS = "projetos"
@@ -27,65 +60,162 @@ class GoogleSheetsManager:
     SHEET_ETAPAS = "etapas"
     SHEET_CHECKLIST_TOPICS = "checklist_topics"
     SHEET_CHECKLIST_TASKS = "checklist_tasks"
-
-    def __init__(self, spreadsheet_id: str, service_account_info: dict[str, Any]):
+    SHEET_META = "_meta"
+    SHEET_JOURNAL = "_journal"
+    DATA_SHEETS = [SHEET_PROJETOS, SHEET_DEMANDAS, SHEET_ETAPAS, SHEET_CHECKLIST_TOPICS, SHEET_CHECKLIST_TASKS]
+
+    HEADERS_PROJETOS = ["id", "nome", "descricao", "status", "data_criacao", "data_conclusao", "responsavel", "rev"]
+    HEADERS_ETAPAS = ["id", "nome", "descricao", "ordem", "data_criacao", "rev"]
+    HEADERS_DEMANDAS = [
+        "id",
+        "titulo",
+        "descricao",
+        "projeto_id",
+        "status",
+        "prioridade",
+        "etapa_id",
+        "responsavel",
+        "data_inicio_plano",
+        "data_inicio_real",
+        "data_vencimento_plano",
+        "data_vencimento_real",
+        "data_vencimento",
+        "data_criacao",
+        "data_conclusao",
+        "percentual_completo",
+        "tags",
+        "comentarios",
+        "rev",
+    ]
+    HEADERS_CHECKLIST_TOPICS = ["id", "nome", "created_at"]
+    HEADERS_CHECKLIST_TASKS = ["id", "topic_id", "texto", "done", "created_at"]
+    HEADERS_META = ["sheet", "version", "updated_at"]
+    HEADERS_JOURNAL = ["entity", "id", "op", "payload", "session", "at"]
+    HEADERS_BY_SHEET = {
+        SHEET_PROJETOS: HEADERS_PROJETOS,
+        SHEET_ETAPAS: HEADERS_ETAPAS,
+        SHEET_DEMANDAS: HEADERS_DEMANDAS,
+        SHEET_CHECKLIST_TOPICS: HEADERS_CHECKLIST_TOPICS,
+        SHEET_CHECKLIST_TASKS: HEADERS_CHECKLIST_TASKS,
+    }
+    # Abas gravadas também por lista completa (`save_*`): guardam o hash do conteúdo de cada linha
+    HASHED_SHEETS = (SHEET_PROJETOS, SHEET_ETAPAS, SHEET_DEMANDAS)
+
+    # Por quanto tempo as versões lidas da aba `_meta` são reaproveitadas (várias leituras seguidas = 1 consulta)
+    META_CHECK_SECONDS = 2.0
+
+    # Linha de `_meta` com o seq até onde o `_journal` foi compactado (coluna version) e quando (updated_at)
+    JOURNAL_BASE_KEY = "_journal_base"
+    # Intervalo mínimo entre consultas ao journal; acima de JOURNAL_MAX_ROWS entradas, as mais velhas que
+    # JOURNAL_RETENTION_SECONDS são compactadas
+    JOURNAL_PULL_SECONDS = 5.0
+    JOURNAL_MAX_ROWS = 500
+    JOURNAL_RETENTION_SECONDS = 600.0
+    # Compactação serializada no processo: duas ao mesmo tempo apagariam entradas a mais
+    _journal_compact_lock = threading.Lock()
+
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        service_account_info: dict[str, Any],
+        read_cache: Optional[SheetsReadCache] = None,
+        governor: Optional[RequestGovernor] = None,
+        client_pool: Optional[SheetsClientPool] = None,
+        snapshot_store: Optional[SheetsSnapshotStore] = None,
+    ):
         self.database_url = "gsheets://" + str(spreadsheet_id)
         self.spreadsheet_id = str(spreadsheet_id)
         self._service_account_info = service_account_info
         self._client = None
         self._spreadsheet = None
+        self._worksheets: dict[str, Any] = {}
+        # Layout conhecido de cada aba: cabeçalho e índice id -> número da linha (1-based; linha 1 = cabeçalho).
+        # Permite atualizar/remover uma única linha sem regravar a aba inteira.
+        self._headers: dict[str, list[str]] = {}
+        self._row_index: dict[str, dict[str, int]] = {}
+        self._read_cache = read_cache if read_cache is not None else shared_read_cache
+        self._governor = governor if governor is not None else shared_governor
+        # Cliente autorizado e handle da planilha vêm do pool do processo (token e conexões reaproveitados)
+        self._client_pool = client_pool if client_pool is not None else shared_client_pool
+        self._snapshots = snapshot_store if snapshot_store is not None else shared_snapshot_store
+        # Abas que esta sessão recebeu do snapshot em disco enquanto a revalidação ainda não tinha terminado
+        self._from_snapshot: set[str] = set()
+        # Geração do cache em que o layout de cada aba foi montado (muda quando outra sessão escreve)
+        self._layout_gen: dict[str, int] = {}
+        # Linha de cada aba dentro de `_meta`
+        self._meta_rows: dict[str, int] = {}
+        # Revisão (`rev`) de cada linha como esta sessão a leu/gravou por último: base do compare-and-set
+        self._revs: dict[str, dict[str, int]] = {}
+        # Hash do conteúdo de cada linha na última versão sincronizada (lida ou gravada): base do diff de `save_*`
+        self._row_hashes: dict[str, dict[str, int]] = {}
+        self.save_calls = 0
+        self.full_saves = 0
+        self.rows_received = 0
+        self.rows_transmitted = 0
+        # Journal: entradas desta sessão são ignoradas no pull; `_journal_seq` é o último seq aplicado e
+        # `_journal_since`, o instante a partir do qual a carga atual pode não refletir a planilha
+        self._session_id = uuid4().hex[:12]
+        self._journal_seq: Optional[int] = None
+        self._journal_base = 0
+        self._journal_since: Optional[float] = None
+        self._journal_pulled_at = 0.0
 
     # ------------------------- Auth / client helpers -------------------------
 
     def _get_client(self):
-        if self._client is not None:
-            return self._client
-
-        try:
-            import gspread
-            from google.oauth2.service_account import Credentials
-        except Exception as e:
-            raise RuntimeError(
-                "Dependências Google Sheets não instaladas. Garanta gspread e google-auth no requirements.txt. Erro: "
-                + str(e)
-            )
-
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-
-        creds = Credentials.from_service_account_info(self._service_account_info, scopes=scopes)
-        self._client = gspread.authorize(creds)
+        if self._client is None:
+            self._client = self._client_pool.client(self._service_account_info)
         return self._client
 
     def _get_spreadsheet(self):
         if self._spreadsheet is not None:
             return self._spreadsheet
-        client = self._get_client()
         try:
-            self._spreadsheet = client.open_by_key(self.spreadsheet_id)
-            return self._spreadsheet
+            spreadsheet = self._client_pool.spreadsheet(
+                self._service_account_info,
+                self.spreadsheet_id,
+                lambda client: self._governor.call("read", client.open_by_key, self.spreadsheet_id),
+            )
+        except RuntimeError:
+            raise  # dependências ausentes: mensagem própria
         except Exception as e:
             raise RuntimeError(
                 "Não foi possível abrir a planilha. Verifique se a planilha foi compartilhada com o e-mail do service account. Erro: "
                 + str(e)
             )
+        # Daqui em diante, planilha e abas só são acessadas através do governor
+        self._spreadsheet = self._governor.wrap(spreadsheet)
+        return self._spreadsheet
 
     def _worksheet(self, title: str):
+        if title in self._worksheets:
+            return self._worksheets[title]
         ss = self._get_spreadsheet()
         try:
-            return ss.worksheet(title)
+            ws = ss.worksheet(title)
         except Exception:
             return None
+        self._worksheets[title] = ws
+        return ws
+
+    def _load_worksheets(self):
+        """Carrega os handles de todas as abas com uma única busca de metadados."""
+        ss = self._get_spreadsheet()
+        self._worksheets = {ws.title: ws for ws in ss.worksheets()}
+
+    @staticmethod
+    def _a1_sheet(title: str) -> str:
+        return "'" + title.replace("'", "''") + "'"
 
     def _ensure_worksheet(self, title: str, headers: list[str]):
         ss = self._get_spreadsheet()
         ws = self._worksheet(title)
         if ws is None:
             ws = ss.add_worksheet(title=title, rows=2000, cols=max(10, len(headers) + 2))
+            self._worksheets[title] = ws
             if headers:
                 ws.update([headers])
+                self._mark_written(title)
             return ws
 
         # Se existe, garantir cabeçalho minimamente correto
@@ -96,6 +226,7 @@ class GoogleSheetsManager:
 
         if not first_row and headers:
             ws.update([headers])
+            self._mark_written(title)
         elif headers:
             # Se já tem cabeçalho, não forçar overwrite para não apagar colunas extras do usuário.
             pass
@@ -103,6 +234,19 @@ class GoogleSheetsManager:
 
     # ------------------------- Dataframe helpers -------------------------
 
+    @staticmethod
+    def _cell_value(v: Any) -> str:
+        if v is None:
+            return ""
+        if isinstance(v, (list, dict)):
+            return json.dumps(v, ensure_ascii=False)
+        try:
+            if pd.isna(v):
+                return ""
+        except (TypeError, ValueError):
+            pass
+        return str(v)
+
     @staticmethod
     def _to_cell_values(df: pd.DataFrame) -> list[list[Any]]:
         if df is None or df.empty:
@@ -129,12 +273,48 @@ class GoogleSheetsManager:
             return pd.DataFrame()
         return pd.DataFrame(records)
 
-    def _read_df(self, title: str) -> pd.DataFrame:
+    def _read_values(self, title: str) -> Optional[list[list[Any]]]:
+        """Snapshot bruto da aba, servido pelo cache compartilhado quando ainda válido."""
+        values = self._read_cache.get(self.spreadsheet_id, title)
+        if values is not None:
+            return values
+
+        # Snapshot vencido: se a versão da aba em `_meta` é a mesma do snapshot, não precisa baixar de novo
+        versions = self._meta_versions()
+        version = versions.get(title) if versions else None
+        if version:
+            cached = self._read_cache.peek(self.spreadsheet_id, title)
+            if cached is not None and cached[1] == version:
+                self._read_cache.touch(self.spreadsheet_id, title)
+                return cached[0]
+
         ws = self._worksheet(title)
         if ws is None:
+            return None
+        generation = self._read_cache.generation(self.spreadsheet_id, title)
+        values = ws.get_all_values()
+        # Se alguém escreveu na aba durante o download, não publica um snapshot possivelmente velho
+        if self._read_cache.generation(self.spreadsheet_id, title) == generation:
+            self._read_cache.put(self.spreadsheet_id, title, values, version=version)
+            self._snapshots.save(self.spreadsheet_id, title, values, version)
+        return values
+
+    def _read_df(self, title: str) -> pd.DataFrame:
+        values = self._read_values(title)
+        if not values or len(values) < 2:
             return pd.DataFrame()
 
-        values = ws.get_all_values()
+        self._remember_layout(title, values)
+        return self._values_to_df(values)
+
+    @staticmethod
+    def _pad_values(values: list[list[Any]]) -> list[list[Any]]:
+        """Completa as linhas com "" até a largura da maior (como `get_all_values()` devolve)."""
+        width = max((len(r) for r in values), default=0)
+        return [list(r) + [""] * (width - len(r)) if len(r) < width else list(r) for r in values]
+
+    @staticmethod
+    def _values_to_df(values: list[list[Any]]) -> pd.DataFrame:
         if not values or len(values) < 2:
             return pd.DataFrame()
 
@@ -149,273 +329,1199 @@ class GoogleSheetsManager:
         if "percentual_completo" in df.columns:
             df["percentual_completo"] = pd.to_numeric(df["percentual_completo"], errors="coerce").fillna(0).astype(int)
 
-        # Listas
+        # Listas: uma passada por coluna, decodificando cada texto distinto uma única vez
         for col in ["tags", "comentarios"]:
             if col in df.columns:
-                def _parse_list(v):
-                    if v is None:
-                        return []
-                    s = str(v).strip()
-                    if not s:
-                        return []
-                    try:
-                        parsed = json.loads(s)
-                        return parsed if isinstance(parsed, list) else []
-                    except Exception:
-                        return [s]
-
-                df[col] = df[col].apply(_parse_list)
+                df[col] = GoogleSheetsManager._parse_list_column(df[col].tolist())
 
         return df
 
+    @staticmethod
+    def _parse_list(v: Any) -> list:
+        if v is None:
+            return []
+        s = str(v).strip()
+        if not s:
+            return []
+        try:
+            parsed = json.loads(s)
+            return parsed if isinstance(parsed, list) else []
+        except Exception:
+            return [s]
+
+    @staticmethod
+    def _parse_list_column(cells: list[Any]) -> list[list]:
+        """Decodifica uma coluna JSON (tags/comentarios) inteira.
+
+        Os valores se repetem muito (a maioria é vazia ou `[]`), então cada texto distinto é
+        decodificado uma vez; cada linha recebe a própria cópia da lista.
+        """
+        decoded: dict[Any, list] = {}
+        out: list[list] = []
+        for v in cells:
+            if v is None or v == "" or v == "[]":
+                out.append([])
+                continue
+            parsed = decoded.get(v)
+            if parsed is None:
+                parsed = decoded[v] = GoogleSheetsManager._parse_list(v)
+            out.append(list(parsed))
+        return out
+
+    @staticmethod
+    def _model_records(df: pd.DataFrame, model: type) -> list[dict[str, Any]]:
+        """Linhas do DataFrame como dicts, só com as colunas que o dataclass conhece.
+
+        Monta os dicts coluna a coluna (`tolist()` + `zip`), bem mais rápido que `iterrows()` ou
+        `to_dict("records")`, que convertem célula por célula.
+        """
+        if df.empty:
+            return []
+        names = {f.name for f in fields(model)}
+        columns = [c for c in dict.fromkeys(df.columns) if c in names]
+        data = [df[c].tolist() for c in columns]
+        return [dict(zip(columns, row)) for row in zip(*data)]
+
     def _write_df(self, title: str, df: pd.DataFrame, headers: list[str]):
         ws = self._ensure_worksheet(title, headers=headers)
 
         # Limpar e regravar (mais simples e consistente)
         ws.clear()
         if df is None or df.empty:
-            ws.update([headers] if headers else [["id"]])
+            values = [headers] if headers else [["id"]]
+            ws.update(values)
+            self._mark_written(title)
+            self._remember_layout(title, values)
+            self._append_journal([self._journal_row(title, "", "replace")])
             return True
 
         values = self._to_cell_values(df)
         ws.update(values)
+        self._mark_written(title)
+        self._remember_layout(title, values)
+        self._append_journal([self._journal_row(title, "", "replace")])
         return True
 
+    # ------------------------- Cache helpers -------------------------
+
+    def _mark_written(self, title: str, version_bumped: bool = False):
+        """Invalida a aba no cache compartilhado após uma escrita feita por este manager e troca sua versão em `_meta`.
+
+        O índice id -> linha deste manager continua válido (ele próprio o mantém), então adota a nova geração.
+        `version_bumped=True` indica que a versão já foi gravada junto com a própria escrita.
+        """
+        self._layout_gen[title] = self._read_cache.invalidate(self.spreadsheet_id, title)
+        if not version_bumped and title != self.SHEET_META:
+            self._bump_versions([title])
+
+    def invalidate_read_cache(self):
+        """Força a conferência das versões na próxima leitura (ex.: botão "Recarregar dados").
+
+        Os snapshots não são descartados: abas cuja versão não mudou continuam sem novo download.
+        """
+        self._read_cache.expire(self.spreadsheet_id)
+
+    # ------------------------- Versões (_meta) -------------------------
+
+    @staticmethod
+    def _new_version() -> str:
+        # Marcador único (não um contador): dois escritores simultâneos nunca produzem a mesma versão
+        return f"{time.time_ns():x}-{uuid4().hex[:6]}"
+
+    def _read_meta(self, ws) -> dict[str, str]:
+        return self._parse_meta(ws.get_all_values())
+
+    def _parse_meta(self, values: list[list[Any]]) -> dict[str, str]:
+        versions: dict[str, str] = {}
+        rows: dict[str, int] = {}
+        for row_number, row in enumerate(values[1:], start=2):
+            if row and row[0]:
+                rows[row[0]] = row_number
+                versions[row[0]] = row[1] if len(row) > 1 else ""
+        self._meta_rows = rows
+        self._read_cache.put_versions(self.spreadsheet_id, versions)
+        return versions
+
+    def _meta_versions(self) -> Optional[dict[str, str]]:
+        """Versões atuais por aba (uma leitura de `_meta`, reaproveitada por META_CHECK_SECONDS)."""
+        versions = self._read_cache.versions(self.spreadsheet_id, self.META_CHECK_SECONDS)
+        if versions is not None:
+            return versions
+        ws = self._worksheet(self.SHEET_META)
+        if ws is None:
+            return None
+        return self._read_meta(ws)
+
+    def _version_row_values(self, title: str) -> list[str]:
+        return [title, self._new_version(), datetime.now().isoformat(timespec="seconds")]
+
+    def _version_value_range(self, title: str) -> Optional[dict[str, Any]]:
+        """Faixa (A1 com nome da aba) que grava uma nova versão de `title`, para ir no mesmo lote da escrita."""
+        row_number = self._meta_rows.get(title)
+        if row_number is None or self._worksheet(self.SHEET_META) is None:
+            return None
+        return {"range": f"'{self.SHEET_META}'!A{row_number}:C{row_number}", "values": [self._version_row_values(title)]}
+
+    def _version_update_request(self, title: str) -> Optional[dict[str, Any]]:
+        """Request `updateCells` (spreadsheets.batchUpdate) que grava uma nova versão de `title`."""
+        row_number = self._meta_rows.get(title)
+        meta_ws = self._worksheet(self.SHEET_META)
+        if row_number is None or meta_ws is None:
+            return None
+        return {
+            "updateCells": {
+                "start": {"sheetId": meta_ws.id, "rowIndex": row_number - 1, "columnIndex": 0},
+                "rows": [self._row_data(self._version_row_values(title))],
+                "fields": "userEnteredValue",
+            }
+        }
+
+    @staticmethod
+    def _row_data(values: list[str]) -> dict[str, Any]:
+        """Linha no formato `RowData` do spreadsheets.batchUpdate (texto gravado como está, igual a RAW)."""
+        return {"values": [{"userEnteredValue": {"stringValue": v}} for v in values]}
+
+    def _bump_versions(self, titles: list[str]):
+        ws = self._worksheet(self.SHEET_META)
+        if ws is None:
+            return
+        if any(t not in self._meta_rows for t in titles):
+            self._read_meta(ws)
+
+        updates = []
+        new_rows = []
+        for title in titles:
+            row_number = self._meta_rows.get(title)
+            if row_number is None:
+                new_rows.append(self._version_row_values(title))
+            else:
+                updates.append({"range": f"A{row_number}:C{row_number}", "values": [self._version_row_values(title)]})
+        if updates:
+            ws.batch_update(updates)
+        if new_rows:
+            response = ws.append_rows(new_rows, value_input_option="RAW", table_range="A1")
+            start = self._appended_start_row(response)
+            if start is not None:
+                for offset, row in enumerate(new_rows):
+                    self._meta_rows[row[0]] = start + offset
+        self._read_cache.invalidate(self.spreadsheet_id, self.SHEET_META)
+
+    def read_cache_stats(self) -> dict[str, Any]:
+        return self._read_cache.stats()
+
+    def api_stats(self) -> dict[str, Any]:
+        return self._governor.stats()
+
+    # ------------------------- Snapshot em disco (partida a frio) -------------------------
+
+    def _revalidate_snapshot(self, served: dict[str, Optional[str]]):
+        """Confere as versões das abas servidas do disco e baixa as que mudaram (roda numa thread).
+
+        Só toca no cache compartilhado e no snapshot em disco; o estado da sessão (layout, `_meta_rows`)
+        continua sendo mexido apenas pelo script.
+        """
+        changed = list(served)
+        try:
+            ss = self._get_spreadsheet()
+            generations = {t: self._read_cache.generation(self.spreadsheet_id, t) for t in served}
+            meta_ranges = ss.values_batch_get([self._a1_sheet(self.SHEET_META)]).get("valueRanges", [])
+            meta = meta_ranges[0].get("values", []) if meta_ranges else []
+            versions = {row[0]: (row[1] if len(row) > 1 else "") for row in meta[1:] if row and row[0]}
+            self._read_cache.put_versions(self.spreadsheet_id, versions)
+            changed = [t for t, v in served.items() if not v or versions.get(t) != v]
+            if changed:
+                value_ranges = ss.values_batch_get([self._a1_sheet(t) for t in changed]).get("valueRanges", [])
+                for title, vr in zip(changed, value_ranges):
+                    values = self._pad_values(vr.get("values", []))
+                    if self._read_cache.generation(self.spreadsheet_id, title) == generations[title]:
+                        self._read_cache.put(self.spreadsheet_id, title, values, version=versions.get(title))
+                        self._snapshots.save(self.spreadsheet_id, title, values, versions.get(title))
+            for title in served:
+                if title not in changed:
+                    self._read_cache.touch(self.spreadsheet_id, title)
+        except Exception:
+            # Sem confirmação: trata tudo como mudado; a próxima leitura segue o caminho normal (versão/download)
+            changed = list(served)
+            self._read_cache.expire(self.spreadsheet_id)
+        for title in served:
+            self._snapshots.resolve(self.spreadsheet_id, title, title in changed)
+
+    def consume_snapshot_changes(self) -> list[str]:
+        """Abas que esta sessão recebeu do disco e que a revalidação achou diferentes (informadas uma vez).
+
+        O app recarrega os dados quando a lista não está vazia.
+        """
+        changed = []
+        for title in list(self._from_snapshot):
+            state = self._snapshots.state(self.spreadsheet_id, title)
+            if state == "pending":
+                continue
+            self._from_snapshot.discard(title)
+            if state == "changed":
+                changed.append(title)
+        return changed
+
+    def snapshot_stats(self) -> dict[str, Any]:
+        return self._snapshots.stats()
+
+    # ------------------------- Row-level helpers -------------------------
+
+    @staticmethod
+    def _col_letter(n: int) -> str:
+        """Converte índice de coluna 1-based em letra A1 (1 -> A, 27 -> AA)."""
+        out = ""
+        while n > 0:
+            n, rem = divmod(n - 1, 26)
+            out = chr(65 + rem) + out
+        return out
+
+    @staticmethod
+    def _appended_start_row(response: Any) -> Optional[int]:
+        """Extrai a primeira linha gravada da resposta de `append_rows` (updates.updatedRange)."""
+        try:
+            updated_range = response["updates"]["updatedRange"]
+        except Exception:
+            return None
+        m = re.search(r"![A-Z]+(\d+)", str(updated_range))
+        return int(m.group(1)) if m else None
+
+    def _remember_layout(self, title: str, values: list[list[Any]]):
+        if not values:
+            self._forget_layout(title)
+            return
+        header = [str(h) for h in values[0]]
+        index: dict[str, int] = {}
+        if "id" in header:
+            id_col = header.index("id")
+            for row_number, row in enumerate(values[1:], start=2):
+                if id_col < len(row) and row[id_col] not in (None, ""):
+                    index[str(row[id_col])] = row_number
+        if "id" in header and "rev" in header:
+            id_col, rev_col = header.index("id"), header.index("rev")
+            self._revs[title] = {
+                str(row[id_col]): self._parse_rev(row[rev_col] if rev_col < len(row) else "")
+                for row in values[1:]
+                if id_col < len(row) and row[id_col] not in (None, "")
+            }
+        if title in self.HASHED_SHEETS and "id" in header:
+            id_col = header.index("id")
+            positions = [header.index(c) if c in header else None for c in self._hashed_columns(title)]
+            self._row_hashes[title] = {
+                str(row[id_col]): self._row_hash([row[i] if i is not None and i < len(row) else "" for i in positions])
+                for row in values[1:]
+                if id_col < len(row) and row[id_col] not in (None, "")
+            }
+        self._headers[title] = header
+        self._row_index[title] = index
+        self._layout_gen[title] = self._read_cache.generation(self.spreadsheet_id, title)
+
+    def _hashed_columns(self, title: str) -> list[str]:
+        # `rev` muda a cada gravação sem que o conteúdo mude: fica fora do hash
+        return [c for c in self.HEADERS_BY_SHEET[title] if c != "rev"]
+
+    @staticmethod
+    def _row_hash(cells: list[Any]) -> int:
+        # Só comparado dentro do processo (nunca persistido): o hash nativo da tupla basta
+        return hash(tuple("" if c is None else str(c) for c in cells))
+
+    def _record_hash(self, title: str, rec: dict[str, Any]) -> int:
+        return self._row_hash([self._cell_value(rec.get(c)) for c in self._hashed_columns(title)])
+
+    def _remember_hashes(self, title: str, by_id: dict[str, dict[str, Any]]):
+        if title in self.HASHED_SHEETS:
+            hashes = self._row_hashes.setdefault(title, {})
+            for rid, rec in by_id.items():
+                hashes[rid] = self._record_hash(title, rec)
+
+    def _forget_layout(self, title: str):
+        self._headers.pop(title, None)
+        self._row_index.pop(title, None)
+        self._layout_gen.pop(title, None)
+
+    def _layout(self, title: str, ws) -> tuple[list[str], dict[str, int]]:
+        """Retorna (cabeçalho, índice id -> linha) da aba, lendo só a linha 1 e a coluna `id` se necessário."""
+        current_gen = self._read_cache.generation(self.spreadsheet_id, title)
+        if title in self._headers and title in self._row_index and self._layout_gen.get(title) == current_gen:
+            return self._headers[title], self._row_index[title]
+
+        header = [str(h) for h in ws.row_values(1)]
+        index: dict[str, int] = {}
+        if "id" in header:
+            ids = ws.col_values(header.index("id") + 1)
+            for row_number, value in enumerate(ids[1:], start=2):
+                if value not in (None, ""):
+                    index[str(value)] = row_number
+        self._headers[title] = header
+        self._row_index[title] = index
+        self._layout_gen[title] = current_gen
+        return header, index
+
+    @staticmethod
+    def _parse_rev(value: Any) -> int:
+        try:
+            return int(value or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def _current_revs(self, title: str, header: list[str]) -> dict[str, int]:
+        """Revisão atual de cada linha, lendo só as colunas `id` e `rev` (uma chamada).
+
+        Aproveita a leitura para renovar o índice id -> linha, que assim está em dia na hora de gravar.
+        """
+        return self._current_revs_multi({title: header})[title]
+
+    def _current_revs_multi(self, headers_by_sheet: dict[str, list[str]]) -> dict[str, dict[str, int]]:
+        """`_current_revs` de várias abas numa única chamada (em abas sem `rev`, cada id vem com revisão 0)."""
+        ranges: list[str] = []
+        for title, header in headers_by_sheet.items():
+            a1 = self._a1_sheet(title)
+            for col in ("id", "rev") if "rev" in header else ("id",):
+                letter = self._col_letter(header.index(col) + 1)
+                ranges.append(f"{a1}!{letter}:{letter}")
+        value_ranges = iter(self._get_spreadsheet().values_batch_get(ranges).get("valueRanges", []))
+
+        out: dict[str, dict[str, int]] = {}
+        for title, header in headers_by_sheet.items():
+            ids = [r[0] if r else "" for r in next(value_ranges, {}).get("values", [])]
+            revs = [r[0] if r else "" for r in next(value_ranges, {}).get("values", [])] if "rev" in header else []
+
+            index: dict[str, int] = {}
+            current: dict[str, int] = {}
+            for row_number, value in enumerate(ids[1:], start=2):
+                if value not in (None, ""):
+                    index[str(value)] = row_number
+                    current[str(value)] = self._parse_rev(revs[row_number - 1] if row_number - 1 < len(revs) else "")
+            self._row_index[title] = index
+            self._layout_gen[title] = self._read_cache.generation(self.spreadsheet_id, title)
+            out[title] = current
+        return out
+
+    def _compare_revs(
+        self, title: str, ids: list[str], current: dict[str, int]
+    ) -> tuple[list[tuple[str, str, Optional[int], Optional[int]]], dict[str, int]]:
+        """Compare-and-set: (conflitos, nova revisão de cada id sem conflito)."""
+        seen = self._revs.get(title, {})
+        conflicts: list[tuple[str, str, Optional[int], Optional[int]]] = []
+        new_revs: dict[str, int] = {}
+        for rid in ids:
+            base, actual = seen.get(rid), current.get(rid)
+            # Sem base (linha nunca lida por esta sessão) a gravação é incondicional, como antes
+            if base is not None and actual != base:
+                conflicts.append((title, rid, base, actual))
+                continue
+            new_revs[rid] = (actual or 0) + 1
+        return conflicts, new_revs
+
+    def _upsert_rows(self, title: str, headers: list[str], records: list[dict[str, Any]]) -> bool:
+        """Atualiza (ou acrescenta) apenas as linhas dos registros informados, casando pelo `id`.
+
+        Linhas existentes e ids novos vão num único `spreadsheets.batchUpdate` (ver `_commit_changes`).
+        Em abas com `rev`, só grava as linhas cuja revisão ainda é a que esta sessão leu (as demais são
+        informadas em `WriteConflictError`, depois de gravadas as que não conflitaram).
+        """
+        if not records:
+            return True
+
+        # Último registro vence quando o mesmo id aparece mais de uma vez
+        by_id: dict[str, dict[str, Any]] = {}
+        for rec in records:
+            by_id[str(rec.get("id"))] = rec
+        if "rev" not in headers:
+            return self._commit_changes({title: by_id}, {}, {})
+
+        ws = self._worksheet(title) or self._ensure_worksheet(title, headers=headers)
+        header, _ = self._layout(title, ws)
+        header = self._extend_header(title, ws, header, headers)
+        current = self._current_revs_multi({title: header})
+        conflicts, _ = self._compare_revs(title, list(by_id), current[title])
+        for _, rid, _, _ in conflicts:
+            del by_id[rid]
+        if by_id:
+            self._commit_changes({title: by_id}, {}, {}, check_revs=False, current=current)
+        if conflicts:
+            raise WriteConflictError(conflicts)
+        return True
+
+    def _extend_header(self, title: str, ws, header: list[str], headers: list[str]) -> list[str]:
+        """Acrescenta ao cabeçalho da aba as colunas de `headers` que faltam (aba antiga), sem regravar os dados."""
+        missing = [h for h in headers if h not in header]
+        if not missing:
+            return header
+        header = header + missing
+        if getattr(ws, "col_count", len(header)) < len(header):
+            ws.add_cols(len(header) - ws.col_count)
+        ws.update([header], "A1")
+        self._headers[title] = header
+        self._mark_written(title)
+        return header
+
+    def _update_cells(self, title: str, headers: list[str], row_id: str, values: dict[str, Any]) -> bool:
+        """Grava só as células `values` (coluna -> valor) da linha do id, numa única chamada.
+
+        Retorna False se o id não existe na aba.
+        """
+        if self._worksheet(title) is None:
+            return False
+        self._commit_changes({}, {}, {title: {str(row_id): values}})
+        return str(row_id) in self._row_index.get(title, {})
+
+    def _delete_rows(self, title: str, ids: list[str]) -> bool:
+        """Remove as linhas dos ids informados com um único `spreadsheets.batchUpdate`."""
+        return self._delete_rows_multi({title: ids})
+
+    def _delete_rows_multi(self, targets_by_sheet: dict[str, list[str]]) -> bool:
+        """Remove linhas de uma ou mais abas num único `spreadsheets.batchUpdate` (com as novas versões em `_meta`)."""
+        return self._commit_changes({}, targets_by_sheet, {})
+
+    @staticmethod
+    def _delete_dimension_requests(ws, rows: list[int]) -> list[dict[str, Any]]:
+        """Requests `deleteDimension` das linhas (1-based, ordenadas)."""
+        # Agrupa linhas contíguas e apaga de baixo para cima para não deslocar as próximas faixas
+        spans: list[tuple[int, int]] = []
+        for r in rows:
+            if spans and spans[-1][1] == r - 1:
+                spans[-1] = (spans[-1][0], r)
+            else:
+                spans.append((r, r))
+        return [
+            {"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end}}}
+            for start, end in reversed(spans)
+        ]
+
+    def _after_delete(self, title: str, targets: set[str], rows: list[int], index: dict[str, int]):
+        """Desloca o índice id -> linha depois de removidas as `rows` e esquece revisões/hashes dos ids removidos."""
+        new_index: dict[str, int] = {}
+        for rid, r in index.items():
+            if rid in targets:
+                continue
+            new_index[rid] = r - bisect_left(rows, r)
+        self._row_index[title] = new_index
+        for known in (self._revs.get(title), self._row_hashes.get(title)):
+            if known:
+                for rid in targets:
+                    known.pop(rid, None)
+
+    def _ids_where(self, title: str, column: str, value: str) -> list[str]:
+        """Ids das linhas com `column == value`, lendo só as colunas `id` e `column` (uma chamada).
+
+        Aproveita a leitura para renovar o índice id -> linha da aba.
+        """
+        ws = self._worksheet(title)
+        if ws is None:
+            return []
+        header, _ = self._layout(title, ws)
+        if "id" not in header or column not in header:
+            return []
+        a1 = self._a1_sheet(title)
+        id_col = self._col_letter(header.index("id") + 1)
+        other_col = self._col_letter(header.index(column) + 1)
+        value_ranges = self._get_spreadsheet().values_batch_get(
+            [f"{a1}!{id_col}:{id_col}", f"{a1}!{other_col}:{other_col}"]
+        ).get("valueRanges", [])
+        ids = [r[0] if r else "" for r in value_ranges[0].get("values", [])] if value_ranges else []
+        others = [r[0] if r else "" for r in value_ranges[1].get("values", [])] if len(value_ranges) > 1 else []
+
+        index: dict[str, int] = {}
+        found: list[str] = []
+        for row_number, rid in enumerate(ids[1:], start=2):
+            if rid in (None, ""):
+                continue
+            index[str(rid)] = row_number
+            if row_number - 1 < len(others) and others[row_number - 1] == str(value):
+                found.append(str(rid))
+        self._row_index[title] = index
+        self._layout_gen[title] = self._read_cache.generation(self.spreadsheet_id, title)
+        return found
+
+    @staticmethod
+    def _projeto_record(p: Projeto) -> dict[str, Any]:
+        d = p.to_dict() if hasattr(p, "to_dict") else asdict(p)
+        # Evitar embutir etapas/demandas no registro de projeto
+        d.pop("etapas", None)
+        d.pop("demandas", None)
+        return d
+
+    @staticmethod
+    def _etapa_record(e: Etapa) -> dict[str, Any]:
+        return e.to_dict() if hasattr(e, "to_dict") else asdict(e)
+
+    @staticmethod
+    def _demanda_record(d: Demanda) -> dict[str, Any]:
+        return d.to_dict() if hasattr(d, "to_dict") else asdict(d)
+
+    # ------------------------- Unidade de trabalho -------------------------
+
+    def unit_of_work(self, on_rollback: Optional[Callable[[], None]] = None) -> UnitOfWork:
+        return UnitOfWork(self.commit_unit_of_work, on_rollback)
+
+    def commit_unit_of_work(self, uow: UnitOfWork) -> bool:
+        """Grava as mudanças da unidade (várias abas) num único `spreadsheets.batchUpdate` (ver `_commit_changes`)."""
+        to_record = {
+            self.SHEET_PROJETOS: self._projeto_record,
+            self.SHEET_ETAPAS: self._etapa_record,
+            self.SHEET_DEMANDAS: self._demanda_record,
+        }
+        upserts = {
+            title: {rid: to_record[title](item) for rid, item in items.items()} for title, items in uow.upserts.items()
+        }
+        return self._commit_changes(upserts, uow.deletes, uow.updates)
+
+    def _commit_changes(
+        self,
+        upserts: dict[str, dict[str, dict[str, Any]]],
+        deletes: dict[str, Any],
+        cells: dict[str, dict[str, dict[str, Any]]],
+        check_revs: bool = True,
+        current: Optional[dict[str, dict[str, int]]] = None,
+    ) -> bool:
+        """Grava linhas (aba -> id -> registro), remoções (aba -> ids) e células avulsas num único `spreadsheets.batchUpdate`.
+
+        É o caminho de todas as escritas por linha. Quando preciso (compare-and-set, remoções e células avulsas,
+        que dependem da posição atual da linha), uma leitura só traz antes as colunas `id`/`rev` das abas
+        envolvidas (dispensada se `current` já vier lido) e renova o índice id -> linha. Se qualquer linha conflitar, nada é gravado. A API aplica os
+        requests do lote em ordem e atomicamente: regravações de linhas e células primeiro (nas posições atuais),
+        depois as remoções (de baixo para cima), as linhas novas (`appendCells`), as entradas do `_journal` e as
+        versões em `_meta`. Se a chamada falhar, o layout das abas é descartado (remontado na próxima escrita).
+        `check_revs=False` grava sem compare-and-set (substituição de `save_*`).
+        """
+        headers_by_title = self.HEADERS_BY_SHEET
+        sheets: dict[str, tuple[Any, list[str]]] = {}
+        for title, headers in headers_by_title.items():
+            if not (upserts.get(title) or deletes.get(title) or cells.get(title)):
+                continue
+            ws = self._worksheet(title)
+            if ws is None:
+                if not upserts.get(title):
+                    continue  # aba inexistente: nada a remover/atualizar
+                ws = self._ensure_worksheet(title, headers=headers)
+            header, _ = self._layout(title, ws)
+            sheets[title] = (ws, self._extend_header(title, ws, header, headers))
+        titles = list(sheets)
+
+        if current is None:
+            # Lê as colunas id/rev onde é preciso: compare-and-set, e toda aba com remoções/células avulsas. O
+            # índice em memória só acompanha as escritas deste processo; linhas inseridas/removidas por outro
+            # (réplica, script, edição à mão) deslocariam as posições e o request atingiria outro registro
+            need: dict[str, list[str]] = {}
+            for title, (_, header) in sheets.items():
+                index = self._row_index.get(title, {})
+                regrava = any(str(i) in index for i in upserts.get(title, {}))  # updateCells na posição em cache
+                if ("rev" in header and upserts.get(title)) or regrava or deletes.get(title) or cells.get(title):
+                    need[title] = header
+            current = self._current_revs_multi(need) if need else {}
+
+        conflicts: list[tuple[str, str, Optional[int], Optional[int]]] = []
+        new_revs: dict[str, dict[str, int]] = {}
+        for title in titles:
+            if "rev" in headers_by_title[title] and upserts.get(title):
+                if check_revs:
+                    title_conflicts, new_revs[title] = self._compare_revs(title, list(upserts[title]), current[title])
+                    conflicts.extend(title_conflicts)
+                else:
+                    new_revs[title] = {rid: current[title].get(rid, 0) + 1 for rid in upserts[title]}
+        if conflicts:
+            raise WriteConflictError(conflicts)
+
+        update_requests: list[dict[str, Any]] = []
+        delete_requests: list[dict[str, Any]] = []
+        append_requests: list[dict[str, Any]] = []
+        version_requests: list[dict[str, Any]] = []
+        version_bumped: dict[str, bool] = {}
+        plans: list[tuple[str, set[str], list[int], dict[str, int]]] = []
+        journal: list[list[str]] = []
+        for title in titles:
+            ws, header = sheets[title]
+            index = self._row_index[title]
+            width = max(header.index(h) for h in headers_by_title[title]) + 1
+
+            new_rows = []
+            for rid, rec in upserts.get(title, {}).items():
+                if rid in new_revs.get(title, {}):
+                    rec = {**rec, "rev": new_revs[title][rid]}
+                values = [self._cell_value(rec.get(col)) for col in header[:width]]
+                journal.append(self._journal_row(title, rid, "upsert", dict(zip(header[:width], values))))
+                row_number = index.get(rid)
+                if row_number is None:
+                    new_rows.append(self._row_data(values))
+                else:
+                    update_requests.append(
+                        {"updateCells": {"start": {"sheetId": ws.id, "rowIndex": row_number - 1, "columnIndex": 0},
+                                         "rows": [self._row_data(values)], "fields": "userEnteredValue"}}
+                    )
+            for rid, values in cells.get(title, {}).items():
+                row_number = index.get(rid)
+                if row_number is None:
+                    continue  # linha removida por outra sessão: nada a atualizar
+                texts = {
+                    col: ("true" if value else "false") if isinstance(value, bool) else self._cell_value(value)
+                    for col, value in values.items()
+                }
+                journal.append(self._journal_row(title, rid, "update", texts))
+                for col, text in texts.items():
+                    update_requests.append(
+                        {"updateCells": {"start": {"sheetId": ws.id, "rowIndex": row_number - 1,
+                                                   "columnIndex": header.index(col)},
+                                         "rows": [self._row_data([text])], "fields": "userEnteredValue"}}
+                    )
+
+            targets = {str(i) for i in deletes.get(title, ())}
+            rows = sorted({index[i] for i in targets if i in index})
+            if rows:
+                delete_requests.extend(self._delete_dimension_requests(ws, rows))
+                plans.append((title, targets, rows, index))
+                journal.extend(self._journal_row(title, rid, "delete") for rid in targets if rid in index)
+            if new_rows:
+                append_requests.append({"appendCells": {"sheetId": ws.id, "rows": new_rows, "fields": "userEnteredValue"}})
+
+            version_request = self._version_update_request(title)
+            if version_request is not None:
+                version_requests.append(version_request)
+            version_bumped[title] = version_request is not None
+
+        requests = update_requests + delete_requests + append_requests
+        if not requests:
+            return True
+        journal_ws = self._worksheet(self.SHEET_JOURNAL)
+        if journal_ws is not None and journal:
+            requests.append(
+                {"appendCells": {"sheetId": journal_ws.id, "rows": [self._row_data(r) for r in journal],
+                                 "fields": "userEnteredValue"}}
+            )
+        try:
+            self._get_spreadsheet().batch_update({"requests": requests + version_requests})
+        except Exception:
+            for title in titles:
+                self._forget_layout(title)
+            raise
+
+        # Linhas acrescentadas ficam fora do índice (o `appendCells` não informa onde gravou) e não deslocam as
+        # demais; a próxima escrita que precisar delas relê a coluna `id`
+        for title, targets, rows, index in plans:
+            self._after_delete(title, targets, rows, index)
+        for title in titles:
+            if title in new_revs:
+                self._revs.setdefault(title, {}).update(new_revs[title])
+            self._remember_hashes(title, upserts.get(title, {}))
+            self._mark_written(title, version_bumped=version_bumped[title])
+        return True
+
+    # ------------------------- Journal (_journal) -------------------------
+
+    def _journal_row(self, title: str, row_id: str, op: str, data: Optional[dict[str, Any]] = None) -> list[str]:
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")) if data else ""
+        at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        return [title, str(row_id), op, payload, self._session_id, at]
+
+    def _append_journal(self, rows: list[list[str]]):
+        """Acrescenta entradas ao journal numa chamada própria (escritas que não passam por `_commit_changes`)."""
+        ws = self._worksheet(self.SHEET_JOURNAL)
+        if ws is not None and rows:
+            ws.append_rows(rows, value_input_option="RAW", table_range="A1")
+
+    @staticmethod
+    def _parse_time(value: Any) -> Optional[float]:
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    def _read_journal(self, start_row: int, columns: str = "A:F") -> tuple[int, Optional[float], list[list[Any]]]:
+        """(base, compactado em, linhas do journal a partir de `start_row`), lidos com `_meta` numa chamada."""
+        first, last = columns.split(":")
+        value_ranges = self._get_spreadsheet().values_batch_get(
+            [self._a1_sheet(self.SHEET_META), f"{self._a1_sheet(self.SHEET_JOURNAL)}!{first}{start_row}:{last}"]
+        ).get("valueRanges", [])
+        meta = self._pad_values(value_ranges[0].get("values", [])) if value_ranges else []
+        self._parse_meta(meta)
+        base, compacted_at = 0, None
+        for row in meta[1:]:
+            if row and row[0] == self.JOURNAL_BASE_KEY:
+                base = self._parse_rev(row[1] if len(row) > 1 else "")
+                compacted_at = self._parse_time(row[2] if len(row) > 2 else "")
+        rows = value_ranges[1].get("values", []) if len(value_ranges) > 1 else []
+        return base, compacted_at, rows
+
+    def _no_changes(self, reload: bool = False) -> dict[str, Any]:
+        return {"seq": self._journal_seq, "reload": reload, "upserts": {}, "deletes": {}, "updates": {}}
+
+    def pull_changes(self) -> dict[str, Any]:
+        """Mudanças gravadas por outras sessões desde a carga (ou desde o último pull), lidas do `_journal`.
+
+        Lê só a cauda do journal (a partir do último seq aplicado) junto com `_meta`, numa chamada; no máximo
+        uma consulta a cada JOURNAL_PULL_SECONDS. `upserts` traz objetos do modelo (dicts no check-list),
+        `deletes` os ids removidos e `updates` as células avulsas do check-list. `reload=True` quando o journal
+        não cobre o intervalo (entradas compactadas antes de lidas, aba regravada inteira): recarregar tudo.
+        """
+        now = time.monotonic()
+        if now - self._journal_pulled_at < self.JOURNAL_PULL_SECONDS:
+            return self._no_changes()
+        self._journal_pulled_at = now
+        if self._worksheet(self.SHEET_JOURNAL) is None:
+            return self._no_changes()
+
+        first_pull = self._journal_seq is None
+        start_row = 2 if first_pull else self._journal_seq - self._journal_base + 2
+        base, compacted_at, rows = self._read_journal(start_row)
+        if not first_pull and base != self._journal_base:
+            # Outra sessão compactou desde o último pull: as posições mudaram
+            self._journal_base = base
+            if self._journal_seq < base:
+                self._journal_seq = None
+                return self._no_changes(reload=True)
+            start_row = self._journal_seq - base + 2
+            base, compacted_at, rows = self._read_journal(start_row)
+        self._journal_base = base
+        self._journal_seq = base + start_row - 2 + len(rows)
+
+        if first_pull:
+            since = self._journal_since
+            if since is None:
+                return self._no_changes()  # sem carga de referência: só posiciona o cursor
+            if compacted_at is not None and compacted_at > since:
+                self._journal_seq = None
+                return self._no_changes(reload=True)
+            rows = [r for r in rows if (self._parse_time(r[5] if len(r) > 5 else "") or 0) >= since]
+
+        entries = []
+        for r in rows:
+            r = list(r) + [""] * (len(self.HEADERS_JOURNAL) - len(r))
+            entity, row_id, op, payload, session = r[:5]
+            if entity not in self.HEADERS_BY_SHEET:
+                continue
+            try:
+                data = json.loads(payload) if payload and session != self._session_id else {}
+            except ValueError:
+                data = {}
+            entries.append((entity, str(row_id), op, data, session))
+        # Entradas desta sessão entram só para descartar as anteriores de outras sessões no mesmo id
+        reload, upserts, deletes, updates = fold_journal(entries, self._session_id)
+        if reload:
+            self._journal_seq = None
+            return self._no_changes(reload=True)
+
+        out = self._no_changes()
+        out["deletes"], out["updates"] = deletes, updates
+        converters = {
+            self.SHEET_PROJETOS: self._projetos_from_df,
+            self.SHEET_ETAPAS: self._etapas_from_df,
+            self.SHEET_DEMANDAS: self._demandas_from_df,
+            self.SHEET_CHECKLIST_TOPICS: self._checklist_topics_from_df,
+            self.SHEET_CHECKLIST_TASKS: self._checklist_tasks_from_df,
+        }
+        for entity, by_id in upserts.items():
+            header = self.HEADERS_BY_SHEET[entity]
+            values = [header] + [[str(data.get(c, "")) for c in header] for data in by_id.values()]
+            out["upserts"][entity] = converters[entity](self._values_to_df(values))
+            # A sessão passa a ter a versão lida do journal: base do próximo compare-and-set e do diff de `save_*`
+            if "rev" in header:
+                self._revs.setdefault(entity, {}).update(
+                    {rid: self._parse_rev(data.get("rev")) for rid, data in by_id.items()}
+                )
+            if entity in self.HASHED_SHEETS:
+                self._row_hashes.setdefault(entity, {}).update(
+                    {rid: self._row_hash([data.get(c, "") for c in self._hashed_columns(entity)]) for rid, data in by_id.items()}
+                )
+        for entity, ids in deletes.items():
+            for known in (self._revs.get(entity), self._row_hashes.get(entity)):
+                if known:
+                    for rid in ids:
+                        known.pop(rid, None)
+            # Linhas removidas por outra sessão deslocam as de baixo: o índice id -> linha é refeito
+            self._forget_layout(entity)
+
+        if self._journal_seq - base > self.JOURNAL_MAX_ROWS:
+            self.compact_journal()
+        return out
+
+    def compact_journal(self, retention_seconds: Optional[float] = None) -> int:
+        """Remove do `_journal` as entradas mais antigas que a retenção; retorna quantas saíram.
+
+        Cada entrada foi gravada no mesmo lote da sua mudança, então já está nas abas: compactar só encurta
+        o histórico. A remoção e a nova base em `_meta` vão num único `batchUpdate`; sessões que ainda não
+        tinham lido as entradas removidas recebem `reload` no próximo pull.
+        """
+        retention = self.JOURNAL_RETENTION_SECONDS if retention_seconds is None else float(retention_seconds)
+        journal_ws = self._worksheet(self.SHEET_JOURNAL)
+        meta_ws = self._worksheet(self.SHEET_META)
+        if journal_ws is None or meta_ws is None:
+            return 0
+        with self._journal_compact_lock:
+            base, _, rows = self._read_journal(2, columns="F:F")
+            cutoff = time.time() - retention
+            count = 0
+            for r in rows:
+                at = self._parse_time(r[0] if r else "")
+                if at is None or at >= cutoff:
+                    break
+                count += 1
+            if not count:
+                return 0
+
+            requests = self._delete_dimension_requests(journal_ws, list(range(2, count + 2)))
+            base_row = self._row_data(
+                [self.JOURNAL_BASE_KEY, str(base + count), datetime.now(timezone.utc).isoformat(timespec="seconds")]
+            )
+            row_number = self._meta_rows.get(self.JOURNAL_BASE_KEY)
+            if row_number is None:
+                requests.append({"appendCells": {"sheetId": meta_ws.id, "rows": [base_row], "fields": "userEnteredValue"}})
+            else:
+                requests.append(
+                    {"updateCells": {"start": {"sheetId": meta_ws.id, "rowIndex": row_number - 1, "columnIndex": 0},
+                                     "rows": [base_row], "fields": "userEnteredValue"}}
+                )
+            self._get_spreadsheet().batch_update({"requests": requests})
+            self._read_cache.invalidate(self.spreadsheet_id, self.SHEET_META)
+            if row_number is None:
+                self._meta_rows.pop(self.JOURNAL_BASE_KEY, None)
+            self._journal_base = base + count
+        return count
+
+    # ------------------------- Substituição por diff (save_*) -------------------------
+
+    def _save_rows(self, title: str, records: list[dict[str, Any]]) -> bool:
+        """Deixa a aba igual a `records` (semântica de `save_*`) transmitindo só as linhas que mudaram.
+
+        O conteúdo de cada registro é comparado com o hash da última versão sincronizada por esta sessão
+        (lida ou gravada): linhas novas, alteradas e removidas vão num único `spreadsheets.batchUpdate`, depois
+        de uma leitura das colunas `id`/`rev`. Sem essa referência (aba ainda não lida), lê a aba antes; só uma
+        aba inexistente ou vazia é gravada inteira. Linhas iguais mantêm a revisão e as alteradas ganham +1.
+        Como antes, é uma substituição: linhas que não estão na lista são removidas, sem compare-and-set.
+        """
+        headers = self.HEADERS_BY_SHEET[title]
+        self.save_calls += 1
+        self.rows_received += len(records)
+        ws = self._worksheet(title)
+        known = self._row_hashes.get(title)
+        if ws is not None and known is None:
+            # Regravar tudo com `rev` em branco zeraria as revisões: o compare-and-set das outras sessões
+            # recusaria a próxima edição de qualquer linha
+            values = self._read_values(title)
+            if values:
+                self._remember_layout(title, values)
+                known = self._row_hashes.get(title)
+        if ws is None or known is None:
+            df = pd.DataFrame(records)
+            for h in headers:
+                if h not in df.columns:
+                    df[h] = ""
+            self.full_saves += 1
+            self.rows_transmitted += len(records)
+            return self._write_df(title, df[headers], headers=headers)
+
+        header, _ = self._layout(title, ws)
+        header = self._extend_header(title, ws, header, headers)
+        current = self._current_revs_multi({title: header})
+
+        by_id: dict[str, dict[str, Any]] = {}
+        for rec in records:
+            by_id[str(rec.get("id"))] = rec
+        changed = {
+            rid: rec
+            for rid, rec in by_id.items()
+            if rid not in current[title] or known.get(rid) != self._record_hash(title, rec)
+        }
+        removed = [rid for rid in current[title] if rid not in by_id]
+        if changed or removed:
+            self._commit_changes({title: changed}, {title: removed}, {}, check_revs=False, current=current)
+        self.rows_transmitted += len(changed) + len(removed)
+        return True
+
+    def save_stats(self) -> dict[str, Any]:
+        """Linhas recebidas pelos `save_*` x linhas efetivamente enviadas à API."""
+        return {
+            "saves": self.save_calls,
+            "full_saves": self.full_saves,
+            "rows_received": self.rows_received,
+            "rows_transmitted": self.rows_transmitted,
+        }
+
     # ------------------------- Public API (compat) -------------------------
 
+    def _required_sheets(self) -> list[tuple[str, list[str]]]:
+        # `_meta` primeiro, para que a criação das demais abas já registre versão
+        return [
+            (self.SHEET_META, self.HEADERS_META),
+            (self.SHEET_JOURNAL, self.HEADERS_JOURNAL),
+            (self.SHEET_PROJETOS, self.HEADERS_PROJETOS),
+            (self.SHEET_ETAPAS, self.HEADERS_ETAPAS),
+            (self.SHEET_DEMANDAS, self.HEADERS_DEMANDAS),
+            (self.SHEET_CHECKLIST_TOPICS, self.HEADERS_CHECKLIST_TOPICS),
+            (self.SHEET_CHECKLIST_TASKS, self.HEADERS_CHECKLIST_TASKS),
+        ]
+
     def health_check(self) -> bool:
+        """Garante as abas e cabeçalhos com 1 busca de metadados + 1 `values_batch_get` no caso comum."""
         ss = self._get_spreadsheet()
         _ = ss.title
-        # garantir worksheets core
-        self._ensure_worksheet(self.SHEET_PROJETOS, headers=["id", "nome", "descricao", "status", "data_criacao", "data_conclusao", "responsavel"])
-        self._ensure_worksheet(self.SHEET_ETAPAS, headers=["id", "nome", "descricao", "ordem", "data_criacao"])
-        self._ensure_worksheet(
-            self.SHEET_DEMANDAS,
-            headers=[
-                "id",
-                "titulo",
-                "descricao",
-                "projeto_id",
-                "status",
-                "prioridade",
-                "etapa_id",
-                "responsavel",
-                "data_inicio_plano",
-                "data_inicio_real",
-                "data_vencimento_plano",
-                "data_vencimento_real",
-                "data_vencimento",
-                "data_criacao",
-                "data_conclusao",
-                "percentual_completo",
-                "tags",
-                "comentarios",
-            ],
-        )
-        self._ensure_worksheet(self.SHEET_CHECKLIST_TOPICS, headers=["id", "nome", "created_at"])
-        self._ensure_worksheet(self.SHEET_CHECKLIST_TASKS, headers=["id", "topic_id", "texto", "done", "created_at"])
+        self._load_worksheets()
+
+        required = self._required_sheets()
+        # Abas inexistentes são criadas (já com cabeçalho); só acontece na primeira execução
+        for title, headers in required:
+            if title not in self._worksheets:
+                self._ensure_worksheet(title, headers=headers)
+
+        # Cabeçalho de cada aba + conteúdo de `_meta` numa única leitura
+        data_sheets = [(t, h) for t, h in required if t != self.SHEET_META]
+        ranges = [f"{self._a1_sheet(t)}!1:1" for t, _ in data_sheets] + [self._a1_sheet(self.SHEET_META)]
+        value_ranges = ss.values_batch_get(ranges).get("valueRanges", [])
+        for (title, headers), vr in zip(data_sheets, value_ranges):
+            if not vr.get("values"):
+                self._worksheets[title].update([headers])
+                self._mark_written(title)
+        meta_values = value_ranges[-1].get("values", []) if len(value_ranges) == len(ranges) else []
+        if not meta_values:
+            self._worksheets[self.SHEET_META].update([self.HEADERS_META])
+        self._parse_meta(meta_values)
+
+        # Abas que ainda não têm versão registrada (planilhas antigas) ganham uma agora
+        sem_versao = [t for t in self.DATA_SHEETS if t not in self._meta_rows]
+        if sem_versao:
+            self._bump_versions(sem_versao)
         return True
 
+    def load_all(self) -> dict[str, list]:
+        """Carrega as cinco abas de dados de uma vez, já convertidas.
+
+        Abas ainda válidas no cache não geram chamada; as demais vêm num único `values_batch_get`
+        (com `_meta` junto, para registrar a versão). Se só há snapshots vencidos, confere antes as
+        versões (1 leitura pequena) e baixa apenas as abas que mudaram.
+
+        Retorna {"projetos", "demandas", "etapas", "checklist_topics", "checklist_tasks"}.
+        """
+        if not self._worksheets:
+            self._load_worksheets()
+        # Dados servidos do cache podem ter até um TTL (+ a conferência de versão) de idade: o primeiro pull
+        # reaplica as entradas do journal desde então
+        self._journal_seq = None
+        self._journal_since = time.time() - self._read_cache.ttl_seconds - self.META_CHECK_SECONDS
+
+        values_by_sheet: dict[str, Optional[list[list[Any]]]] = {}
+        stale: list[str] = []
+        for title in self.DATA_SHEETS:
+            values = self._read_cache.get(self.spreadsheet_id, title)
+            if values is not None:
+                values_by_sheet[title] = values
+            elif title not in self._worksheets:
+                values_by_sheet[title] = None
+            else:
+                stale.append(title)
+
+        # Partida a frio (nada em memória): entrega o snapshot em disco e revalida em segundo plano
+        cold = [t for t in stale if self._read_cache.peek(self.spreadsheet_id, t) is None]
+        if cold and self._snapshots.enabled:
+            served = self._snapshots.load(self.spreadsheet_id, cold)
+            if served:
+                for title, (values, version) in served.items():
+                    self._read_cache.put(self.spreadsheet_id, title, values, version=version)
+                    values_by_sheet[title] = values
+                stale = [t for t in stale if t not in served]
+                self._snapshots.mark_pending(self.spreadsheet_id, list(served))
+                threading.Thread(
+                    target=self._revalidate_snapshot,
+                    args=({t: v for t, (_, v) in served.items()},),
+                    name="sheets-snapshot-revalidate",
+                    daemon=True,
+                ).start()
+
+        # Se há snapshot vencido guardado, a conferência de versão pode evitar o download
+        if stale and any(self._read_cache.peek(self.spreadsheet_id, t) is not None for t in stale):
+            versions = self._meta_versions() or {}
+            still_stale = []
+            for title in stale:
+                cached = self._read_cache.peek(self.spreadsheet_id, title)
+                if cached is not None and versions.get(title) and cached[1] == versions.get(title):
+                    self._read_cache.touch(self.spreadsheet_id, title)
+                    values_by_sheet[title] = cached[0]
+                else:
+                    still_stale.append(title)
+            stale = still_stale
+
+        if stale:
+            ss = self._get_spreadsheet()
+            with_meta = self.SHEET_META in self._worksheets
+            generations = {t: self._read_cache.generation(self.spreadsheet_id, t) for t in stale}
+            ranges = [self._a1_sheet(t) for t in stale] + ([self._a1_sheet(self.SHEET_META)] if with_meta else [])
+            value_ranges = ss.values_batch_get(ranges).get("valueRanges", [])
+            versions = self._parse_meta(self._pad_values(value_ranges[-1].get("values", []))) if with_meta else {}
+            for title, vr in zip(stale, value_ranges):
+                values = self._pad_values(vr.get("values", []))
+                values_by_sheet[title] = values
+                if self._read_cache.generation(self.spreadsheet_id, title) == generations[title]:
+                    self._read_cache.put(self.spreadsheet_id, title, values, version=versions.get(title))
+                    self._snapshots.save(self.spreadsheet_id, title, values, versions.get(title))
+
+        dfs: dict[str, pd.DataFrame] = {}
+        for title in self.DATA_SHEETS:
+            unconfirmed = self._snapshots.state(self.spreadsheet_id, title) == "pending"
+            if unconfirmed:
+                self._from_snapshot.add(title)
+            values = values_by_sheet.get(title)
+            if values and len(values) >= 2:
+                self._remember_layout(title, values)
+                if unconfirmed:
+                    # Linhas do disco podem ter mudado de lugar: o índice id -> linha é refeito antes de gravar
+                    self._layout_gen[title] = -1
+                dfs[title] = self._values_to_df(values)
+            else:
+                dfs[title] = pd.DataFrame()
+
+        return {
+            "projetos": self._projetos_from_df(dfs[self.SHEET_PROJETOS]),
+            "demandas": self._demandas_from_df(dfs[self.SHEET_DEMANDAS]),
+            "etapas": self._etapas_from_df(dfs[self.SHEET_ETAPAS]),
+            "checklist_topics": self._checklist_topics_from_df(dfs[self.SHEET_CHECKLIST_TOPICS]),
+            "checklist_tasks": self._checklist_tasks_from_df(dfs[self.SHEET_CHECKLIST_TASKS]),
+        }
+
     # ---- Projetos ----
 
     def load_projetos(self) -> list[Projeto]:
-        df = self._read_df(self.SHEET_PROJETOS)
-        if df.empty:
-            return []
-        out: list[Projeto] = []
-        for _, row in df.iterrows():
-            data = row.to_dict()
-            data = {k: (None if v is None else v) for k, v in data.items()}
-            out.append(Projeto.from_dict(data))
-        return out
+        return self._projetos_from_df(self._read_df(self.SHEET_PROJETOS))
+
+    @staticmethod
+    def _projetos_from_df(df: pd.DataFrame) -> list[Projeto]:
+        return [Projeto.from_dict(data) for data in GoogleSheetsManager._model_records(df, Projeto)]
 
     def save_projetos(self, projetos: list[Projeto]) -> bool:
-        rows = []
-        for p in projetos:
-            d = p.to_dict() if hasattr(p, "to_dict") else asdict(p)
-            # Evitar embutir etapas/demandas no registro de projeto
-            d.pop("etapas", None)
-            d.pop("demandas", None)
-            rows.append(d)
-        df = pd.DataFrame(rows)
-        headers = ["id", "nome", "descricao", "status", "data_criacao", "data_conclusao", "responsavel"]
-        for h in headers:
-            if h not in df.columns:
-                df[h] = ""
-        df = df[headers]
-        return self._write_df(self.SHEET_PROJETOS, df, headers=headers)
+        """Substitui a aba pela lista, enviando só as linhas novas/alteradas/removidas."""
+        return self._save_rows(self.SHEET_PROJETOS, [self._projeto_record(p) for p in projetos])
+
+    def upsert_projetos(self, projetos: list[Projeto]) -> bool:
+        """Grava apenas as linhas dos projetos informados (insere os que ainda não existem)."""
+        records = [self._projeto_record(p) for p in projetos]
+        return self._upsert_rows(self.SHEET_PROJETOS, self.HEADERS_PROJETOS, records)
+
+    def upsert_projeto(self, projeto: Projeto) -> bool:
+        return self.upsert_projetos([projeto])
 
     def delete_projeto(self, projeto_id: str) -> bool:
-        projetos = [p for p in self.load_projetos() if getattr(p, "id", None) != projeto_id]
-        return self.save_projetos(projetos)
+        return self._delete_rows(self.SHEET_PROJETOS, [projeto_id])
+
+    def delete_projeto_cascade(self, projeto_id: str) -> bool:
+        """Remove o projeto e todas as suas demandas num único `spreadsheets.batchUpdate`.
+
+        As demandas do projeto são localizadas pelas colunas `id`/`projeto_id` da aba (uma leitura pequena),
+        de modo que entram também as criadas por outras sessões.
+        """
+        demanda_ids = self._ids_where(self.SHEET_DEMANDAS, "projeto_id", projeto_id)
+        return self._delete_rows_multi({self.SHEET_DEMANDAS: demanda_ids, self.SHEET_PROJETOS: [projeto_id]})
 
     # ---- Etapas ----
 
     def load_etapas(self) -> list[Etapa]:
-        df = self._read_df(self.SHEET_ETAPAS)
-        if df.empty:
-            return []
-        out: list[Etapa] = []
-        for _, row in df.iterrows():
-            data = row.to_dict()
-            out.append(Etapa.from_dict(data))
-        return out
+        return self._etapas_from_df(self._read_df(self.SHEET_ETAPAS))
+
+    @staticmethod
+    def _etapas_from_df(df: pd.DataFrame) -> list[Etapa]:
+        return [Etapa.from_dict(data) for data in GoogleSheetsManager._model_records(df, Etapa)]
 
     def save_etapas(self, etapas: list[Etapa]) -> bool:
-        rows = []
-        for e in etapas:
-            d = e.to_dict() if hasattr(e, "to_dict") else asdict(e)
-            rows.append(d)
-        df = pd.DataFrame(rows)
-        headers = ["id", "nome", "descricao", "ordem", "data_criacao"]
-        for h in headers:
-            if h not in df.columns:
-                df[h] = ""
-        df = df[headers]
-        return self._write_df(self.SHEET_ETAPAS, df, headers=headers)
+        """Substitui a aba pela lista, enviando só as linhas novas/alteradas/removidas."""
+        return self._save_rows(self.SHEET_ETAPAS, [self._etapa_record(e) for e in etapas])
+
+    def upsert_etapas(self, etapas: list[Etapa]) -> bool:
+        """Grava apenas as linhas das etapas informadas (insere as que ainda não existem)."""
+        records = [self._etapa_record(e) for e in etapas]
+        return self._upsert_rows(self.SHEET_ETAPAS, self.HEADERS_ETAPAS, records)
+
+    def upsert_etapa(self, etapa: Etapa) -> bool:
+        return self.upsert_etapas([etapa])
 
     def delete_etapa(self, etapa_id: str) -> bool:
-        etapas = [e for e in self.load_etapas() if getattr(e, "id", None) != etapa_id]
-        return self.save_etapas(etapas)
+        return self._delete_rows(self.SHEET_ETAPAS, [etapa_id])
 
     # ---- Demandas ----
 
     def load_demandas(self) -> list[Demanda]:
-        df = self._read_df(self.SHEET_DEMANDAS)
-        if df.empty:
-            return []
-        out: list[Demanda] = []
-        for _, row in df.iterrows():
-            data = row.to_dict()
-            out.append(Demanda.from_dict(data))
-        return out
+        return self._demandas_from_df(self._read_df(self.SHEET_DEMANDAS))
+
+    @staticmethod
+    def _demandas_from_df(df: pd.DataFrame) -> list[Demanda]:
+        return [Demanda.from_dict(data) for data in GoogleSheetsManager._model_records(df, Demanda)]
 
     def save_demandas(self, demandas: list[Demanda]) -> bool:
-        rows = []
-        for d in demandas:
-            row = d.to_dict() if hasattr(d, "to_dict") else asdict(d)
-            rows.append(row)
-        df = pd.DataFrame(rows)
-        headers = [
-            "id",
-            "titulo",
-            "descricao",
-            "projeto_id",
-            "status",
-            "prioridade",
-            "etapa_id",
-            "responsavel",
-            "data_inicio_plano",
-            "data_inicio_real",
-            "data_vencimento_plano",
-            "data_vencimento_real",
-            "data_vencimento",
-            "data_criacao",
-            "data_conclusao",
-            "percentual_completo",
-            "tags",
-            "comentarios",
-        ]
-        for h in headers:
-            if h not in df.columns:
-                df[h] = ""
-        df = df[headers]
-        return self._write_df(self.SHEET_DEMANDAS, df, headers=headers)
+        """Substitui a aba pela lista, enviando só as linhas novas/alteradas/removidas."""
+        return self._save_rows(self.SHEET_DEMANDAS, [self._demanda_record(d) for d in demandas])
+
+    def upsert_demandas(self, demandas: list[Demanda]) -> bool:
+        """Grava apenas as linhas das demandas informadas (insere as que ainda não existem)."""
+        records = [self._demanda_record(d) for d in demandas]
+        return self._upsert_rows(self.SHEET_DEMANDAS, self.HEADERS_DEMANDAS, records)
+
+    def upsert_demanda(self, demanda: Demanda) -> bool:
+        return self.upsert_demandas([demanda])
+
+    def delete_demandas(self, demanda_ids: list[str]) -> bool:
+        return self._delete_rows(self.SHEET_DEMANDAS, demanda_ids)
 
     def delete_demanda(self, demanda_id: str) -> bool:
-        demandas = [d for d in self.load_demandas() if getattr(d, "id", None) != demanda_id]
-        return self.save_demandas(demandas)
+        return self.delete_demandas([demanda_id])
 
     # ---- Limpeza ----
 
     def clear_core_data(self) -> bool:
-        self._write_df(self.SHEET_PROJETOS, pd.DataFrame(), headers=["id", "nome", "descricao", "status", "data_criacao", "data_conclusao", "responsavel"])
-        self._write_df(self.SHEET_ETAPAS, pd.DataFrame(), headers=["id", "nome", "descricao", "ordem", "data_criacao"])
-        self._write_df(
-            self.SHEET_DEMANDAS,
-            pd.DataFrame(),
-            headers=[
-                "id",
-                "titulo",
-                "descricao",
-                "projeto_id",
-                "status",
-                "prioridade",
-                "etapa_id",
-                "responsavel",
-                "data_inicio_plano",
-                "data_inicio_real",
-                "data_vencimento_plano",
-                "data_vencimento_real",
-                "data_vencimento",
-                "data_criacao",
-                "data_conclusao",
-                "percentual_completo",
-                "tags",
-                "comentarios",
-            ],
-        )
+        self._write_df(self.SHEET_PROJETOS, pd.DataFrame(), headers=self.HEADERS_PROJETOS)
+        self._write_df(self.SHEET_ETAPAS, pd.DataFrame(), headers=self.HEADERS_ETAPAS)
+        self._write_df(self.SHEET_DEMANDAS, pd.DataFrame(), headers=self.HEADERS_DEMANDAS)
         return True
 
     def clear_all(self) -> bool:
         self.clear_core_data()
-        self._write_df(self.SHEET_CHECKLIST_TOPICS, pd.DataFrame(), headers=["id", "nome", "created_at"])
-        self._write_df(self.SHEET_CHECKLIST_TASKS, pd.DataFrame(), headers=["id", "topic_id", "texto", "done", "created_at"])
+        self._write_df(self.SHEET_CHECKLIST_TOPICS, pd.DataFrame(), headers=self.HEADERS_CHECKLIST_TOPICS)
+        self._write_df(self.SHEET_CHECKLIST_TASKS, pd.DataFrame(), headers=self.HEADERS_CHECKLIST_TASKS)
         return True
 
     # ---- Checklist ----
 
     def load_checklist_topics(self) -> list[dict[str, Any]]:
-        df = self._read_df(self.SHEET_CHECKLIST_TOPICS)
+        return self._checklist_topics_from_df(self._read_df(self.SHEET_CHECKLIST_TOPICS))
+
+    @staticmethod
+    def _checklist_topics_from_df(df: pd.DataFrame) -> list[dict[str, Any]]:
         if df.empty:
             return []
-        out = []
-        for _, row in df.iterrows():
-            out.append({"id": row.get("id"), "nome": row.get("nome"), "created_at": row.get("created_at")})
-        return out
+        out = df.reindex(columns=["id", "nome", "created_at"]).astype(object)
+        return out.where(out.notna(), None).to_dict("records")
 
     def create_checklist_topic(self, nome: str) -> dict[str, Any]:
-        topics = self.load_checklist_topics()
         topic_id = f"topic_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
         item = {"id": topic_id, "nome": nome, "created_at": datetime.now().isoformat()}
-        topics.append(item)
-        df = pd.DataFrame(topics)
-        self._write_df(self.SHEET_CHECKLIST_TOPICS, df, headers=["id", "nome", "created_at"])
+        # Só a linha nova: `appendCells` (com a entrada do `_journal`) num único `spreadsheets.batchUpdate`
+        self._upsert_rows(self.SHEET_CHECKLIST_TOPICS, self.HEADERS_CHECKLIST_TOPICS, [item])
         return item
 
     def rename_checklist_topic(self, topic_id: str, new_name: str) -> bool:
-        topics = self.load_checklist_topics()
-        for t in topics:
-            if str(t.get("id")) == str(topic_id):
-                t["nome"] = new_name
-        df = pd.DataFrame(topics)
-        self._write_df(self.SHEET_CHECKLIST_TOPICS, df, headers=["id", "nome", "created_at"])
-        return True
+        # Só a célula `nome` da linha do tópico
+        return self._update_cells(self.SHEET_CHECKLIST_TOPICS, self.HEADERS_CHECKLIST_TOPICS, topic_id, {"nome": new_name})
 
     def load_checklist_tasks(self, topic_id: str) -> list[dict[str, Any]]:
         df = self._read_df(self.SHEET_CHECKLIST_TASKS)
         if df.empty:
             return []
-        df = df[df.get("topic_id") == topic_id]
-        out = []
-        for _, row in df.iterrows():
-            done_raw = row.get("done")
-            done = str(done_raw).lower() in ("1", "true", "yes", "sim")
-            out.append(
-                {
-                    "id": row.get("id"),
-                    "topic_id": row.get("topic_id"),
-                    "texto": row.get("texto"),
-                    "done": done,
-                    "created_at": row.get("created_at"),
-                }
-            )
-        return out
+        return self._checklist_tasks_from_df(df[df.get("topic_id") == topic_id])
 
-    def create_checklist_task(self, topic_id: str, texto: str) -> dict[str, Any]:
-        df = self._read_df(self.SHEET_CHECKLIST_TASKS)
+    def load_checklist_tasks_by_topic(self) -> dict[str, list[dict[str, Any]]]:
+        """Todas as tarefas agrupadas por `topic_id` (na ordem da aba), com uma única leitura."""
+        return self._group_tasks_by_topic(self._checklist_tasks_from_df(self._read_df(self.SHEET_CHECKLIST_TASKS)))
+
+    @staticmethod
+    def _group_tasks_by_topic(tasks: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for task in tasks:
+            grouped.setdefault(task.get("topic_id"), []).append(task)
+        return grouped
+
+    @staticmethod
+    def _checklist_tasks_from_df(df: pd.DataFrame) -> list[dict[str, Any]]:
         if df.empty:
-            df = pd.DataFrame(columns=["id", "topic_id", "texto", "done", "created_at"])
+            return []
+        out = df.reindex(columns=["id", "topic_id", "texto", "done", "created_at"]).astype(object)
+        out = out.where(out.notna(), None)
+        out["done"] = out["done"].astype(str).str.lower().isin(["1", "true", "yes", "sim"])
+        return out.to_dict("records")
+
+    def create_checklist_task(self, topic_id: str, texto: str) -> dict[str, Any]:
         task_id = f"task_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
         item = {
             "id": task_id,
@@ -424,25 +1530,19 @@ class GoogleSheetsManager:
             "done": False,
             "created_at": datetime.now().isoformat(),
         }
-        df = pd.concat([df, pd.DataFrame([item])], ignore_index=True)
-        self._write_df(self.SHEET_CHECKLIST_TASKS, df, headers=["id", "topic_id", "texto", "done", "created_at"])
+        # Só a linha nova: `appendCells` (com a entrada do `_journal`) num único `spreadsheets.batchUpdate`
+        self._upsert_rows(self.SHEET_CHECKLIST_TASKS, self.HEADERS_CHECKLIST_TASKS, [{**item, "done": "false"}])
         return item
 
     def set_checklist_task_done(self, task_id: str, done: bool) -> bool:
-        df = self._read_df(self.SHEET_CHECKLIST_TASKS)
-        if df.empty:
-            return True
-        df.loc[df["id"] == task_id, "done"] = "true" if done else "false"
-        self._write_df(self.SHEET_CHECKLIST_TASKS, df, headers=["id", "topic_id", "texto", "done", "created_at"])
-        return True
+        # Só a célula `done` da linha da tarefa
+        return self._update_cells(
+            self.SHEET_CHECKLIST_TASKS, self.HEADERS_CHECKLIST_TASKS, task_id, {"done": "true" if done else "false"}
+        )
 
     def delete_checklist_task(self, task_id: str) -> bool:
-        df = self._read_df(self.SHEET_CHECKLIST_TASKS)
-        if df.empty:
-            return True
-        df = df[df["id"] != task_id]
-        self._write_df(self.SHEET_CHECKLIST_TASKS, df, headers=["id", "topic_id", "texto", "done", "created_at"])
-        return True
+        # Só a linha da tarefa (deleteDimension)
+        return self._delete_rows(self.SHEET_CHECKLIST_TASKS, [task_id])
 
 
 def parse_spreadsheet_id(value: str) -> str:
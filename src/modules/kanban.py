@@ -1,6 +1,8 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 from typing import List, Optional, Callable
 from src.modules.models import Demanda, StatusEnum
+from src.modules.demanda_index import DemandaIndex
 
 class KanbanView:
     """Classe para gerenciar visualização Kanban interativa"""
@@ -16,7 +18,9 @@ class KanbanView:
         filtro_responsavel: Optional[str] = None,
         projetos: Optional[List] = None,
         etapas: Optional[List] = None,
-        on_edit_save: Optional[Callable] = None
+        on_edit_save: Optional[Callable] = None,
+        index: Optional[DemandaIndex] = None,
+        rerun_scope: str = "app"
     ):
         """
         Renderiza um kanban com colunas de status
@@ -28,24 +32,26 @@ class KanbanView:
             on_delete: Callback para deleção
             filtro_projeto: ID do projeto para filtrar
             filtro_responsavel: Nome do responsável para filtrar
+            index: Índice das demandas (montado aqui se não for informado)
+            rerun_scope: "fragment" quando o quadro roda dentro de um `st.fragment`: salvar a edição reexecuta
+                só o quadro, não o app inteiro
+
+        Editar, mudar status, deletar e cancelar usam `on_click`: o callback altera o estado antes da nova
+        execução (do quadro, se ele for um fragmento), que já desenha os cards atualizados.
         """
         
-        # Filtra demandas
-        demandas_filtradas = demandas
-        if filtro_projeto:
-            demandas_filtradas = [d for d in demandas_filtradas if d.projeto_id == filtro_projeto]
-        if filtro_etapa:
-            demandas_filtradas = [d for d in demandas_filtradas if getattr(d, 'etapa_id', None) == filtro_etapa]
-        if filtro_responsavel:
-            demandas_filtradas = [d for d in demandas_filtradas if d.responsavel == filtro_responsavel]
-        
-        # Agrupa demandas por status
+        # Filtra e agrupa por status consultando o índice (sem varrer a lista a cada filtro)
+        index = index if index is not None else DemandaIndex(demandas)
         status_list = [s.value for s in StatusEnum]
-        demandas_por_status = {status: [] for status in status_list}
-        
-        for demanda in demandas_filtradas:
-            if demanda.status in demandas_por_status:
-                demandas_por_status[demanda.status].append(demanda)
+        demandas_por_status = {
+            status: index.filter(
+                status=status,
+                projeto_id=filtro_projeto or None,
+                etapa_id=filtro_etapa or None,
+                responsavel=filtro_responsavel or None,
+            )
+            for status in status_list
+        }
         
         # Ensure projetos / etapas available
         projetos = projetos or st.session_state.get('projetos', [])
@@ -91,7 +97,8 @@ class KanbanView:
                                 on_edit,
                                 on_delete,
                                 status_list,
-                                projetos, etapas, on_edit_save
+                                projetos, etapas, on_edit_save,
+                                rerun_scope
                             )
     
     @staticmethod
@@ -103,7 +110,8 @@ class KanbanView:
         on_edit: Optional[Callable],
         on_delete: Optional[Callable],
         status_list: List[str]
-        , projetos: Optional[List] = None, etapas: Optional[List] = None, on_edit_save: Optional[Callable] = None):
+        , projetos: Optional[List] = None, etapas: Optional[List] = None, on_edit_save: Optional[Callable] = None,
+        rerun_scope: str = "app"):
         """Renderiza um card de demanda no kanban"""
         
         prioridade_cores = {
@@ -139,12 +147,12 @@ class KanbanView:
             col1, col2, col3 = st.columns([1, 1, 1])
             
             with col1:
-                if st.button("✏️ Editar", key=f"kanban_edit_{demanda.id}_{index}"):
-                    # Open inline Kanban edit (set flag)
-                    st.session_state[f"kanban_edit_dem_{demanda.id}"] = True
-                    if on_edit:
-                        on_edit(demanda)
-                    st.rerun()
+                st.button(
+                    "✏️ Editar",
+                    key=f"kanban_edit_{demanda.id}_{index}",
+                    on_click=KanbanView._open_edit,
+                    args=(demanda, on_edit),
+                )
             
             with col2:
                 # Dropdown para mudar status
@@ -156,15 +164,17 @@ class KanbanView:
                     label_visibility="collapsed"
                 )
                 
-                if novo_status != demanda.status:
-                    if st.button("✓ Atualizar", key=f"kanban_confirm_{demanda.id}_{index}"):
-                        if on_status_change:
-                            on_status_change(demanda, novo_status)
+                if novo_status != demanda.status and on_status_change:
+                    st.button(
+                        "✓ Atualizar",
+                        key=f"kanban_confirm_{demanda.id}_{index}",
+                        on_click=on_status_change,
+                        args=(demanda, novo_status),
+                    )
             
             with col3:
-                if st.button("🗑️ Deletar", key=f"kanban_delete_{demanda.id}_{index}"):
-                    if on_delete:
-                        on_delete(demanda)
+                if on_delete:
+                    st.button("🗑️ Deletar", key=f"kanban_delete_{demanda.id}_{index}", on_click=on_delete, args=(demanda,))
 
             # If flag set, render inline edit form
             # IMPORTANTE: o formulário usa st.columns internamente; por isso ele NÃO pode ficar dentro de um `with colX:`
@@ -185,34 +195,59 @@ class KanbanView:
 
                     btn_save_col, btn_cancel_col = st.columns([1, 1])
                     with btn_save_col:
+                        # Sem `on_click`: os valores do formulário só existem depois que os campos rodaram
                         if st.button("💾 Salvar", key=f"kanban_save_{demanda.id}_{index}"):
                             if on_edit_save:
                                 on_edit_save(demanda.id, form_data)
                             st.session_state[f"kanban_edit_dem_{demanda.id}"] = False
-                            st.rerun()
+                            KanbanView._rerun(rerun_scope)
                     with btn_cancel_col:
-                        if st.button("✖️ Cancelar", key=f"kanban_cancel_{demanda.id}_{index}"):
-                            st.session_state[f"kanban_edit_dem_{demanda.id}"] = False
-                            st.rerun()
+                        st.button(
+                            "✖️ Cancelar",
+                            key=f"kanban_cancel_{demanda.id}_{index}",
+                            on_click=KanbanView._close_edit,
+                            args=(demanda.id,),
+                        )
                 except Exception as err:
                     st.error(f"Erro ao exibir o formulário de edição no Kanban: {err}")
 
+    @staticmethod
+    def _open_edit(demanda: Demanda, on_edit: Optional[Callable]):
+        st.session_state[f"kanban_edit_dem_{demanda.id}"] = True
+        if on_edit:
+            on_edit(demanda)
+
+    @staticmethod
+    def _close_edit(demanda_id: str):
+        st.session_state[f"kanban_edit_dem_{demanda_id}"] = False
+
+    @staticmethod
+    def _rerun(scope: str):
+        # O Streamlit só aceita scope="fragment" numa execução do próprio fragmento (não na do app inteiro)
+        try:
+            st.rerun(scope=scope)
+        except StreamlitAPIException:
+            st.rerun()
+
 class DashboardMetrics:
     """Classe para exibir métricas do dashboard"""
     
     @staticmethod
-    def render_metrics(projetos: List, demandas: List[Demanda]):
+    def render_metrics(projetos: List, demandas: List[Demanda], index: Optional[DemandaIndex] = None):
         """Renderiza métricas resumidas"""
         
         st.markdown("---")
         st.subheader("📊 Métricas do Dashboard")
         
-        # Calcula métricas
+        # Calcula métricas (contagens por grupo vêm prontas do índice)
+        index = index if index is not None else DemandaIndex(demandas)
+        status_counts = index.counts("status")
+        prioridade_counts = index.counts("prioridade")
         total_projetos = len(projetos)
         total_demandas = len(demandas)
-        demandas_concluidas = len([d for d in demandas if d.status == "Concluído"])
-        demandas_urgentes = len([d for d in demandas if d.prioridade == "Urgente"])
-        demandas_em_progresso = len([d for d in demandas if d.status == "Em Progresso"])
+        demandas_concluidas = status_counts.get("Concluído", 0)
+        demandas_urgentes = prioridade_counts.get("Urgente", 0)
+        demandas_em_progresso = status_counts.get("Em Progresso", 0)
         taxa_conclusao = (demandas_concluidas / total_demandas * 100) if total_demandas > 0 else 0
         
         # Exibe métricas em cards
@@ -235,20 +270,12 @@ class DashboardMetrics:
         
         with col1:
             # Gráfico de status
-            status_counts = {}
-            for d in demandas:
-                status_counts[d.status] = status_counts.get(d.status, 0) + 1
-            
             if status_counts:
                 st.bar_chart(status_counts)
                 st.caption("Demandas por Status")
         
         with col2:
             # Gráfico de prioridade
-            prioridade_counts = {}
-            for d in demandas:
-                prioridade_counts[d.prioridade] = prioridade_counts.get(d.prioridade, 0) + 1
-            
             if prioridade_counts:
                 st.bar_chart(prioridade_counts)
                 st.caption("Demandas por Prioridade")
@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from typing import List, Optional
@@ -17,7 +18,19 @@ class PriorityEnum(str, Enum):
     ALTA = "Alta"
     URGENTE = "Urgente"
 
-@dataclass
+
+def _intern_fields(obj, names):
+    """Interna campos de texto de baixa cardinalidade (status, ids, datas...).
+
+    Cada célula lida da planilha/banco vira um `str` novo; com milhares de demandas, o mesmo
+    "Em Progresso" ou "2025-03-01" ficaria repetido na memória da sessão. Internado, vira um objeto só.
+    """
+    for name in names:
+        value = getattr(obj, name)
+        if type(value) is str:
+            setattr(obj, name, sys.intern(value))
+
+@dataclass(slots=True)
 class Etapa:
     """Modelo para etapas de um projeto"""
     id: str
@@ -33,7 +46,7 @@ class Etapa:
     def from_dict(cls, data):
         return cls(**data)
 
-@dataclass
+@dataclass(slots=True)
 class Demanda:
     """Modelo para demandas de projeto"""
     id: str
@@ -54,6 +67,24 @@ class Demanda:
     percentual_completo: int = 0  # 0-100
     tags: List[str] = field(default_factory=list)
     comentarios: List[str] = field(default_factory=list)
+
+    # Campos com poucos valores distintos: compartilhados entre instâncias (ver _intern_fields)
+    _INTERNED = (
+        "status",
+        "prioridade",
+        "projeto_id",
+        "etapa_id",
+        "responsavel",
+        "data_inicio_plano",
+        "data_inicio_real",
+        "data_vencimento_plano",
+        "data_vencimento_real",
+        "data_vencimento",
+        "data_conclusao",
+    )
+
+    def __post_init__(self):
+        _intern_fields(self, self._INTERNED)
     
     def to_dict(self):
         data = asdict(self)
@@ -68,7 +99,7 @@ class Demanda:
             data['comentarios'] = []
         return cls(**data)
 
-@dataclass
+@dataclass(slots=True)
 class Projeto:
     """Modelo para projetos"""
     id: str
@@ -80,6 +111,9 @@ class Projeto:
     responsavel: Optional[str] = None
     etapas: List[Etapa] = field(default_factory=list)
     demandas: List[Demanda] = field(default_factory=list)
+
+    def __post_init__(self):
+        _intern_fields(self, ("status", "responsavel"))
     
     def to_dict(self):
         data = asdict(self)
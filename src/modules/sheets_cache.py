@@ -0,0 +1,122 @@
+import threading
+import time
+from typing import Any, Optional
+
+
+class SheetsReadCache:
+    """Cache de leitura compartilhado pelo processo (todas as sessões do Streamlit).
+
+    Guarda o snapshot bruto (`get_all_values()`) de cada aba, indexado por (spreadsheet_id, aba), junto com
+    o marcador de versão da aba no momento do download. Cada entrada vale por `ttl_seconds`; depois disso
+    ela continua guardada e pode ser revalidada (`touch`) se a versão da aba não mudou, sem baixar de novo.
+    Escritas feitas pelo manager invalidam a aba na hora. O snapshot é compartilhado: quem lê não deve
+    alterar as listas devolvidas.
+
+    Cada aba tem também uma "geração", incrementada a cada invalidação. O manager a usa para saber
+    se outra sessão escreveu na aba desde que ele montou o índice id -> linha.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = float(ttl_seconds)
+        self._lock = threading.Lock()
+        # (spreadsheet_id, aba) -> [baixado_em, valores, versão]
+        self._entries: dict[tuple[str, str], list[Any]] = {}
+        self._generations: dict[tuple[str, str], int] = {}
+        # spreadsheet_id -> (lido_em, {aba: versão}) — conteúdo da aba `_meta`
+        self._versions: dict[str, tuple[float, dict[str, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    def get(self, spreadsheet_id: str, title: str) -> Optional[list[list[Any]]]:
+        """Snapshot da aba se ainda estiver dentro da validade; senão None."""
+        with self._lock:
+            entry = self._entries.get((spreadsheet_id, title))
+            if entry is not None and (time.monotonic() - entry[0]) < self.ttl_seconds:
+                self.hits += 1
+                return entry[1]
+            return None
+
+    def peek(self, spreadsheet_id: str, title: str) -> Optional[tuple[list[list[Any]], Optional[str]]]:
+        """(valores, versão) guardados para a aba, mesmo que vencidos."""
+        with self._lock:
+            entry = self._entries.get((spreadsheet_id, title))
+            return (entry[1], entry[2]) if entry is not None else None
+
+    def put(self, spreadsheet_id: str, title: str, values: list[list[Any]], version: Optional[str] = None):
+        with self._lock:
+            self._entries[(spreadsheet_id, title)] = [time.monotonic(), values, version]
+            self.misses += 1
+
+    def touch(self, spreadsheet_id: str, title: str):
+        """Renova a validade de uma entrada cuja versão foi confirmada como inalterada."""
+        with self._lock:
+            entry = self._entries.get((spreadsheet_id, title))
+            if entry is not None:
+                entry[0] = time.monotonic()
+                self.revalidations += 1
+
+    def expire(self, spreadsheet_id: str):
+        """Vence as entradas da planilha sem descartá-las: a próxima leitura confere a versão antes de baixar."""
+        with self._lock:
+            for key, entry in self._entries.items():
+                if key[0] == spreadsheet_id:
+                    entry[0] = float("-inf")
+            self._versions.pop(spreadsheet_id, None)
+
+    def invalidate(self, spreadsheet_id: str, title: Optional[str] = None) -> int:
+        """Descarta a aba (ou a planilha inteira, se `title` for None). Retorna a nova geração da aba."""
+        with self._lock:
+            if title is None:
+                keys = [k for k in self._entries if k[0] == spreadsheet_id]
+                keys += [k for k in self._generations if k[0] == spreadsheet_id and k not in keys]
+            else:
+                keys = [(spreadsheet_id, title)]
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._versions.pop(spreadsheet_id, None)
+            self.invalidations += 1
+            return self._generations.get((spreadsheet_id, title), 0) if title is not None else 0
+
+    def generation(self, spreadsheet_id: str, title: str) -> int:
+        with self._lock:
+            return self._generations.get((spreadsheet_id, title), 0)
+
+    def versions(self, spreadsheet_id: str, max_age: float) -> Optional[dict[str, str]]:
+        """Versões por aba lidas há menos de `max_age` segundos (ou None)."""
+        with self._lock:
+            entry = self._versions.get(spreadsheet_id)
+            if entry is not None and (time.monotonic() - entry[0]) < max_age:
+                return entry[1]
+            return None
+
+    def put_versions(self, spreadsheet_id: str, versions: dict[str, str]):
+        with self._lock:
+            self._versions[spreadsheet_id] = (time.monotonic(), dict(versions))
+
+    def clear(self):
+        with self._lock:
+            for key in self._entries:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            served = self.hits + self.revalidations
+            total = served + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "hit_rate": (served / total) if total else 0.0,
+                "invalidations": self.invalidations,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# Instância única do processo: compartilhada por todos os GoogleSheetsManager (uma por sessão)
+shared_read_cache = SheetsReadCache()
@@ -0,0 +1,137 @@
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+
+class SheetsClientPool:
+    """Clientes gspread autorizados e handles de planilha compartilhados pelo processo (todas as sessões).
+
+    Cada sessão do Streamlit cria seu próprio manager; sem o pool, cada uma montaria as credenciais,
+    pediria um token novo e abriria outro pool de conexões TLS. Aqui há um cliente por service account
+    (e-mail + chave) e um handle por (service account, planilha), criados uma vez e reaproveitados.
+
+    O token é renovado de forma centralizada: ao entregar o cliente, se faltar menos de
+    `REFRESH_MARGIN_SECONDS` para expirar, uma única thread o renova enquanto as demais esperam.
+    """
+
+    SCOPES = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive",
+    ]
+    REFRESH_MARGIN_SECONDS = 300.0
+    # Conexões HTTP mantidas abertas por host (várias sessões chamando a API ao mesmo tempo)
+    POOL_MAXSIZE = 32
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # chave do service account -> [cliente, credenciais, lock de renovação]
+        self._clients: dict[str, list[Any]] = {}
+        # (chave do service account, spreadsheet_id) -> handle da planilha
+        self._spreadsheets: dict[tuple[str, str], Any] = {}
+        self.clients_created = 0
+        self.spreadsheets_opened = 0
+        self.reuses = 0
+        self.refreshes = 0
+
+    @staticmethod
+    def account_key(service_account_info: dict[str, Any]) -> str:
+        """E-mail do service account + digest da chave (trocar a chave gera outro cliente)."""
+        email = str(service_account_info.get("client_email", ""))
+        key_id = str(service_account_info.get("private_key_id") or service_account_info.get("private_key", ""))
+        return email + "#" + hashlib.sha256(key_id.encode("utf-8")).hexdigest()[:12]
+
+    def _authorize(self, service_account_info: dict[str, Any]) -> tuple[Any, Any]:
+        try:
+            import gspread
+            from google.oauth2.service_account import Credentials
+        except Exception as e:
+            raise RuntimeError(
+                "Dependências Google Sheets não instaladas. Garanta gspread e google-auth no requirements.txt. Erro: "
+                + str(e)
+            )
+
+        creds = Credentials.from_service_account_info(service_account_info, scopes=self.SCOPES)
+        client = gspread.authorize(creds)
+        try:
+            from requests.adapters import HTTPAdapter
+
+            client.http_client.session.mount("https://", HTTPAdapter(pool_maxsize=self.POOL_MAXSIZE))
+        except Exception:
+            pass  # mantém o adaptador padrão do requests
+        return client, creds
+
+    @classmethod
+    def _expiring(cls, creds: Any) -> bool:
+        if not getattr(creds, "token", None):
+            return True
+        expiry = getattr(creds, "expiry", None)
+        if expiry is None:
+            return False
+        # `expiry` do google-auth é um datetime UTC sem fuso
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (expiry - now).total_seconds() < cls.REFRESH_MARGIN_SECONDS
+
+    def _refresh_if_needed(self, entry: list[Any]):
+        _, creds, refresh_lock = entry
+        if not self._expiring(creds):
+            return
+        with refresh_lock:
+            if not self._expiring(creds):
+                return  # outra sessão renovou enquanto esta esperava
+            try:
+                from google.auth.transport.requests import Request
+
+                creds.refresh(Request())
+            except Exception:
+                return  # o próprio cliente tenta renovar na próxima chamada
+            self.refreshes += 1
+
+    def client(self, service_account_info: dict[str, Any]) -> Any:
+        key = self.account_key(service_account_info)
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is None:
+                client, creds = self._authorize(service_account_info)
+                entry = self._clients[key] = [client, creds, threading.Lock()]
+                self.clients_created += 1
+            else:
+                self.reuses += 1
+        self._refresh_if_needed(entry)
+        return entry[0]
+
+    def spreadsheet(
+        self,
+        service_account_info: dict[str, Any],
+        spreadsheet_id: str,
+        open_spreadsheet: Callable[[Any], Any],
+    ) -> Any:
+        """Handle da planilha; `open_spreadsheet(cliente)` só é chamado na primeira vez."""
+        key = (self.account_key(service_account_info), str(spreadsheet_id))
+        client = self.client(service_account_info)
+        with self._lock:
+            handle = self._spreadsheets.get(key)
+        if handle is not None:
+            return handle
+        handle = open_spreadsheet(client)
+        with self._lock:
+            # Duas sessões abrindo ao mesmo tempo: fica o primeiro handle
+            if key not in self._spreadsheets:
+                self._spreadsheets[key] = handle
+                self.spreadsheets_opened += 1
+            return self._spreadsheets[key]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "spreadsheets": len(self._spreadsheets),
+                "clients_created": self.clients_created,
+                "spreadsheets_opened": self.spreadsheets_opened,
+                "reuses": self.reuses,
+                "refreshes": self.refreshes,
+            }
+
+
+# Instância do processo, como `shared_read_cache`
+shared_client_pool = SheetsClientPool()
@@ -0,0 +1,179 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+class TokenBucket:
+    """Balde de fichas: `rate` fichas por segundo, acumulando no máximo `capacity` (rajada)."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = max(float(per_minute), 1.0) / 60.0
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate * 10)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Consome uma ficha e devolve quantos segundos esperar até ela existir (0 se já havia).
+
+        O saldo pode ficar negativo: chamadas simultâneas fazem fila, cada uma com sua espera.
+        Quem chama deve segurar um lock.
+        """
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1.0
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RequestGovernor:
+    """Controle das chamadas à API do Google Planilhas, compartilhado pelo processo (todas as sessões).
+
+    - Limita o ritmo com um balde de fichas para leituras e outro para escritas, ajustados à cota da API
+      (por padrão 60 leituras e 60 escritas por minuto, a cota por usuário do service account).
+    - Repete com backoff exponencial e jitter as chamadas recusadas por cota (429) ou falha do servidor (5xx);
+      falhas 5xx só são repetidas em chamadas idempotentes, já que a primeira tentativa pode ter sido aplicada.
+    - Guarda métricas (chamadas no último minuto, esperas por limite, repetições) para a aba Configurações.
+    """
+
+    READS_PER_MINUTE = 60
+    WRITES_PER_MINUTE = 60
+    MAX_RETRIES = 5
+    BASE_DELAY_SECONDS = 1.0
+    MAX_DELAY_SECONDS = 32.0
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    # Métodos de leitura do gspread (o resto conta como escrita)
+    READ_METHODS = frozenset(
+        {"get_all_values", "get_values", "get", "row_values", "col_values", "values_batch_get", "batch_get",
+         "worksheets", "worksheet", "fetch_sheet_metadata", "open_by_key"}
+    )
+    # Escritas que não podem ser repetidas às cegas após 5xx (acrescentam/removem linhas ou abas)
+    NON_IDEMPOTENT = frozenset(
+        {"spreadsheet.batch_update", "spreadsheet.add_worksheet", "worksheet.append_rows", "worksheet.append_row",
+         "worksheet.add_cols", "worksheet.add_rows", "worksheet.insert_rows", "worksheet.delete_rows"}
+    )
+    # Métodos que devolvem abas: o resultado também passa pelo controle
+    WORKSHEET_RESULTS = frozenset({"worksheets", "worksheet", "add_worksheet"})
+
+    def __init__(
+        self,
+        reads_per_minute: float = READS_PER_MINUTE,
+        writes_per_minute: float = WRITES_PER_MINUTE,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._lock = threading.Lock()
+        self._sleep = sleep
+        self.configure(reads_per_minute, writes_per_minute)
+        self._recent: deque[float] = deque()
+        self.calls = {"read": 0, "write": 0}
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+        self.failures = 0
+
+    def configure(self, reads_per_minute: float, writes_per_minute: float):
+        with self._lock:
+            self.reads_per_minute = float(reads_per_minute)
+            self.writes_per_minute = float(writes_per_minute)
+            self._buckets = {"read": TokenBucket(reads_per_minute), "write": TokenBucket(writes_per_minute)}
+
+    @staticmethod
+    def status_code(error: BaseException) -> Optional[int]:
+        code = getattr(getattr(error, "response", None), "status_code", None)
+        if code is None:
+            code = getattr(error, "code", None)
+        try:
+            return int(code) if code is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": espalha as novas tentativas de várias sessões em vez de sincronizá-las
+        return random.uniform(0, min(self.MAX_DELAY_SECONDS, self.BASE_DELAY_SECONDS * (2 ** attempt)))
+
+    def _acquire(self, kind: str):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._buckets[kind].reserve(now)
+            self.calls[kind] += 1
+            self._recent.append(now + wait)
+            if wait > 0:
+                self.throttled += 1
+                self.throttled_seconds += wait
+        if wait > 0:
+            self._sleep(wait)
+
+    def call(self, kind: str, fn: Callable[..., Any], *args, idempotent: bool = True, **kwargs) -> Any:
+        """Executa `fn(*args, **kwargs)` respeitando o ritmo de `kind` ("read"/"write") e repetindo se couber."""
+        attempt = 0
+        while True:
+            self._acquire(kind)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                code = self.status_code(e)
+                retry = code in self.RETRY_STATUS and (code == 429 or idempotent)
+                if not retry or attempt >= self.MAX_RETRIES:
+                    if code in self.RETRY_STATUS:
+                        with self._lock:
+                            self.failures += 1
+                    raise
+                with self._lock:
+                    self.retries += 1
+                self._sleep(self._backoff(attempt))
+                attempt += 1
+
+    def wrap(self, target: Any, label: str = "spreadsheet") -> "GovernedProxy":
+        return GovernedProxy(target, self, label)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            cutoff = time.monotonic() - 60.0
+            while self._recent and self._recent[0] < cutoff:
+                self._recent.popleft()
+            return {
+                "calls_last_minute": len(self._recent),
+                "reads": self.calls["read"],
+                "writes": self.calls["write"],
+                "throttled": self.throttled,
+                "throttled_seconds": self.throttled_seconds,
+                "retries": self.retries,
+                "failures": self.failures,
+                "reads_per_minute": self.reads_per_minute,
+                "writes_per_minute": self.writes_per_minute,
+            }
+
+
+class GovernedProxy:
+    """Planilha/aba do gspread em que toda chamada de método passa pelo `RequestGovernor`.
+
+    Atributos simples (`id`, `title`, `col_count`, ...) são lidos direto do objeto original.
+    """
+
+    def __init__(self, target: Any, governor: RequestGovernor, label: str):
+        self._target = target
+        self._governor = governor
+        self._label = label
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        governor = self._governor
+        kind = "read" if name in governor.READ_METHODS else "write"
+        idempotent = f"{self._label}.{name}" not in governor.NON_IDEMPOTENT
+
+        def _governed(*args, **kwargs):
+            result = governor.call(kind, attr, *args, idempotent=idempotent, **kwargs)
+            if name in governor.WORKSHEET_RESULTS:
+                if isinstance(result, list):
+                    return [governor.wrap(ws, "worksheet") for ws in result]
+                return governor.wrap(result, "worksheet")
+            return result
+
+        return _governed
+
+
+# Instância do processo: a cota da API é do service account, não de cada sessão
+shared_governor = RequestGovernor()
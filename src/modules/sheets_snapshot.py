@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+
+class SheetsSnapshotStore:
+    """Último snapshot conhecido de cada aba, gravado num arquivo SQLite local (um por processo).
+
+    Serve as partidas a frio: quando o processo reinicia, o cache em memória está vazio e o primeiro
+    usuário esperaria o download de todas as abas. Com o snapshot em disco, o manager entrega na hora o
+    que foi visto por último (com o marcador de versão da aba) e revalida em segundo plano
+    (stale-while-revalidate). Snapshots mais velhos que `max_age_seconds` não são servidos;
+    `max_age_seconds=0` desliga o recurso. Falhas de disco nunca quebram a leitura: o snapshot é só um atalho.
+    """
+
+    DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "appprojetos_sheets_snapshot.db")
+
+    def __init__(self, path: Optional[str] = None, max_age_seconds: float = 86400.0):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.path = path or self.DEFAULT_PATH
+        self.max_age_seconds = float(max_age_seconds)
+        self.saves = 0
+        self.served = 0
+        self.revalidated_unchanged = 0
+        self.revalidated_changed = 0
+        self.last_served_age: Optional[float] = None
+        # (spreadsheet_id, aba) servida do disco -> "pending" (revalidando), "changed" ou "unchanged"
+        self._state: dict[tuple[str, str], str] = {}
+
+    def configure(self, path: Optional[str] = None, max_age_seconds: Optional[float] = None):
+        with self._lock:
+            if path and path != self.path:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                self.path = path
+            if max_age_seconds is not None:
+                self.max_age_seconds = float(max_age_seconds)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_seconds > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            folder = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    spreadsheet_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    version TEXT,
+                    saved_at REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (spreadsheet_id, title)
+                )
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def save(self, spreadsheet_id: str, title: str, values: list[list[Any]], version: Optional[str]):
+        if not self.enabled:
+            return
+        payload = json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "INSERT INTO snapshots (spreadsheet_id, title, version, saved_at, payload) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (spreadsheet_id, title) DO UPDATE SET "
+                    "version = excluded.version, saved_at = excluded.saved_at, payload = excluded.payload",
+                    (str(spreadsheet_id), title, version, time.time(), payload),
+                )
+                self.saves += 1
+        except (sqlite3.Error, OSError):
+            pass
+
+    def load(self, spreadsheet_id: str, titles: list[str]) -> dict[str, tuple[list[list[Any]], Optional[str]]]:
+        """Snapshots ainda dentro de `max_age_seconds`: {aba: (valores, versão)}."""
+        if not self.enabled or not titles:
+            return {}
+        marks = ", ".join("?" for _ in titles)
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT title, version, saved_at, payload FROM snapshots WHERE spreadsheet_id = ? AND title IN ({marks})",
+                    (str(spreadsheet_id), *titles),
+                ).fetchall()
+        except (sqlite3.Error, OSError):
+            return {}
+
+        now = time.time()
+        out: dict[str, tuple[list[list[Any]], Optional[str]]] = {}
+        ages = []
+        for title, version, saved_at, payload in rows:
+            age = now - saved_at
+            if age > self.max_age_seconds:
+                continue
+            try:
+                out[title] = (json.loads(payload), version)
+            except ValueError:
+                continue
+            ages.append(age)
+        if out:
+            self.served += 1
+            self.last_served_age = max(ages)
+        return out
+
+    # ---- Estado da revalidação (compartilhado: outras sessões podem ter recebido o mesmo snapshot) ----
+
+    def mark_pending(self, spreadsheet_id: str, titles: list[str]):
+        with self._lock:
+            for title in titles:
+                self._state[(str(spreadsheet_id), title)] = "pending"
+
+    def resolve(self, spreadsheet_id: str, title: str, changed: bool):
+        with self._lock:
+            self._state[(str(spreadsheet_id), title)] = "changed" if changed else "unchanged"
+            if changed:
+                self.revalidated_changed += 1
+            else:
+                self.revalidated_unchanged += 1
+
+    def state(self, spreadsheet_id: str, title: str) -> Optional[str]:
+        with self._lock:
+            return self._state.get((str(spreadsheet_id), title))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            pending = sum(1 for v in self._state.values() if v == "pending")
+        return {
+            "revalidating": pending,
+            "enabled": self.enabled,
+            "path": self.path,
+            "max_age_seconds": self.max_age_seconds,
+            "saves": self.saves,
+            "served": self.served,
+            "last_served_age": self.last_served_age,
+            "revalidated_unchanged": self.revalidated_unchanged,
+            "revalidated_changed": self.revalidated_changed,
+        }
+
+
+# Instância do processo, como `shared_read_cache` (caminho e idade máxima ajustados pelo app)
+shared_snapshot_store = SheetsSnapshotStore()
@@ -0,0 +1,320 @@
+import functools
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from src.modules.models import Projeto, Demanda, Etapa
+from src.modules.storage_backend import UnitOfWork, WriteConflictError
+
+
+class WriteBehindManager:
+    """Camada write-behind em volta do GoogleSheetsManager.
+
+    As escritas de projetos/etapas/demandas (`upsert_*`, `delete_*`, `save_*`) entram numa fila em memória,
+    coalescida por (entidade, id): várias mudanças na mesma demanda dentro da janela viram uma única linha.
+    Uma thread em segundo plano descarrega a fila em lote após `flush_interval` segundos, de modo que o
+    script do Streamlit não espera o round-trip do Google a cada clique.
+
+    A fila só é gravada de forma síncrona (dentro do rerun) por `flush()` explícito, pelas leituras completas
+    (`load_*` e `load_all`, que descarregam antes para a sessão ler as próprias escritas) e pelas unidades
+    de trabalho (`unit_of_work`), que não passam pela fila: descarregam-na e são gravadas na hora, de uma
+    vez, sem inverter a ordem das escritas. A limpeza (`clear_*`) descarta a fila sem gravá-la.
+    `pull_changes()`, chamado a cada rerun, nunca descarrega: com escrita pendente devolve um resultado vazio
+    e a thread grava a fila; o pull volta a consultar o journal num rerun seguinte, com a fila vazia.
+    Os demais métodos (check-list, health_check, ...) são repassados ao manager original.
+
+    Linhas recusadas por conflito de revisão (outra sessão alterou antes) não voltam para a fila: ficam em
+    `conflicts` e em `last_error` até o próximo lote, para a sessão recarregar os dados.
+    """
+
+    ENTITY_PROJETOS = "projetos"
+    ENTITY_ETAPAS = "etapas"
+    ENTITY_DEMANDAS = "demandas"
+
+    # Espera extra depois de uma falha, para não martelar a API enquanto ela está indisponível
+    RETRY_DELAY_SECONDS = 5.0
+
+    def __init__(self, manager, flush_interval: float = 0.5):
+        self._manager = manager
+        self.flush_interval = float(flush_interval)
+
+        self._lock = threading.RLock()  # protege a fila
+        self._io_lock = threading.RLock()  # serializa chamadas ao manager (script x thread de flush)
+        # (entidade, id) -> ("upsert", objeto) | ("delete", None) | ("cascade", None); dict preserva a ordem de chegada
+        self._pending: dict[tuple[str, str], tuple[str, Any]] = {}
+        # entidade -> lista completa enviada por save_* (substitui a aba inteira)
+        self._replace: dict[str, list] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+        self.last_error: Optional[str] = None
+        self.conflicts: list[tuple[str, str, Optional[int], Optional[int]]] = []
+        self.last_flush_at: Optional[str] = None
+        self.flush_count = 0
+        self.rows_flushed = 0
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._manager, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def _locked(*args, **kwargs):
+            with self._io_lock:
+                return attr(*args, **kwargs)
+
+        return _locked
+
+    # ------------------------- Fila -------------------------
+
+    def _enqueue(self, entity: str, op: str, item_id: str, obj: Any = None):
+        with self._lock:
+            key = (entity, str(item_id))
+            # Reinsere no fim para manter a ordem da última mudança
+            self._pending.pop(key, None)
+            self._pending[key] = (op, obj)
+        self._ensure_worker()
+
+    def _enqueue_replace(self, entity: str, items: list):
+        with self._lock:
+            # A lista completa substitui qualquer mudança pendente por linha da mesma entidade
+            for key in [k for k in self._pending if k[0] == entity]:
+                del self._pending[key]
+            self._replace[entity] = list(items)
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        self._wake.set()
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="sheets-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        # A thread só vive enquanto houver fila: encerra sozinha quando tudo foi gravado
+        while True:
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            time.sleep(self.flush_interval)  # janela de coalescência
+            ok = self.flush()
+            with self._lock:
+                if not self._pending and not self._replace:
+                    self._thread = None
+                    return
+            if not ok:
+                time.sleep(self.RETRY_DELAY_SECONDS)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending) + sum(len(v) for v in self._replace.values())
+
+    def flush(self) -> bool:
+        """Grava agora tudo que está pendente. Retorna False (e guarda `last_error`) se alguma escrita falhar."""
+        with self._io_lock:
+            with self._lock:
+                pending = self._pending
+                replace = self._replace
+                self._pending = {}
+                self._replace = {}
+            if not pending and not replace:
+                return True
+
+            try:
+                rows, conflicts = self._apply(pending, replace)
+            except Exception as e:
+                self._requeue(pending, replace)
+                self.last_error = str(e)
+                return False
+
+            # Regravar as linhas em conflito sobrescreveria a alteração da outra sessão: só registra
+            self.conflicts = conflicts
+            self.last_error = str(WriteConflictError(conflicts)) if conflicts else None
+            self.last_flush_at = datetime.now().isoformat(timespec="seconds")
+            self.flush_count += 1
+            self.rows_flushed += rows
+            return not conflicts
+
+    def _requeue(self, pending: dict, replace: dict):
+        with self._lock:
+            for entity, items in replace.items():
+                self._replace.setdefault(entity, items)
+            for key, value in pending.items():
+                # Mudanças que chegaram durante o flush são mais novas: prevalecem
+                if key not in self._pending and key[0] not in self._replace:
+                    self._pending[key] = value
+
+    def _apply(self, pending: dict, replace: dict) -> tuple[int, list]:
+        m = self._manager
+        writers = {
+            self.ENTITY_PROJETOS: (m.save_projetos, m.upsert_projetos, lambda ids: [m.delete_projeto(i) for i in ids]),
+            self.ENTITY_ETAPAS: (m.save_etapas, m.upsert_etapas, lambda ids: [m.delete_etapa(i) for i in ids]),
+            self.ENTITY_DEMANDAS: (m.save_demandas, m.upsert_demandas, m.delete_demandas),
+        }
+
+        rows = 0
+        conflicts: list[tuple[str, str, Optional[int], Optional[int]]] = []
+        # Projeto removido em cascata: projeto + demandas numa chamada só, antes das demais escritas
+        for (entity, item_id), (op, _) in pending.items():
+            if entity == self.ENTITY_PROJETOS and op == "cascade":
+                m.delete_projeto_cascade(item_id)
+                rows += 1
+        for entity, (save_all, upsert_many, delete_many) in writers.items():
+            if entity in replace:
+                save_all(replace[entity])
+                rows += len(replace[entity])
+
+            upserts = [obj for (ent, _), (op, obj) in pending.items() if ent == entity and op == "upsert"]
+            deletes = [item_id for (ent, item_id), (op, _) in pending.items() if ent == entity and op == "delete"]
+            if deletes:
+                delete_many(deletes)
+                rows += len(deletes)
+            if upserts:
+                try:
+                    upsert_many(upserts)
+                except WriteConflictError as e:
+                    conflicts.extend(e.conflicts)
+                rows += len(upserts)
+        rows -= len(conflicts)
+        return rows, conflicts
+
+    def status(self) -> dict[str, Any]:
+        """Estado da sincronização para exibir na aba Configurações."""
+        with self._lock:
+            syncing = self._thread is not None and self._thread.is_alive()
+        return {
+            "pending": self.pending_count(),
+            "syncing": syncing,
+            "last_error": self.last_error,
+            "conflicts": len(self.conflicts),
+            "last_flush_at": self.last_flush_at,
+            "flush_count": self.flush_count,
+            "rows_flushed": self.rows_flushed,
+        }
+
+    # ------------------------- Escritas (enfileiradas) -------------------------
+
+    def save_projetos(self, projetos: list[Projeto]) -> bool:
+        self._enqueue_replace(self.ENTITY_PROJETOS, projetos)
+        return True
+
+    def upsert_projetos(self, projetos: list[Projeto]) -> bool:
+        for p in projetos:
+            self._enqueue(self.ENTITY_PROJETOS, "upsert", p.id, p)
+        return True
+
+    def upsert_projeto(self, projeto: Projeto) -> bool:
+        return self.upsert_projetos([projeto])
+
+    def delete_projeto(self, projeto_id: str) -> bool:
+        self._enqueue(self.ENTITY_PROJETOS, "delete", projeto_id)
+        return True
+
+    def delete_projeto_cascade(self, projeto_id: str) -> bool:
+        with self._lock:
+            # Mudanças pendentes nas demandas do projeto perdem o sentido: a cascata apaga todas
+            for key in [
+                k for k, (op, obj) in self._pending.items()
+                if k[0] == self.ENTITY_DEMANDAS and op == "upsert" and getattr(obj, "projeto_id", None) == projeto_id
+            ]:
+                del self._pending[key]
+        self._enqueue(self.ENTITY_PROJETOS, "cascade", projeto_id)
+        return True
+
+    def save_etapas(self, etapas: list[Etapa]) -> bool:
+        self._enqueue_replace(self.ENTITY_ETAPAS, etapas)
+        return True
+
+    def upsert_etapas(self, etapas: list[Etapa]) -> bool:
+        for e in etapas:
+            self._enqueue(self.ENTITY_ETAPAS, "upsert", e.id, e)
+        return True
+
+    def upsert_etapa(self, etapa: Etapa) -> bool:
+        return self.upsert_etapas([etapa])
+
+    def delete_etapa(self, etapa_id: str) -> bool:
+        self._enqueue(self.ENTITY_ETAPAS, "delete", etapa_id)
+        return True
+
+    def save_demandas(self, demandas: list[Demanda]) -> bool:
+        self._enqueue_replace(self.ENTITY_DEMANDAS, demandas)
+        return True
+
+    def upsert_demandas(self, demandas: list[Demanda]) -> bool:
+        for d in demandas:
+            self._enqueue(self.ENTITY_DEMANDAS, "upsert", d.id, d)
+        return True
+
+    def upsert_demanda(self, demanda: Demanda) -> bool:
+        return self.upsert_demandas([demanda])
+
+    def delete_demandas(self, demanda_ids: list[str]) -> bool:
+        for demanda_id in demanda_ids:
+            self._enqueue(self.ENTITY_DEMANDAS, "delete", demanda_id)
+        return True
+
+    def delete_demanda(self, demanda_id: str) -> bool:
+        return self.delete_demandas([demanda_id])
+
+    # ------------------------- Unidade de trabalho (síncrona) -------------------------
+
+    def unit_of_work(self, on_rollback: Optional[Callable[[], None]] = None) -> UnitOfWork:
+        return UnitOfWork(self.commit_unit_of_work, on_rollback)
+
+    def commit_unit_of_work(self, uow: UnitOfWork) -> bool:
+        self.flush()
+        with self._io_lock:
+            return self._manager.commit_unit_of_work(uow)
+
+    # ------------------------- Leituras / limpeza (síncronas) -------------------------
+
+    def load_projetos(self) -> list[Projeto]:
+        self.flush()
+        with self._io_lock:
+            return self._manager.load_projetos()
+
+    def load_etapas(self) -> list[Etapa]:
+        self.flush()
+        with self._io_lock:
+            return self._manager.load_etapas()
+
+    def load_demandas(self) -> list[Demanda]:
+        self.flush()
+        with self._io_lock:
+            return self._manager.load_demandas()
+
+    def load_all(self) -> dict[str, list]:
+        self.flush()
+        with self._io_lock:
+            dados = self._manager.load_all()
+        # A sessão passa a ter a versão atual das linhas recusadas: os conflitos deixam de valer
+        if self.conflicts:
+            self.conflicts = []
+            self.last_error = None
+        return dados
+
+    def pull_changes(self) -> dict[str, Any]:
+        # Com escrita na fila, não puxa: a revisão trazida pelo pull viraria a base do compare-and-set da fila,
+        # que regravaria por cima da versão da outra sessão. Também não descarrega aqui (o rerun esperaria o
+        # Google): a thread grava a fila e o pull acontece num rerun seguinte, com a fila vazia
+        if self.pending_count():
+            return {"seq": None, "reload": False, "upserts": {}, "deletes": {}, "updates": {}}
+        with self._io_lock:
+            return self._manager.pull_changes()
+
+    def _discard_core(self):
+        with self._lock:
+            self._pending = {}
+            self._replace = {}
+
+    def clear_core_data(self) -> bool:
+        self._discard_core()
+        with self._io_lock:
+            return self._manager.clear_core_data()
+
+    def clear_all(self) -> bool:
+        self._discard_core()
+        with self._io_lock:
+            return self._manager.clear_all()
@@ -0,0 +1,704 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+from uuid import uuid4
+
+from src.modules.models import Projeto, Demanda, Etapa
+from src.modules.storage_backend import UnitOfWork, WriteConflictError, fold_journal
+
+
+class SQLiteManager:
+    """Persistência em SQLite local (arquivo único), selecionada por `DATABASE_URL=sqlite:///arquivo.db`.
+
+    Mesma API pública do GoogleSheetsManager (ver `StorageBackend`). As escritas são por linha
+    (`INSERT ... ON CONFLICT DO UPDATE` / `DELETE ... WHERE id IN`), sem reescrever a tabela, e as
+    consultas usadas pelo app têm índices reais (demandas por projeto_id, etapa_id e status; tarefas
+    por tópico). A ordem de inserção é preservada (`ORDER BY rowid`), como nas abas da planilha.
+
+    O banco roda em modo WAL: várias sessões do Streamlit (uma conexão cada) leem enquanto outra grava.
+    Projetos, etapas e demandas têm `rev` (revisão da linha): a atualização só vale se a linha ainda está na
+    revisão que esta sessão leu (`UPDATE ... WHERE id = ? AND rev = ?`); senão, `WriteConflictError`.
+
+    Cada mutação acrescenta à tabela `journal` (na mesma transação) a linha gravada ou o id removido; `seq`
+    é a chave autoincremental. `pull_changes()` lê as entradas de outras sessões após o último seq aplicado.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS projetos (
+            id TEXT PRIMARY KEY,
+            nome TEXT NOT NULL DEFAULT '',
+            descricao TEXT NOT NULL DEFAULT '',
+            status TEXT,
+            data_criacao TEXT,
+            data_conclusao TEXT,
+            responsavel TEXT,
+            rev INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS etapas (
+            id TEXT PRIMARY KEY,
+            nome TEXT NOT NULL DEFAULT '',
+            descricao TEXT NOT NULL DEFAULT '',
+            ordem INTEGER NOT NULL DEFAULT 0,
+            data_criacao TEXT,
+            rev INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS demandas (
+            id TEXT PRIMARY KEY,
+            titulo TEXT NOT NULL DEFAULT '',
+            descricao TEXT NOT NULL DEFAULT '',
+            projeto_id TEXT,
+            status TEXT,
+            prioridade TEXT,
+            etapa_id TEXT,
+            responsavel TEXT,
+            data_inicio_plano TEXT,
+            data_inicio_real TEXT,
+            data_vencimento_plano TEXT,
+            data_vencimento_real TEXT,
+            data_vencimento TEXT,
+            data_criacao TEXT,
+            data_conclusao TEXT,
+            percentual_completo INTEGER NOT NULL DEFAULT 0,
+            tags TEXT NOT NULL DEFAULT '[]',
+            comentarios TEXT NOT NULL DEFAULT '[]',
+            rev INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_demandas_projeto_id ON demandas (projeto_id);
+        CREATE INDEX IF NOT EXISTS idx_demandas_etapa_id ON demandas (etapa_id);
+        CREATE INDEX IF NOT EXISTS idx_demandas_status ON demandas (status);
+        CREATE TABLE IF NOT EXISTS checklist_topics (
+            id TEXT PRIMARY KEY,
+            nome TEXT NOT NULL DEFAULT '',
+            created_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS checklist_tasks (
+            id TEXT PRIMARY KEY,
+            topic_id TEXT NOT NULL,
+            texto TEXT NOT NULL DEFAULT '',
+            done INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_checklist_tasks_topic_id ON checklist_tasks (topic_id);
+        CREATE TABLE IF NOT EXISTS journal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL,
+            id TEXT NOT NULL DEFAULT '',
+            op TEXT NOT NULL,
+            payload TEXT NOT NULL DEFAULT '',
+            session TEXT,
+            at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS journal_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    COLUMNS_PROJETOS = ["id", "nome", "descricao", "status", "data_criacao", "data_conclusao", "responsavel"]
+    COLUMNS_ETAPAS = ["id", "nome", "descricao", "ordem", "data_criacao"]
+    COLUMNS_DEMANDAS = [
+        "id",
+        "titulo",
+        "descricao",
+        "projeto_id",
+        "status",
+        "prioridade",
+        "etapa_id",
+        "responsavel",
+        "data_inicio_plano",
+        "data_inicio_real",
+        "data_vencimento_plano",
+        "data_vencimento_real",
+        "data_vencimento",
+        "data_criacao",
+        "data_conclusao",
+        "percentual_completo",
+        "tags",
+        "comentarios",
+    ]
+
+    # Tabelas com revisão por linha (bancos criados antes da coluna `rev` ganham a coluna ao abrir)
+    REV_TABLES = ("projetos", "etapas", "demandas")
+
+    # Acima de JOURNAL_MAX_ROWS entradas, as mais velhas que JOURNAL_RETENTION_SECONDS são compactadas
+    JOURNAL_MAX_ROWS = 500
+    JOURNAL_RETENTION_SECONDS = 600.0
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.database_url = "sqlite:///" + self.path
+        self._conn: Optional[sqlite3.Connection] = None
+        # A conexão é usada pelo script do Streamlit e, eventualmente, por threads auxiliares
+        self._lock = threading.RLock()
+        # Revisão de cada linha como esta sessão a leu/gravou por último: base do compare-and-set
+        self._revs: dict[str, dict[str, int]] = {}
+        self.save_calls = 0
+        self.rows_received = 0
+        self.rows_transmitted = 0
+        # Journal: entradas desta sessão são ignoradas no pull; `_journal_seq` é o último seq aplicado
+        self._session_id = uuid4().hex[:12]
+        self._journal_seq: Optional[int] = None
+
+    # ------------------------- Conexão -------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        if self.path != ":memory:":
+            folder = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(folder, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.SCHEMA)
+        for table in self.REV_TABLES:
+            columns = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+            if "rev" not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+        self._conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------- Conversões -------------------------
+
+    @staticmethod
+    def _json_list(value: Any) -> list:
+        if value is None or value == "":
+            return []
+        if isinstance(value, list):
+            return value
+        try:
+            parsed = json.loads(value)
+        except Exception:
+            return [value]
+        return parsed if isinstance(parsed, list) else [parsed]
+
+    @staticmethod
+    def _int(value: Any) -> int:
+        try:
+            return int(value or 0)
+        except (TypeError, ValueError):
+            try:
+                return int(float(value))
+            except (TypeError, ValueError):
+                return 0
+
+    @staticmethod
+    def _projeto_params(p: Projeto) -> tuple:
+        return (p.id, p.nome or "", p.descricao or "", p.status, p.data_criacao, p.data_conclusao, p.responsavel)
+
+    @classmethod
+    def _etapa_params(cls, e: Etapa) -> tuple:
+        return (e.id, e.nome or "", e.descricao or "", cls._int(e.ordem), e.data_criacao)
+
+    @classmethod
+    def _demanda_params(cls, d: Demanda) -> tuple:
+        return (
+            d.id,
+            d.titulo or "",
+            d.descricao or "",
+            d.projeto_id,
+            d.status,
+            d.prioridade,
+            d.etapa_id,
+            d.responsavel,
+            d.data_inicio_plano,
+            d.data_inicio_real,
+            d.data_vencimento_plano,
+            d.data_vencimento_real,
+            d.data_vencimento,
+            d.data_criacao,
+            d.data_conclusao,
+            cls._int(d.percentual_completo),
+            json.dumps(list(d.tags or []), ensure_ascii=False),
+            json.dumps(list(d.comentarios or []), ensure_ascii=False),
+        )
+
+    def _take_rev(self, table: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Tira `rev` da linha lida (não faz parte do modelo) e guarda como base do próximo compare-and-set."""
+        self._revs.setdefault(table, {})[str(data["id"])] = self._int(data.pop("rev", 0))
+        return data
+
+    def _demanda_from_row(self, row: sqlite3.Row) -> Demanda:
+        data = self._take_rev("demandas", dict(row))
+        data["percentual_completo"] = self._int(data.get("percentual_completo"))
+        data["tags"] = self._json_list(data.get("tags"))
+        data["comentarios"] = self._json_list(data.get("comentarios"))
+        return Demanda.from_dict(data)
+
+    @staticmethod
+    def _upsert_sql(table: str, columns: list[str]) -> str:
+        cols = ", ".join(columns)
+        marks = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "id")
+        return f"INSERT INTO {table} ({cols}) VALUES ({marks}) ON CONFLICT(id) DO UPDATE SET {updates}"
+
+    def _upsert(self, table: str, columns: list[str], rows: list[tuple]) -> bool:
+        """Grava as linhas; nas tabelas com `rev`, cada atualização é um compare-and-set contra a revisão lida.
+
+        Tudo numa transação: linhas sem conflito são gravadas e as conflitantes vão em `WriteConflictError`.
+        """
+        if not rows:
+            return True
+        with self._transaction() as conn:
+            conflicts, new_revs = self._upsert_in(conn, table, columns, rows)
+        if table in self.REV_TABLES:
+            self._revs.setdefault(table, {}).update(new_revs)
+        if conflicts:
+            raise WriteConflictError(conflicts)
+        return True
+
+    def _upsert_in(
+        self, conn: sqlite3.Connection, table: str, columns: list[str], rows: list[tuple]
+    ) -> tuple[list[tuple[str, str, Optional[int], Optional[int]]], dict[str, int]]:
+        """Corpo de `_upsert` dentro de uma transação já aberta: devolve (conflitos, novas revisões)."""
+        if table not in self.REV_TABLES:
+            conn.executemany(self._upsert_sql(table, columns), rows)
+            self._journal_in(conn, table, "upsert", [str(params[0]) for params in rows])
+            return [], {}
+
+        seen = self._revs.get(table, {})
+        sets = ", ".join(f"{c} = ?" for c in columns if c != "id")
+        cas_sql = f"UPDATE {table} SET {sets}, rev = rev + 1 WHERE id = ? AND rev = ?"
+        upsert_sql = self._upsert_sql(table, columns) + ", rev = rev + 1"
+        conflicts: list[tuple[str, str, Optional[int], Optional[int]]] = []
+        new_revs: dict[str, int] = {}
+        for params in rows:
+            row_id = str(params[0])
+            base = seen.get(row_id)
+            if base is None:
+                # Linha nunca lida por esta sessão: gravação incondicional, como antes
+                conn.execute(upsert_sql, params)
+            elif conn.execute(cas_sql, (*params[1:], row_id, base)).rowcount == 0:
+                current = conn.execute(f"SELECT rev FROM {table} WHERE id = ?", (row_id,)).fetchone()
+                conflicts.append((table, row_id, base, current["rev"] if current else None))
+                continue
+            new_revs[row_id] = conn.execute(f"SELECT rev FROM {table} WHERE id = ?", (row_id,)).fetchone()["rev"]
+        self._journal_in(conn, table, "upsert", list(new_revs))
+        return conflicts, new_revs
+
+    def _replace(self, table: str, columns: list[str], rows: list[tuple]) -> bool:
+        """Deixa a tabela igual a `rows` (semântica de `save_*`), gravando só a diferença.
+
+        Numa transação, compara com as linhas atuais: remove as que saíram da lista e regrava só as novas ou
+        alteradas (`rev` + 1); linhas iguais não são tocadas e mantêm a revisão.
+        """
+        incoming: dict[str, tuple] = {}
+        for params in rows:
+            incoming[str(params[0])] = tuple(params)
+        with self._transaction() as conn:
+            existing = {
+                str(r[0]): tuple(r) for r in conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+            }
+            removed = [row_id for row_id in existing if row_id not in incoming]
+            changed = [params for row_id, params in incoming.items() if existing.get(row_id) != params]
+            if removed:
+                self._delete_in(conn, table, removed)
+            if changed:
+                sql = self._upsert_sql(table, columns)
+                conn.executemany(sql + ", rev = rev + 1" if table in self.REV_TABLES else sql, changed)
+                self._journal_in(conn, table, "upsert", [str(params[0]) for params in changed])
+            if table in self.REV_TABLES:
+                self._revs[table] = {str(r["id"]): r["rev"] for r in conn.execute(f"SELECT id, rev FROM {table}")}
+        self.save_calls += 1
+        self.rows_received += len(rows)
+        self.rows_transmitted += len(removed) + len(changed)
+        return True
+
+    def save_stats(self) -> dict[str, Any]:
+        """Linhas recebidas pelos `save_*` x linhas efetivamente gravadas."""
+        return {
+            "saves": self.save_calls,
+            "full_saves": 0,
+            "rows_received": self.rows_received,
+            "rows_transmitted": self.rows_transmitted,
+        }
+
+    def _delete(self, table: str, ids: list[str]) -> bool:
+        ids = [str(i) for i in ids if i is not None]
+        if not ids:
+            return True
+        with self._transaction() as conn:
+            self._delete_in(conn, table, ids)
+        self._forget_revs(table, ids)
+        return True
+
+    def _delete_in(self, conn: sqlite3.Connection, table: str, ids: list[str]):
+        # Lotes abaixo do limite de parâmetros do SQLite
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ", ".join("?" for _ in chunk)
+            conn.execute(f"DELETE FROM {table} WHERE id IN ({marks})", tuple(chunk))
+        self._journal_in(conn, table, "delete", ids)
+
+    def _forget_revs(self, table: str, ids: list[str]):
+        seen = self._revs.get(table)
+        if seen:
+            for row_id in ids:
+                seen.pop(row_id, None)
+
+    # ------------------------- Journal -------------------------
+
+    def _journal_in(self, conn: sqlite3.Connection, table: str, op: str, ids: list[str]):
+        """Registra a operação no journal, dentro da transação aberta (`upsert` leva a linha como ficou)."""
+        if not ids:
+            return
+        at = time.time()
+        sql = "INSERT INTO journal (entity, id, op, payload, session, at) VALUES (?, ?, ?, ?, ?, ?)"
+        if op != "upsert":
+            conn.executemany(sql, [(table, str(i), op, "", self._session_id, at) for i in ids])
+            return
+        for start in range(0, len(ids), 500):
+            chunk = [str(i) for i in ids[start:start + 500]]
+            marks = ", ".join("?" for _ in chunk)
+            rows = conn.execute(f"SELECT * FROM {table} WHERE id IN ({marks})", tuple(chunk)).fetchall()
+            conn.executemany(
+                sql,
+                [(table, r["id"], op, json.dumps(dict(r), ensure_ascii=False), self._session_id, at) for r in rows],
+            )
+
+    @staticmethod
+    def _journal_head(conn: sqlite3.Connection) -> tuple[int, int]:
+        """(último seq gravado, seq até onde o journal foi compactado)."""
+        row = conn.execute("SELECT value FROM journal_meta WHERE key = 'compacted_seq'").fetchone()
+        compacted = int(row["value"]) if row else 0
+        last = conn.execute("SELECT MAX(seq) AS seq FROM journal").fetchone()["seq"]
+        return max(last or 0, compacted), compacted
+
+    def pull_changes(self) -> dict[str, Any]:
+        """Mudanças gravadas por outras sessões desde a carga (ou desde o último pull), lidas do journal.
+
+        Mesmo formato do GoogleSheetsManager: {"seq", "reload", "upserts", "deletes", "updates"}.
+        """
+        out: dict[str, Any] = {"seq": self._journal_seq, "reload": False, "upserts": {}, "deletes": {}, "updates": {}}
+        with self._lock:
+            conn = self._connect()
+            last, compacted = self._journal_head(conn)
+            if self._journal_seq is None:
+                self._journal_seq = out["seq"] = last  # sem carga de referência: só posiciona o cursor
+                return out
+            if self._journal_seq < compacted:
+                # Entradas ainda não aplicadas já foram compactadas
+                self._journal_seq = None
+                out["reload"] = True
+                return out
+            rows = conn.execute(
+                "SELECT * FROM journal WHERE seq > ? ORDER BY seq", (self._journal_seq,)
+            ).fetchall()
+        if rows:
+            self._journal_seq = out["seq"] = rows[-1]["seq"]
+        entries = [
+            (r["entity"], r["id"], r["op"], json.loads(r["payload"]) if r["payload"] else {}, r["session"])
+            for r in rows
+        ]
+        reload, upserts, deletes, _ = fold_journal(entries, self._session_id)
+        if reload:
+            self._journal_seq = None
+            out["reload"] = True
+            return out
+
+        converters = {
+            "projetos": lambda data: Projeto.from_dict(self._take_rev("projetos", data)),
+            "etapas": lambda data: Etapa.from_dict(self._take_rev("etapas", data)),
+            "demandas": self._demanda_from_row,
+            "checklist_topics": lambda data: {k: data.get(k) for k in ("id", "nome", "created_at")},
+            "checklist_tasks": lambda data: self._checklist_tasks_from_rows([data])[0],
+        }
+        for table, by_id in upserts.items():
+            if table in converters:
+                out["upserts"][table] = [converters[table](data) for data in by_id.values()]
+        for table, ids in deletes.items():
+            self._forget_revs(table, ids)
+        out["deletes"] = deletes
+
+        if self._journal_seq - compacted > self.JOURNAL_MAX_ROWS:
+            self.compact_journal()
+        return out
+
+    def compact_journal(self, retention_seconds: Optional[float] = None) -> int:
+        """Remove do journal as entradas mais antigas que a retenção; retorna quantas saíram.
+
+        As mudanças já estão nas tabelas (foram gravadas na mesma transação): compactar só encurta o histórico.
+        Sessões que ainda não tinham lido as entradas removidas recebem `reload` no próximo pull.
+        """
+        retention = self.JOURNAL_RETENTION_SECONDS if retention_seconds is None else float(retention_seconds)
+        with self._transaction() as conn:
+            row = conn.execute("SELECT MAX(seq) AS seq FROM journal WHERE at < ?", (time.time() - retention,)).fetchone()
+            if row["seq"] is None:
+                return 0
+            count = conn.execute("DELETE FROM journal WHERE seq <= ?", (row["seq"],)).rowcount
+            conn.execute(
+                "INSERT INTO journal_meta (key, value) VALUES ('compacted_seq', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(row["seq"]),),
+            )
+        return count
+
+    # ------------------------- Unidade de trabalho -------------------------
+
+    def unit_of_work(self, on_rollback: Optional[Callable[[], None]] = None) -> UnitOfWork:
+        return UnitOfWork(self.commit_unit_of_work, on_rollback)
+
+    def commit_unit_of_work(self, uow: UnitOfWork) -> bool:
+        """Grava todas as mudanças da unidade numa única transação.
+
+        Um conflito de revisão em qualquer linha desfaz a transação inteira (`WriteConflictError`).
+        """
+        writers = {
+            "projetos": (self.COLUMNS_PROJETOS, self._projeto_params),
+            "etapas": (self.COLUMNS_ETAPAS, self._etapa_params),
+            "demandas": (self.COLUMNS_DEMANDAS, self._demanda_params),
+        }
+        conflicts: list[tuple[str, str, Optional[int], Optional[int]]] = []
+        new_revs: dict[str, dict[str, int]] = {}
+        with self._transaction() as conn:
+            for table, ids in uow.deletes.items():
+                self._delete_in(conn, table, list(ids))
+            for table, items in uow.upserts.items():
+                columns, to_params = writers[table]
+                table_conflicts, new_revs[table] = self._upsert_in(
+                    conn, table, columns, [to_params(item) for item in items.values()]
+                )
+                conflicts.extend(table_conflicts)
+            for table, rows in uow.updates.items():
+                for row_id, values in rows.items():
+                    sets = ", ".join(f"{c} = ?" for c in values)
+                    conn.execute(f"UPDATE {table} SET {sets} WHERE id = ?", (*values.values(), row_id))
+                self._journal_in(conn, table, "upsert", list(rows))
+            if conflicts:
+                raise WriteConflictError(conflicts)
+        for table, revs in new_revs.items():
+            self._revs.setdefault(table, {}).update(revs)
+        for table, ids in uow.deletes.items():
+            self._forget_revs(table, list(ids))
+        return True
+
+    # ------------------------- Public API (compat) -------------------------
+
+    def health_check(self) -> bool:
+        self._query("SELECT 1")
+        return True
+
+    def load_all(self) -> dict[str, list]:
+        """Todas as entidades numa única transação de leitura (snapshot consistente)."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                # Cursor do journal no mesmo snapshot: o pull seguinte traz só o que veio depois da carga
+                self._journal_seq, _ = self._journal_head(conn)
+                return {
+                    "projetos": self.load_projetos(),
+                    "demandas": self.load_demandas(),
+                    "etapas": self.load_etapas(),
+                    "checklist_topics": self.load_checklist_topics(),
+                    "checklist_tasks": self._checklist_tasks_from_rows(
+                        conn.execute("SELECT * FROM checklist_tasks ORDER BY rowid").fetchall()
+                    ),
+                }
+            finally:
+                conn.execute("COMMIT")
+
+    # ---- Projetos ----
+
+    def load_projetos(self) -> list[Projeto]:
+        rows = self._query("SELECT * FROM projetos ORDER BY rowid")
+        return [Projeto.from_dict(self._take_rev("projetos", dict(r))) for r in rows]
+
+    def save_projetos(self, projetos: list[Projeto]) -> bool:
+        return self._replace("projetos", self.COLUMNS_PROJETOS, [self._projeto_params(p) for p in projetos])
+
+    def upsert_projetos(self, projetos: list[Projeto]) -> bool:
+        return self._upsert("projetos", self.COLUMNS_PROJETOS, [self._projeto_params(p) for p in projetos])
+
+    def upsert_projeto(self, projeto: Projeto) -> bool:
+        return self.upsert_projetos([projeto])
+
+    def delete_projeto(self, projeto_id: str) -> bool:
+        return self._delete("projetos", [projeto_id])
+
+    def delete_projeto_cascade(self, projeto_id: str) -> bool:
+        """Remove o projeto e todas as suas demandas numa única transação."""
+        with self._transaction() as conn:
+            removed = [r["id"] for r in conn.execute("SELECT id FROM demandas WHERE projeto_id = ?", (str(projeto_id),))]
+            self._delete_in(conn, "demandas", removed)
+            self._delete_in(conn, "projetos", [str(projeto_id)])
+        self._forget_revs("demandas", removed)
+        self._forget_revs("projetos", [str(projeto_id)])
+        return True
+
+    # ---- Etapas ----
+
+    def load_etapas(self) -> list[Etapa]:
+        rows = self._query("SELECT * FROM etapas ORDER BY rowid")
+        return [Etapa.from_dict(self._take_rev("etapas", dict(r))) for r in rows]
+
+    def save_etapas(self, etapas: list[Etapa]) -> bool:
+        return self._replace("etapas", self.COLUMNS_ETAPAS, [self._etapa_params(e) for e in etapas])
+
+    def upsert_etapas(self, etapas: list[Etapa]) -> bool:
+        return self._upsert("etapas", self.COLUMNS_ETAPAS, [self._etapa_params(e) for e in etapas])
+
+    def upsert_etapa(self, etapa: Etapa) -> bool:
+        return self.upsert_etapas([etapa])
+
+    def delete_etapa(self, etapa_id: str) -> bool:
+        return self._delete("etapas", [etapa_id])
+
+    # ---- Demandas ----
+
+    def load_demandas(self) -> list[Demanda]:
+        rows = self._query("SELECT * FROM demandas ORDER BY rowid")
+        return [self._demanda_from_row(r) for r in rows]
+
+    def load_demandas_by(
+        self,
+        projeto_id: Optional[str] = None,
+        etapa_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> list[Demanda]:
+        """Demandas filtradas no próprio banco (usa os índices de projeto_id/etapa_id/status)."""
+        where, params = [], []
+        for col, value in (("projeto_id", projeto_id), ("etapa_id", etapa_id), ("status", status)):
+            if value is not None:
+                where.append(f"{col} = ?")
+                params.append(value)
+        sql = "SELECT * FROM demandas"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._query(sql + " ORDER BY rowid", tuple(params))
+        return [self._demanda_from_row(r) for r in rows]
+
+    def save_demandas(self, demandas: list[Demanda]) -> bool:
+        return self._replace("demandas", self.COLUMNS_DEMANDAS, [self._demanda_params(d) for d in demandas])
+
+    def upsert_demandas(self, demandas: list[Demanda]) -> bool:
+        return self._upsert("demandas", self.COLUMNS_DEMANDAS, [self._demanda_params(d) for d in demandas])
+
+    def upsert_demanda(self, demanda: Demanda) -> bool:
+        return self.upsert_demandas([demanda])
+
+    def delete_demandas(self, demanda_ids: list[str]) -> bool:
+        return self._delete("demandas", demanda_ids)
+
+    def delete_demanda(self, demanda_id: str) -> bool:
+        return self.delete_demandas([demanda_id])
+
+    # ---- Limpeza ----
+
+    def clear_core_data(self) -> bool:
+        with self._transaction() as conn:
+            for table in ("projetos", "etapas", "demandas"):
+                conn.execute(f"DELETE FROM {table}")
+                self._journal_in(conn, table, "replace", [""])
+        self._revs.clear()
+        return True
+
+    def clear_all(self) -> bool:
+        with self._transaction() as conn:
+            for table in ("projetos", "etapas", "demandas", "checklist_topics", "checklist_tasks"):
+                conn.execute(f"DELETE FROM {table}")
+                self._journal_in(conn, table, "replace", [""])
+        self._revs.clear()
+        return True
+
+    # ---- Check-list ----
+
+    def load_checklist_topics(self) -> list[dict[str, Any]]:
+        rows = self._query("SELECT id, nome, created_at FROM checklist_topics ORDER BY rowid")
+        return [dict(r) for r in rows]
+
+    def create_checklist_topic(self, nome: str) -> dict[str, Any]:
+        topic_id = f"topic_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        item = {"id": topic_id, "nome": nome, "created_at": datetime.now().isoformat()}
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO checklist_topics (id, nome, created_at) VALUES (?, ?, ?)",
+                (item["id"], item["nome"], item["created_at"]),
+            )
+            self._journal_in(conn, "checklist_topics", "upsert", [topic_id])
+        return item
+
+    def rename_checklist_topic(self, topic_id: str, new_name: str) -> bool:
+        with self._transaction() as conn:
+            conn.execute("UPDATE checklist_topics SET nome = ? WHERE id = ?", (new_name, str(topic_id)))
+            self._journal_in(conn, "checklist_topics", "upsert", [str(topic_id)])
+        return True
+
+    @staticmethod
+    def _checklist_tasks_from_rows(rows: list[sqlite3.Row]) -> list[dict[str, Any]]:
+        return [
+            {
+                "id": r["id"],
+                "topic_id": r["topic_id"],
+                "texto": r["texto"],
+                "done": bool(r["done"]),
+                "created_at": r["created_at"],
+            }
+            for r in rows
+        ]
+
+    def load_checklist_tasks(self, topic_id: str) -> list[dict[str, Any]]:
+        rows = self._query("SELECT * FROM checklist_tasks WHERE topic_id = ? ORDER BY rowid", (str(topic_id),))
+        return self._checklist_tasks_from_rows(rows)
+
+    def load_checklist_tasks_by_topic(self) -> dict[str, list[dict[str, Any]]]:
+        """Todas as tarefas agrupadas por `topic_id` (na ordem de inclusão), numa única consulta."""
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for task in self._checklist_tasks_from_rows(self._query("SELECT * FROM checklist_tasks ORDER BY rowid")):
+            grouped.setdefault(task["topic_id"], []).append(task)
+        return grouped
+
+    def create_checklist_task(self, topic_id: str, texto: str) -> dict[str, Any]:
+        task_id = f"task_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        item = {
+            "id": task_id,
+            "topic_id": topic_id,
+            "texto": texto,
+            "done": False,
+            "created_at": datetime.now().isoformat(),
+        }
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO checklist_tasks (id, topic_id, texto, done, created_at) VALUES (?, ?, ?, 0, ?)",
+                (item["id"], item["topic_id"], item["texto"], item["created_at"]),
+            )
+            self._journal_in(conn, "checklist_tasks", "upsert", [task_id])
+        return item
+
+    def set_checklist_task_done(self, task_id: str, done: bool) -> bool:
+        with self._transaction() as conn:
+            conn.execute("UPDATE checklist_tasks SET done = ? WHERE id = ?", (1 if done else 0, str(task_id)))
+            self._journal_in(conn, "checklist_tasks", "upsert", [str(task_id)])
+        return True
+
+    def delete_checklist_task(self, task_id: str) -> bool:
+        return self._delete("checklist_tasks", [task_id])
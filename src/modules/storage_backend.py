@@ -0,0 +1,316 @@
+from typing import Any, Callable, Optional, Protocol, runtime_checkable
+
+from src.modules.models import Projeto, Demanda, Etapa
+
+
+class WriteConflictError(RuntimeError):
+    """Escrita recusada porque a linha mudou (ou sumiu) desde a última leitura desta sessão.
+
+    `conflicts` traz (entidade, id, revisão esperada, revisão atual ou None se a linha foi removida).
+    As demais linhas do mesmo lote são gravadas normalmente; só as conflitantes ficam de fora.
+    """
+
+    def __init__(self, conflicts: list[tuple[str, str, Optional[int], Optional[int]]]):
+        self.conflicts = list(conflicts)
+        ids = ", ".join(f"{entity}/{item_id}" for entity, item_id, _, _ in self.conflicts[:5])
+        if len(self.conflicts) > 5:
+            ids += ", ..."
+        super().__init__(
+            f"Conflito de edição: {len(self.conflicts)} registro(s) alterado(s) por outra sessão desde a última "
+            f"leitura ({ids}). Recarregue os dados e refaça a alteração."
+        )
+
+
+class UnitOfWork:
+    """Mudanças em várias entidades gravadas juntas: tudo ou nada.
+
+    Uso:
+        with backend.unit_of_work(on_rollback=desfazer) as uow:
+            uow.delete_etapa(etapa_id)
+            uow.upsert_demandas(demandas_afetadas)
+
+    As chamadas dentro do bloco só registram as mudanças; ao sair do bloco o backend grava tudo numa única
+    operação (um `spreadsheets.batchUpdate` na planilha, uma transação no SQLite). Se o bloco ou a gravação
+    falharem (inclusive por `WriteConflictError`), nada é gravado, `on_rollback()` desfaz o estado em memória
+    de quem chamou e a exceção segue adiante.
+    """
+
+    def __init__(self, commit: Callable[["UnitOfWork"], bool], on_rollback: Optional[Callable[[], None]] = None):
+        self._commit = commit
+        self._on_rollback = on_rollback
+        # entidade -> id -> objeto do modelo (projetos/etapas/demandas); dict preserva a ordem de chegada
+        self.upserts: dict[str, dict[str, Any]] = {}
+        # entidade -> ids removidos
+        self.deletes: dict[str, dict[str, None]] = {}
+        # entidade -> id -> {coluna: valor}: células avulsas (check-list)
+        self.updates: dict[str, dict[str, dict[str, Any]]] = {}
+        self.committed = False
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def is_empty(self) -> bool:
+        return not (self.upserts or self.deletes or self.updates)
+
+    def commit(self) -> bool:
+        if self.committed:
+            return True
+        try:
+            if not self.is_empty():
+                self._commit(self)
+        except Exception:
+            self.rollback()
+            raise
+        self.committed = True
+        return True
+
+    def rollback(self):
+        self.upserts, self.deletes, self.updates = {}, {}, {}
+        if self._on_rollback is not None:
+            self._on_rollback()
+
+    def _stage_upserts(self, entity: str, items: list):
+        staged = self.upserts.setdefault(entity, {})
+        for item in items:
+            item_id = str(item.id)
+            self.deletes.get(entity, {}).pop(item_id, None)
+            staged[item_id] = item
+
+    def _stage_deletes(self, entity: str, ids: list[str]):
+        staged = self.deletes.setdefault(entity, {})
+        for item_id in ids:
+            item_id = str(item_id)
+            self.upserts.get(entity, {}).pop(item_id, None)
+            self.updates.get(entity, {}).pop(item_id, None)
+            staged[item_id] = None
+
+    def _stage_update(self, entity: str, item_id: str, values: dict[str, Any]):
+        self.updates.setdefault(entity, {}).setdefault(str(item_id), {}).update(values)
+
+    # ---- Projetos / etapas / demandas ----
+
+    def upsert_projetos(self, projetos: list[Projeto]):
+        self._stage_upserts("projetos", projetos)
+
+    def upsert_projeto(self, projeto: Projeto):
+        self._stage_upserts("projetos", [projeto])
+
+    def delete_projeto(self, projeto_id: str):
+        self._stage_deletes("projetos", [projeto_id])
+
+    def upsert_etapas(self, etapas: list[Etapa]):
+        self._stage_upserts("etapas", etapas)
+
+    def upsert_etapa(self, etapa: Etapa):
+        self._stage_upserts("etapas", [etapa])
+
+    def delete_etapa(self, etapa_id: str):
+        self._stage_deletes("etapas", [etapa_id])
+
+    def upsert_demandas(self, demandas: list[Demanda]):
+        self._stage_upserts("demandas", demandas)
+
+    def upsert_demanda(self, demanda: Demanda):
+        self._stage_upserts("demandas", [demanda])
+
+    def delete_demandas(self, demanda_ids: list[str]):
+        self._stage_deletes("demandas", demanda_ids)
+
+    def delete_demanda(self, demanda_id: str):
+        self._stage_deletes("demandas", [demanda_id])
+
+    # ---- Check-list ----
+
+    def rename_checklist_topic(self, topic_id: str, new_name: str):
+        self._stage_update("checklist_topics", topic_id, {"nome": new_name})
+
+    def set_checklist_task_done(self, task_id: str, done: bool):
+        self._stage_update("checklist_tasks", task_id, {"done": bool(done)})
+
+    def delete_checklist_task(self, task_id: str):
+        self._stage_deletes("checklist_tasks", [task_id])
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """Contrato de persistência usado pelo app.
+
+    Qualquer manager (Google Planilhas, SQLite, ...) que implemente estes métodos pode ser colocado em
+    `st.session_state.db_manager`. Escritas retornam True em caso de sucesso e levantam exceção em falha.
+
+    Projetos, etapas e demandas têm uma revisão por linha (`rev`): o manager guarda a revisão que a sessão
+    leu e só regrava a linha se ela ainda for a mesma (compare-and-set); senão levanta `WriteConflictError`.
+
+    `unit_of_work()` agrupa mudanças em várias entidades numa gravação só (ver `UnitOfWork`).
+
+    Toda mutação também vai para um journal (entidade, id, op, dados, seq) gravado junto com ela;
+    `pull_changes()` devolve o que outras sessões mudaram desde a carga, para a sessão aplicar nas listas
+    em memória sem recarregar tudo: {"seq", "reload", "upserts", "deletes", "updates"}, por entidade.
+    """
+
+    database_url: str
+
+    def health_check(self) -> bool: ...
+
+    def load_all(self) -> dict[str, list]: ...
+
+    # ---- Projetos ----
+
+    def load_projetos(self) -> list[Projeto]: ...
+
+    def save_projetos(self, projetos: list[Projeto]) -> bool: ...
+
+    def upsert_projetos(self, projetos: list[Projeto]) -> bool: ...
+
+    def upsert_projeto(self, projeto: Projeto) -> bool: ...
+
+    def delete_projeto(self, projeto_id: str) -> bool: ...
+
+    def delete_projeto_cascade(self, projeto_id: str) -> bool: ...
+
+    # ---- Etapas ----
+
+    def load_etapas(self) -> list[Etapa]: ...
+
+    def save_etapas(self, etapas: list[Etapa]) -> bool: ...
+
+    def upsert_etapas(self, etapas: list[Etapa]) -> bool: ...
+
+    def upsert_etapa(self, etapa: Etapa) -> bool: ...
+
+    def delete_etapa(self, etapa_id: str) -> bool: ...
+
+    # ---- Demandas ----
+
+    def load_demandas(self) -> list[Demanda]: ...
+
+    def save_demandas(self, demandas: list[Demanda]) -> bool: ...
+
+    def upsert_demandas(self, demandas: list[Demanda]) -> bool: ...
+
+    def upsert_demanda(self, demanda: Demanda) -> bool: ...
+
+    def delete_demandas(self, demanda_ids: list[str]) -> bool: ...
+
+    def delete_demanda(self, demanda_id: str) -> bool: ...
+
+    # ---- Journal (mudanças de outras sessões) ----
+
+    def pull_changes(self) -> dict[str, Any]: ...
+
+    def compact_journal(self, retention_seconds: Optional[float] = None) -> int: ...
+
+    # ---- Unidade de trabalho ----
+
+    def unit_of_work(self, on_rollback: Optional[Callable[[], None]] = None) -> UnitOfWork: ...
+
+    def commit_unit_of_work(self, uow: UnitOfWork) -> bool: ...
+
+    def save_stats(self) -> dict[str, Any]: ...
+
+    # ---- Limpeza ----
+
+    def clear_core_data(self) -> bool: ...
+
+    def clear_all(self) -> bool: ...
+
+    # ---- Check-list ----
+
+    def load_checklist_topics(self) -> list[dict[str, Any]]: ...
+
+    def create_checklist_topic(self, nome: str) -> dict[str, Any]: ...
+
+    def rename_checklist_topic(self, topic_id: str, new_name: str) -> bool: ...
+
+    def load_checklist_tasks(self, topic_id: str) -> list[dict[str, Any]]: ...
+
+    def load_checklist_tasks_by_topic(self) -> dict[str, list[dict[str, Any]]]: ...
+
+    def create_checklist_task(self, topic_id: str, texto: str) -> dict[str, Any]: ...
+
+    def set_checklist_task_done(self, task_id: str, done: bool) -> bool: ...
+
+    def delete_checklist_task(self, task_id: str) -> bool: ...
+
+
+def fold_journal(
+    entries: list[tuple[str, str, str, dict[str, Any], str]], session_id: Optional[str] = None
+) -> tuple[bool, dict[str, dict[str, dict[str, Any]]], dict[str, list[str]], dict[str, dict[str, dict[str, Any]]]]:
+    """Resume entradas do journal (entidade, id, op, dados, sessão), na ordem em que foram gravadas.
+
+    Devolve (reload, upserts, deletes, updates): para cada id vale a última operação (`update` sobre um
+    `upsert` do mesmo lote é aplicado aos dados do upsert). `reload` indica uma entidade regravada inteira
+    (op `replace`), que não dá para aplicar linha a linha. Entradas de `session_id` não são devolvidas e
+    descartam as anteriores do mesmo id: a sessão já tem a própria escrita, que é mais nova.
+    """
+    reload: set[str] = set()
+    upserts: dict[str, dict[str, dict[str, Any]]] = {}
+    deletes: dict[str, dict[str, None]] = {}
+    updates: dict[str, dict[str, dict[str, Any]]] = {}
+    for entity, item_id, op, data, session in entries:
+        own = session_id is not None and session == session_id
+        if op == "replace":
+            if own:
+                reload.discard(entity)
+                for changes in (upserts, deletes, updates):
+                    changes.pop(entity, None)
+            else:
+                reload.add(entity)
+        elif own or op in ("upsert", "delete"):
+            for changes in (upserts, deletes, updates):
+                changes.get(entity, {}).pop(item_id, None)
+            if own:
+                continue
+            if op == "upsert":
+                upserts.setdefault(entity, {})[item_id] = dict(data)
+            else:
+                deletes.setdefault(entity, {})[item_id] = None
+        elif op == "update":
+            if item_id in upserts.get(entity, {}):
+                upserts[entity][item_id].update(data)
+            else:
+                updates.setdefault(entity, {}).setdefault(item_id, {}).update(data)
+    return (
+        bool(reload),
+        {e: rows for e, rows in upserts.items() if rows},
+        {e: list(ids) for e, ids in deletes.items() if ids},
+        {e: rows for e, rows in updates.items() if rows},
+    )
+
+
+def sqlite_path_from_url(database_url: str) -> Optional[str]:
+    """Extrai o caminho do arquivo de uma URL `sqlite:///...` (None se a URL não for SQLite).
+
+    Segue a convenção do SQLAlchemy: `sqlite:///dados.db` é relativo ao diretório atual,
+    `sqlite:////var/dados.db` é absoluto e `sqlite:///:memory:` (ou `sqlite://`) fica só em memória.
+    """
+    if not database_url:
+        return None
+    s = str(database_url).strip()
+    if not s.lower().startswith("sqlite:"):
+        return None
+    rest = s[len("sqlite:"):]
+    if rest in ("", "//", "///"):
+        return ":memory:"
+    if not rest.startswith("///"):
+        raise ValueError("DATABASE_URL SQLite inválida (use sqlite:///caminho/arquivo.db): " + s)
+    path = rest[3:].split("?", 1)[0]
+    return path or ":memory:"
+
+
+def create_backend_from_url(database_url: str) -> StorageBackend:
+    """Instancia o backend correspondente a `DATABASE_URL`."""
+    path = sqlite_path_from_url(database_url)
+    if path is not None:
+        from src.modules.sqlite_manager import SQLiteManager
+
+        return SQLiteManager(path)
+    scheme = str(database_url).split(":", 1)[0]
+    raise ValueError(f"DATABASE_URL com esquema não suportado: {scheme} (suportado: sqlite:///)")